@@ -0,0 +1,67 @@
+"""Comparar ``matriz_correlacion`` sin gráfico con ``DataFrame.corr``.
+
+Uso::
+
+    python benchmarks/bench_correlacion.py --filas 20000 --columnas 1000 --nulos 0.05
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from formulas import matriz_correlacion
+
+
+def _datos(filas: int, columnas: int, nulos: float) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(filas, columnas))).add_prefix("x")
+    if nulos:
+        df = df.mask(rng.random(df.shape) < nulos)
+    return df
+
+
+def _medir(funcion):
+    """Tiempo y pico de memoria en ejecuciones separadas (tracemalloc ralentiza)."""
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico / 1024**2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=20_000)
+    parser.add_argument("--columnas", type=int, default=1_000)
+    parser.add_argument("--nulos", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    df = _datos(args.filas, args.columnas, args.nulos)
+    kwargs = dict(graficar=False)
+    casos = {
+        "DataFrame.corr": lambda: df.corr(),
+        "float64": lambda: matriz_correlacion(df, **kwargs),
+        "float32": lambda: matriz_correlacion(df, dtype="float32", **kwargs),
+        "float32 paralelo": lambda: matriz_correlacion(
+            df, dtype="float32", tam_bloque=256, n_workers=args.workers, **kwargs
+        ),
+        "float32 top 100": lambda: matriz_correlacion(df, dtype="float32", top_k=100, **kwargs),
+        "spearman float32": lambda: matriz_correlacion(
+            df, metodo="spearman", dtype="float32", **kwargs
+        ),
+    }
+    print(f"{'método':<22}{'tiempo':>10}{'pico MB':>10}")
+    for nombre, funcion in casos.items():
+        segundos, pico = _medir(funcion)
+        print(f"{nombre:<22}{segundos:>9.2f}s{pico:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Comparar ``convertir_a_datetime`` con ``pandas.to_datetime``.
+
+Uso::
+
+    python benchmarks/bench_fechas.py --filas 2000000 --n-workers 2
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from formulas import convertir_a_datetime
+
+
+def _datos(filas: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    horas = pd.date_range("2020-01-01", periods=5000, freq="h")
+    segundos = pd.date_range("2020-01-01", periods=filas, freq="s")
+    return pd.DataFrame(
+        {
+            "repetitiva_iso": horas.strftime("%Y-%m-%d %H:%M:%S")[
+                rng.integers(0, len(horas), filas)
+            ],
+            "repetitiva_dmy": horas.strftime("%d/%m/%Y %H:%M")[
+                rng.integers(0, len(horas), filas)
+            ],
+            "unica_iso": segundos.strftime("%Y-%m-%d %H:%M:%S"),
+            "unica_dmy": segundos.strftime("%d/%m/%Y %H:%M:%S"),
+        }
+    )
+
+
+def _cronometrar(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--n-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    df = _datos(args.filas)
+    warnings.simplefilter("ignore", UserWarning)
+    print(f"{'columna':<16}{'to_datetime':>14}{'convertir':>14}")
+    for col in df.columns:
+        base = _cronometrar(lambda: pd.to_datetime(df[col], errors="coerce"))
+        nuevo = _cronometrar(lambda: convertir_a_datetime(df, col))
+        print(f"{col:<16}{base:>13.2f}s{nuevo:>13.2f}s")
+    for n_workers in sorted({1, args.n_workers}):
+        total = _cronometrar(
+            lambda: convertir_a_datetime(df, list(df.columns), n_workers=n_workers)
+        )
+        print(f"todas las columnas con n_workers={n_workers}: {total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Comparar ``pivotar`` con ``pandas.pivot_table``.
+
+Uso::
+
+    python benchmarks/bench_pivotar.py --filas 2000000 --productos 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from formulas import pivotar
+
+
+def _datos(filas: int, clientes: int, productos: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "cliente": rng.integers(0, clientes, filas),
+            "producto": pd.Series(rng.integers(0, productos, filas)).map("p{}".format),
+            "importe": rng.random(filas),
+            "unidades": rng.integers(1, 5, filas),
+        }
+    )
+
+
+def _medir(funcion):
+    """Tiempo y pico de memoria en ejecuciones separadas (tracemalloc ralentiza)."""
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico / 1024**2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--productos", type=int, default=1_000)
+    args = parser.parse_args()
+
+    df = _datos(args.filas, args.clientes, args.productos)
+    kwargs = dict(
+        index="cliente",
+        columns="producto",
+        values=["importe", "unidades"],
+        aggfunc=["sum", "mean"],
+    )
+    casos = {
+        "pivot_table": lambda: pd.pivot_table(df, **kwargs).reset_index(),
+        "pivotar": lambda: pivotar(df, **kwargs),
+        "pivotar disperso": lambda: pivotar(df, disperso=True, **kwargs),
+        "pivotar por bloques": lambda: pivotar(
+            (df.iloc[i : i + 250_000] for i in range(0, len(df), 250_000)), **kwargs
+        ),
+    }
+    print(f"{'método':<22}{'tiempo':>10}{'pico MB':>10}")
+    for nombre, funcion in casos.items():
+        segundos, pico = _medir(funcion)
+        print(f"{nombre:<22}{segundos:>9.2f}s{pico:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,38 @@
 
 __version__ = "0.1.0"
 
+from .aproximados import CuantilesKLL, FiltroBloom, HyperLogLog, Momentos, TopK
+from .cache import (
+    CacheModelos,
+    CacheResultados,
+    activar_cache,
+    activar_cache_modelos,
+    desactivar_cache,
+    desactivar_cache_modelos,
+    huella,
+    memoizar,
+)
+from .codificacion import CodificadorOneHot
 from .csv_utils import cargar_csv, guardar_csv, limpiar_columnas
 from .estadisticas import (
     comprueba_normalidad,
     describir_columnas,
     matriz_correlacion,
     nulos,
+    PerfilIncremental,
+    perfilar,
     resumen_columnas,
     resumen_dataset,
+    resumen_por_grupos,
 )
 from .excel_utils import cargar_excel, escribir_excel, leer_excel
-from .file_utils import cargar_archivo
+from .file_utils import cargar_archivo, cargar_muestra
 from .html_utils import cargar_html
+from .imputacion import Imputador
 from .json_utils import cargar_json, guardar_json
 from .model_utils import dividir_train_test, estandarizar_datos
 from .modelos import (
+    buscar_hiperparametros,
     entrenar_mlp,
     entrenar_modelo_con_split,
     entrenar_random_forest,
@@ -25,6 +42,9 @@ from .modelos import (
     evaluar_modelo_binario,
 )
 from .pandas_transform import (
+    CadenaTransformaciones,
+    IndiceCombinacion,
+    calcular_limites_iqr,
     codificar_onehot,
     combinar,
     convertir_a_datetime,
@@ -35,7 +55,20 @@ from .pandas_transform import (
     limpiar_nombres,
     pivotar,
 )
-from .sql_utils import crear_conexion, escribir_df, leer_query
+from .particionado import combinar_por_particiones, eliminar_duplicados_por_bloques
+from .sql_utils import (
+    consultar_archivos,
+    crear_conexion,
+    crear_conexion_async,
+    ejecutar_consultas_async,
+    escribir_df,
+    escribir_df_async,
+    extraer_incremental,
+    leer_por_claves,
+    leer_query,
+    leer_query_async,
+    sincronizar_df,
+)
 from .visualizaciones import (
     boxplot_variables,
     correlacion,
@@ -62,24 +95,51 @@ __all__ = [
     "guardar_json",
     "crear_conexion",
     "leer_query",
+    "leer_por_claves",
+    "consultar_archivos",
     "escribir_df",
+    "sincronizar_df",
+    "extraer_incremental",
+    "crear_conexion_async",
+    "leer_query_async",
+    "escribir_df_async",
+    "ejecutar_consultas_async",
     "convertir_a_datetime",
     "detectar_outliers_iqr",
+    "calcular_limites_iqr",
     "eliminar_outliers",
     "eliminar_duplicados",
+    "eliminar_duplicados_por_bloques",
     "imputar_nulos",
+    "Imputador",
     "codificar_onehot",
+    "CodificadorOneHot",
     "combinar",
+    "combinar_por_particiones",
+    "IndiceCombinacion",
     "pivotar",
     "limpiar_nombres",
+    "CadenaTransformaciones",
     "cargar_archivo",
+    "cargar_muestra",
     "cargar_html",
     "nulos",
     "describir_columnas",
     "matriz_correlacion",
     "resumen_dataset",
+    "perfilar",
+    "PerfilIncremental",
     "resumen_columnas",
+    "resumen_por_grupos",
     "comprueba_normalidad",
+    "activar_cache",
+    "desactivar_cache",
+    "huella",
+    "memoizar",
+    "CacheResultados",
+    "activar_cache_modelos",
+    "desactivar_cache_modelos",
+    "CacheModelos",
     "grafico_lineas",
     "grafico_barras",
     "grafico_dispersion",
@@ -93,10 +153,16 @@ __all__ = [
     "estandarizar_datos",
     "histogramas_df",
     "boxplot_variables",
+    "FiltroBloom",
+    "CuantilesKLL",
+    "Momentos",
+    "HyperLogLog",
+    "TopK",
     "entrenar_regresion_logistica",
     "entrenar_mlp",
     "entrenar_random_forest",
     "evaluar_modelo",
     "evaluar_modelo_binario",
     "entrenar_modelo_con_split",
+    "buscar_hiperparametros",
 ]
@@ -0,0 +1,437 @@
+"""Estructuras probabilísticas para cálculos aproximados sobre flujos de datos."""
+
+import math
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class FiltroBloom:
+    """Filtro de Bloom sobre hashes de 64 bits.
+
+    Responde si un hash *puede* haberse visto antes: nunca da falsos
+    negativos y la tasa de falsos positivos se mantiene por debajo de
+    ``tasa_error`` mientras no se superen ``capacidad`` elementos.
+
+    Parameters
+    ----------
+    capacidad : int
+        Número de elementos distintos previstos.
+    tasa_error : float, optional
+        Probabilidad de falso positivo deseada, por defecto ``0.01``.
+
+    Examples
+    --------
+    >>> filtro = FiltroBloom(1_000_000)
+    >>> filtro.agregar(hashes)
+    >>> posibles = filtro.contiene(otros_hashes)
+    """
+
+    def __init__(self, capacidad: int, tasa_error: float = 0.01) -> None:
+        if capacidad < 1 or not 0 < tasa_error < 1:
+            raise ValueError("capacidad debe ser positiva y tasa_error estar en (0, 1)")
+        self.n_bits = max(8, int(-capacidad * math.log(tasa_error) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacidad * math.log(2)))
+        self._bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+
+    def _posiciones(self, hashes: np.ndarray) -> np.ndarray:
+        """Posiciones de bit de cada hash mediante doble hashing."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.n_bits)
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        """Añadir ``hashes`` al filtro."""
+        posiciones = self._posiciones(hashes).ravel()
+        np.bitwise_or.at(
+            self._bits,
+            (posiciones >> np.uint64(3)).astype(np.int64),
+            (np.uint8(1) << (posiciones & np.uint64(7)).astype(np.uint8)),
+        )
+
+    def contiene(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara booleana con los ``hashes`` que pueden estar en el filtro."""
+        posiciones = self._posiciones(hashes)
+        bytes_ = self._bits[(posiciones >> np.uint64(3)).astype(np.int64)]
+        bits = (bytes_ >> (posiciones & np.uint64(7)).astype(np.uint8)) & np.uint8(1)
+        return bits.all(axis=1)
+
+
+class CuantilesKLL:
+    """Boceto KLL para estimar cuantiles de un flujo de valores numéricos.
+
+    Usa memoria del orden de ``k`` valores con independencia del tamaño del
+    flujo y el error de rango de cada cuantil es aproximadamente ``1.7 / k``
+    (con ``k=200``, menos del 1 % de las posiciones). Dos bocetos ajustados
+    sobre partes distintas de los datos se pueden combinar con
+    :meth:`combinar`. Los valores nulos se ignoran.
+
+    Parameters
+    ----------
+    k : int, optional
+        Parámetro de precisión, por defecto ``200``.
+    semilla : int, optional
+        Semilla para la elección aleatoria al compactar.
+
+    Examples
+    --------
+    >>> boceto = CuantilesKLL()
+    >>> for bloque in bloques:
+    ...     boceto.actualizar(bloque["importe"])
+    >>> q1, q3 = boceto.cuantil([0.25, 0.75])
+    """
+
+    def __init__(self, k: int = 200, semilla: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("k debe ser al menos 8")
+        self.k = k
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self._niveles: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    def _capacidad(self, nivel: int) -> int:
+        profundidad = len(self._niveles) - 1 - nivel
+        return max(2, int(math.ceil(self.k * (2 / 3) ** profundidad)))
+
+    def _compactar(self) -> None:
+        """Reducir a la mitad los niveles que superan su capacidad."""
+        lleno = True
+        while lleno:
+            lleno = False
+            for h in range(len(self._niveles)):
+                nivel = self._niveles[h]
+                if len(nivel) <= self._capacidad(h):
+                    continue
+                lleno = True
+                if h + 1 == len(self._niveles):
+                    self._niveles.append(np.empty(0))
+                nivel = np.sort(nivel)
+                resto = nivel[-1:] if len(nivel) % 2 else nivel[:0]
+                pares = nivel[: len(nivel) - len(resto)]
+                subidos = pares[self._rng.integers(2) :: 2]
+                self._niveles[h + 1] = np.concatenate([self._niveles[h + 1], subidos])
+                self._niveles[h] = resto
+
+    def actualizar(self, valores: Any) -> "CuantilesKLL":
+        """Añadir ``valores`` al boceto."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores):
+            self.n += len(valores)
+            self.minimo = min(self.minimo, valores.min())
+            self.maximo = max(self.maximo, valores.max())
+            self._niveles[0] = np.concatenate([self._niveles[0], valores])
+            self._compactar()
+        return self
+
+    def combinar(self, otro: "CuantilesKLL") -> "CuantilesKLL":
+        """Incorporar otro boceto ajustado sobre datos distintos."""
+        while len(self._niveles) < len(otro._niveles):
+            self._niveles.append(np.empty(0))
+        for h, nivel in enumerate(otro._niveles):
+            self._niveles[h] = np.concatenate([self._niveles[h], nivel])
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._compactar()
+        return self
+
+    def cuantil(self, q: Any) -> Any:
+        """Estimar el cuantil (o cuantiles) ``q`` en ``[0, 1]``."""
+        escalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            resultado = np.full(len(q), np.nan)
+        else:
+            valores = np.concatenate(self._niveles)
+            pesos = np.concatenate(
+                [np.full(len(n), 2.0**h) for h, n in enumerate(self._niveles)]
+            )
+            orden = np.argsort(valores, kind="stable")
+            valores = valores[orden]
+            acumulado = np.cumsum(pesos[orden])
+            # Posición media de cada valor en el flujo ordenado (de 0 a 1)
+            centros = (acumulado - pesos[orden] / 2) / acumulado[-1]
+            resultado = np.interp(q, centros, valores)
+            resultado = np.where(q <= 0, self.minimo, resultado)
+            resultado = np.where(q >= 1, self.maximo, resultado)
+        return resultado[0] if escalar else resultado
+
+
+class Momentos:
+    """Media, varianza, asimetría y curtosis combinables de un flujo.
+
+    Acumula el número de valores, la media y las sumas de las potencias 2, 3
+    y 4 de las desviaciones respecto a la media. Cada bloque se resume de
+    forma vectorizada y se incorpora con las fórmulas de combinación de
+    Chan y Pébay, de modo que el resultado coincide (salvo redondeo) con el
+    de los datos completos, igual que al combinar bloques ajustados en
+    paralelo. Los valores nulos se ignoran.
+
+    Examples
+    --------
+    >>> momentos = Momentos()
+    >>> for bloque in bloques:
+    ...     momentos.actualizar(bloque["importe"])
+    >>> momentos.media, momentos.desviacion()
+    """
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.media = np.nan
+        self._m2 = self._m3 = self._m4 = 0.0
+
+    def actualizar(self, valores: Any) -> "Momentos":
+        """Añadir ``valores`` a los momentos."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores):
+            bloque = Momentos()
+            bloque.n = len(valores)
+            bloque.media = valores.mean()
+            centrados = valores - bloque.media
+            cuadrados = centrados * centrados
+            bloque._m2 = cuadrados.sum()
+            bloque._m3 = (cuadrados * centrados).sum()
+            bloque._m4 = (cuadrados * cuadrados).sum()
+            self.combinar(bloque)
+        return self
+
+    def combinar(self, otro: "Momentos") -> "Momentos":
+        """Incorporar los momentos de otros datos."""
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media = otro.n, otro.media
+            self._m2, self._m3, self._m4 = otro._m2, otro._m3, otro._m4
+            return self
+        na, nb = float(self.n), float(otro.n)
+        n = na + nb
+        d = otro.media - self.media
+        m2 = self._m2 + otro._m2 + d**2 * na * nb / n
+        m3 = (
+            self._m3
+            + otro._m3
+            + d**3 * na * nb * (na - nb) / n**2
+            + 3 * d * (na * otro._m2 - nb * self._m2) / n
+        )
+        m4 = (
+            self._m4
+            + otro._m4
+            + d**4 * na * nb * (na**2 - na * nb + nb**2) / n**3
+            + 6 * d**2 * (na**2 * otro._m2 + nb**2 * self._m2) / n**2
+            + 4 * d * (na * otro._m3 - nb * self._m3) / n
+        )
+        self.n = self.n + otro.n
+        self.media = self.media + d * nb / n
+        self._m2, self._m3, self._m4 = m2, m3, m4
+        return self
+
+    def desviacion(self) -> float:
+        """Desviación típica muestral, como :meth:`pandas.Series.std`."""
+        return float(np.sqrt(self._m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def asimetria(self) -> float:
+        """Asimetría insesgada, como :meth:`pandas.Series.skew`."""
+        return float(asimetria_momentos(self.n, self._m2, self._m3))
+
+    def curtosis(self) -> float:
+        """Exceso de curtosis insesgado, como :meth:`pandas.Series.kurt`."""
+        return float(curtosis_momentos(self.n, self._m2, self._m4))
+
+
+def asimetria_momentos(n: Any, m2: Any, m3: Any) -> Any:
+    """Asimetría insesgada a partir de ``n`` y las sumas de potencias centradas.
+
+    Acepta escalares o arrays (por ejemplo un valor por grupo) y reproduce
+    :meth:`pandas.Series.skew`: ``NaN`` con menos de 3 valores y 0 si la
+    varianza es despreciable.
+    """
+    n, m2, m3 = (np.asarray(v, dtype=float) for v in (n, m2, m3))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        varianza = m2 / n
+        resultado = np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / varianza**1.5
+    resultado = np.where(varianza <= 1e-14, 0.0, resultado)
+    return np.where(n < 3, np.nan, resultado)
+
+
+def curtosis_momentos(n: Any, m2: Any, m4: Any) -> Any:
+    """Exceso de curtosis insesgado, como :meth:`pandas.Series.kurt`.
+
+    Igual que :func:`asimetria_momentos`, admite escalares o arrays.
+    """
+    n, m2, m4 = (np.asarray(v, dtype=float) for v in (n, m2, m4))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denominador = (n - 2) * (n - 3) * m2**2
+        ajuste = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        resultado = n * (n + 1) * (n - 1) * m4 / denominador - ajuste
+    resultado = np.where(denominador <= 1e-14, 0.0, resultado)
+    return np.where(n < 4, np.nan, resultado)
+
+
+# Hashes procesados a la vez por ``HyperLogLog.agregar``
+_TRAMO_HASHES = 1 << 20
+
+
+def _longitud_bits(valores: np.ndarray) -> np.ndarray:
+    """Número de bits significativos de enteros menores que ``2**32``."""
+    exponentes = (valores.astype(np.float64).view(np.uint64) >> np.uint64(52)).astype(np.int64)
+    return np.maximum(exponentes - 1022, 0)
+
+
+class HyperLogLog:
+    """Estimador HyperLogLog del número de valores distintos.
+
+    Trabaja sobre hashes de 64 bits (por ejemplo de
+    :func:`pandas.util.hash_array`) y ocupa ``2**precision`` bytes. El error
+    relativo típico es ``1.04 / sqrt(2**precision)``: un 0.8 % con la
+    precisión por defecto. Dos estimadores con la misma precisión se combinan
+    con :meth:`combinar` como si hubieran visto la unión de los datos.
+
+    Parameters
+    ----------
+    precision : int, optional
+        Bits del hash usados para elegir el registro, entre 4 y 18.
+
+    Examples
+    --------
+    >>> hll = HyperLogLog()
+    >>> hll.agregar(pd.util.hash_array(valores))
+    >>> hll.estimar()
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision debe estar entre 4 y 18")
+        self.precision = precision
+        self._registros = np.zeros(2**precision, dtype=np.uint8)
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        """Añadir ``hashes`` al estimador."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = np.uint64(self.precision)
+        # Máximo por registro sin ``np.maximum.at``: tabla de presencia
+        # registro x rango y el último rango presente de cada registro
+        presentes = np.zeros((len(self._registros), 66 - self.precision), dtype=bool)
+        presentes[:, 0] = True  # rango 0: registro sin valores
+        # Por tramos para reutilizar temporales pequeños
+        for inicio in range(0, len(hashes), _TRAMO_HASHES):
+            tramo = hashes[inicio : inicio + _TRAMO_HASHES]
+            indices = (tramo >> (np.uint64(64) - p)).astype(np.intp)
+            resto = tramo << p
+            # Posición del primer bit a 1 (ceros a la izquierda + 1), acotada.
+            # La longitud en bits de cada mitad de 32 bits es exacta a partir
+            # del exponente de su conversión a float64
+            alta = _longitud_bits(resto >> np.uint64(32))
+            baja = _longitud_bits(resto & np.uint64(0xFFFFFFFF))
+            ceros = 64 - np.where(alta > 0, alta + 32, baja)
+            presentes[indices, np.minimum(ceros, 64 - self.precision) + 1] = True
+        maximos = presentes.shape[1] - 1 - np.argmax(presentes[:, ::-1], axis=1)
+        np.maximum(self._registros, maximos.astype(np.uint8), out=self._registros)
+
+    def combinar(self, otro: "HyperLogLog") -> "HyperLogLog":
+        """Incorporar otro estimador de la misma precisión."""
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden combinar estimadores de igual precisión")
+        np.maximum(self._registros, otro._registros, out=self._registros)
+        return self
+
+    def estimar(self) -> float:
+        """Número estimado de valores distintos."""
+        m = len(self._registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / np.sum(np.ldexp(1.0, -self._registros.astype(int)))
+        vacios = int(np.count_nonzero(self._registros == 0))
+        if estimacion <= 2.5 * m and vacios:
+            # Corrección para cardinalidades pequeñas (conteo lineal)
+            estimacion = m * math.log(m / vacios)
+        return float(estimacion)
+
+
+class TopK:
+    """Valores más frecuentes de un flujo con el algoritmo *space-saving*.
+
+    Mantiene como mucho ``capacidad`` contadores. Cada frecuencia estimada
+    es una cota superior de la real y ``error`` acota cuánto puede sobrar,
+    siempre por debajo de ``n / capacidad`` para ``n`` valores vistos; los
+    valores cuya frecuencia real supera ese umbral están garantizados en el
+    resumen. Dos resúmenes se combinan con :meth:`combinar`.
+
+    Parameters
+    ----------
+    capacidad : int, optional
+        Número máximo de valores con contador propio.
+
+    Examples
+    --------
+    >>> top = TopK(capacidad=1000)
+    >>> for bloque in bloques:
+    ...     top.actualizar(bloque["producto"])
+    >>> top.mas_frecuentes(10)
+    """
+
+    def __init__(self, capacidad: int = 1000) -> None:
+        if capacidad < 1:
+            raise ValueError("capacidad debe ser positiva")
+        self.capacidad = capacidad
+        self.n = 0
+        self._conteos = pd.Series(dtype="int64")
+        self._errores = pd.Series(dtype="int64")
+        # Cota de la frecuencia de cualquier valor sin contador
+        self._umbral = 0
+
+    def actualizar(self, valores: Any) -> "TopK":
+        """Añadir ``valores`` (los nulos se ignoran)."""
+        return self.agregar_conteos(pd.Series(valores).value_counts(sort=False))
+
+    def agregar_conteos(self, conteos: pd.Series) -> "TopK":
+        """Añadir las frecuencias exactas ``conteos`` (valor -> apariciones)."""
+        bloque = TopK(self.capacidad)
+        conteos = conteos.astype("int64")
+        bloque.n = int(conteos.sum())
+        if len(conteos) > self.capacidad:
+            # Los conteos exactos del bloque se recortan ya a ``capacidad``:
+            # el mayor descartado acota a todos los valores sin contador
+            orden = np.argsort(-conteos.to_numpy(), kind="stable")
+            bloque._umbral = int(conteos.iloc[orden[self.capacidad]])
+            conteos = conteos.iloc[orden[: self.capacidad]]
+        bloque._conteos = conteos
+        bloque._errores = pd.Series(0, index=conteos.index, dtype="int64")
+        return self.combinar(bloque)
+
+    def combinar(self, otro: "TopK") -> "TopK":
+        """Incorporar el resumen de otros datos."""
+        indice = self._conteos.index.union(otro._conteos.index, sort=False)
+
+        def _sumar(propio: pd.Series, ajeno: pd.Series) -> pd.Series:
+            return propio.reindex(indice, fill_value=self._umbral) + ajeno.reindex(
+                indice, fill_value=otro._umbral
+            )
+
+        conteos = _sumar(self._conteos, otro._conteos)
+        errores = _sumar(self._errores, otro._errores)
+        umbral = self._umbral + otro._umbral
+        if len(conteos) > self.capacidad:
+            orden = np.argsort(-conteos.to_numpy(), kind="stable")
+            umbral = max(umbral, int(conteos.iloc[orden[self.capacidad]]))
+            conteos = conteos.iloc[orden[: self.capacidad]]
+            errores = errores.iloc[orden[: self.capacidad]]
+        self._conteos, self._errores, self._umbral = conteos, errores, umbral
+        self.n += otro.n
+        return self
+
+    def mas_frecuentes(self, k: int = 10) -> pd.DataFrame:
+        """Los ``k`` valores más frecuentes con su frecuencia y error máximo."""
+        orden = np.argsort(-self._conteos.to_numpy(), kind="stable")[:k]
+        return pd.DataFrame(
+            {
+                "valor": self._conteos.index[orden],
+                "frecuencia": self._conteos.iloc[orden].to_numpy(),
+                "error": self._errores.iloc[orden].to_numpy(),
+            }
+        )
@@ -0,0 +1,480 @@
+"""Memoización opcional de resultados calculados sobre DataFrames."""
+
+import contextlib
+import copy
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import platform
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Filas muestreadas por la huella rápida
+_MUESTRA_HUELLA = 1024
+
+_CACHE: Optional["CacheResultados"] = None
+_CACHE_MODELOS: Optional["CacheModelos"] = None
+# Estado por hilo de :func:`_sin_cache_modelos`
+_LOCAL = threading.local()
+
+
+def huella(df: pd.DataFrame, completa: bool = False, muestra: int = _MUESTRA_HUELLA) -> str:
+    """Huella de un DataFrame para usarla como clave de caché.
+
+    La huella rápida combina forma, nombres de columnas, tipos, índice, el
+    hash de ``muestra`` filas repartidas uniformemente y, de todo el
+    DataFrame, los nulos por columna y la suma de cada columna numérica.
+    Estos dos últimos son vectoriales y mucho más baratos que el hash de
+    cada fila, y detectan las modificaciones en el sitio de celdas numéricas
+    o que pasan a ser nulas aunque caigan fuera de la muestra. Para detectar
+    cualquier otra modificación (por ejemplo de un texto fuera de la
+    muestra) se usa ``completa=True``, que recorre todas las filas.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame del que obtener la huella.
+    completa : bool, optional
+        Calcular el hash de todas las filas en lugar de una muestra.
+    muestra : int, optional
+        Número de filas muestreadas por la huella rápida.
+
+    Returns
+    -------
+    str
+        Huella hexadecimal de 32 caracteres.
+
+    Examples
+    --------
+    >>> huella(df) == huella(df.copy())
+    True
+    """
+    h = hashlib.blake2b(digest_size=16)
+    cabecera = (
+        df.shape,
+        list(df.columns),
+        [str(t) for t in df.dtypes],
+        type(df.index).__name__,
+        completa,
+    )
+    h.update(repr(cabecera).encode())
+    filas = df
+    if not completa and len(df) > muestra:
+        posiciones = np.linspace(0, len(df) - 1, muestra).astype(np.int64)
+        filas = df.iloc[posiciones]
+        h.update(_agregados(df))
+    h.update(pd.util.hash_pandas_object(filas, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _agregados(df: pd.DataFrame) -> bytes:
+    """Nulos por columna y suma de cada columna numérica de ``df``."""
+    partes = [df.isna().sum().to_numpy(dtype=np.int64).tobytes()]
+    for i in range(df.shape[1]):
+        serie = df.iloc[:, i]
+        if serie.dtype.kind in "iub":
+            # Suma entera exacta (módulo 2**64) para no perder cambios unitarios
+            partes.append(serie.to_numpy(dtype=np.int64, na_value=0).sum().tobytes())
+        elif pd.api.types.is_numeric_dtype(serie.dtype):
+            partes.append(np.nansum(serie.to_numpy(dtype=np.float64, na_value=np.nan)).tobytes())
+    return b"".join(partes)
+
+
+class CacheResultados:
+    """Caché LRU de resultados con un nivel opcional en disco.
+
+    Las entradas más antiguas se descartan al superar ``max_entradas`` en
+    memoria. Con ``directorio`` cada resultado se guarda también como
+    ``pickle`` en disco, de modo que sobrevive al proceso (por ejemplo entre
+    ejecuciones de un informe programado); al superar ``max_entradas_disco``
+    se borran los archivos usados hace más tiempo.
+
+    Parameters
+    ----------
+    max_entradas : int, optional
+        Resultados que se conservan en memoria.
+    directorio : str or PathLike, optional
+        Carpeta del nivel en disco. Sin ella la caché es solo en memoria.
+    completa : bool, optional
+        Usar la huella completa (ver :func:`huella`) en lugar de la muestreada.
+    max_entradas_disco : int, optional
+        Resultados que se conservan en disco.
+    max_bytes_disco : int, optional
+        Tamaño máximo en bytes del nivel en disco.
+
+    Attributes
+    ----------
+    aciertos, fallos : int
+        Consultas resueltas desde la caché y consultas recalculadas.
+    """
+
+    def __init__(
+        self,
+        max_entradas: int = 128,
+        directorio: Optional[Union[str, os.PathLike]] = None,
+        completa: bool = False,
+        max_entradas_disco: int = 1024,
+        max_bytes_disco: Optional[int] = None,
+    ) -> None:
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser positivo")
+        self.max_entradas = max_entradas
+        self.directorio = os.path.abspath(directorio) if directorio is not None else None
+        self.completa = completa
+        self.max_entradas_disco = max_entradas_disco
+        self.max_bytes_disco = max_bytes_disco
+        self.aciertos = 0
+        self.fallos = 0
+        self._memoria: "OrderedDict[str, Any]" = OrderedDict()
+        self._bloqueo = threading.Lock()
+        if self.directorio is not None:
+            os.makedirs(self.directorio, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memoria)
+
+    _EXTENSION = ".pkl"
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}{self._EXTENSION}")
+
+    def _leer(self, ruta: str) -> Any:
+        with open(ruta, "rb") as f:
+            return pickle.load(f)
+
+    def _escribir(self, valor: Any, ruta: str) -> None:
+        with open(ruta, "wb") as f:
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def obtener(self, clave: str) -> Any:
+        """Resultado guardado con ``clave``; lanza ``KeyError`` si no existe."""
+        with self._bloqueo:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos += 1
+                return self._memoria[clave]
+        if self.directorio is not None:
+            ruta = self._ruta(clave)
+            try:
+                valor = self._leer(ruta)
+            except FileNotFoundError:
+                pass
+            except Exception as e:  # archivo truncado o de otra versión
+                logger.warning("Entrada de caché ilegible %s: %s", ruta, e)
+            else:
+                os.utime(ruta)
+                self._guardar_en_memoria(clave, valor)
+                with self._bloqueo:
+                    self.aciertos += 1
+                return valor
+        with self._bloqueo:
+            self.fallos += 1
+        raise KeyError(clave)
+
+    def _guardar_en_memoria(self, clave: str, valor: Any) -> None:
+        with self._bloqueo:
+            self._memoria[clave] = valor
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_entradas:
+                self._memoria.popitem(last=False)
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        """Guardar ``valor`` con ``clave`` en memoria y, si procede, en disco."""
+        self._guardar_en_memoria(clave, valor)
+        if self.directorio is None:
+            return
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            self._escribir(valor, temporal)
+            os.replace(temporal, ruta)
+        except Exception as e:
+            logger.warning("No se pudo guardar la entrada de caché %s: %s", ruta, e)
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return
+        self._recortar_disco()
+
+    def _recortar_disco(self) -> None:
+        archivos = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(self._EXTENSION):
+                try:
+                    estado = os.stat(os.path.join(self.directorio, nombre))
+                except FileNotFoundError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, nombre))
+        archivos.sort()
+        total = sum(tamano for _, tamano, _ in archivos)
+        restantes = len(archivos)
+        for _, tamano, nombre in archivos:
+            sobra_bytes = self.max_bytes_disco is not None and total > self.max_bytes_disco
+            if restantes <= self.max_entradas_disco and not sobra_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directorio, nombre))
+            except FileNotFoundError:
+                pass
+            total -= tamano
+            restantes -= 1
+
+    def limpiar(self) -> None:
+        """Vaciar la caché en memoria y en disco."""
+        with self._bloqueo:
+            self._memoria.clear()
+        if self.directorio is not None:
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith(self._EXTENSION):
+                    os.remove(os.path.join(self.directorio, nombre))
+
+
+def activar_cache(
+    max_entradas: int = 128,
+    directorio: Optional[Union[str, os.PathLike]] = None,
+    completa: bool = False,
+    max_entradas_disco: int = 1024,
+) -> CacheResultados:
+    """Activar la memoización de perfiles y estadísticas.
+
+    Mientras esté activa, las funciones decoradas con :func:`memoizar`
+    (``perfilar`` y con ella ``nulos``, ``resumen_dataset`` y
+    ``resumen_columnas``, y ``matriz_correlacion``) devuelven el resultado
+    guardado si se llaman con los mismos argumentos sobre un DataFrame con la
+    misma huella. Los parámetros son los de :class:`CacheResultados`.
+
+    Returns
+    -------
+    CacheResultados
+        Caché activa, útil para consultar aciertos o vaciarla.
+
+    Examples
+    --------
+    >>> activar_cache(directorio=".cache_formulas")
+    >>> resumen_columnas(df)  # calcula
+    >>> resumen_columnas(df)  # inmediato
+    """
+    global _CACHE
+    _CACHE = CacheResultados(max_entradas, directorio, completa, max_entradas_disco)
+    return _CACHE
+
+
+def desactivar_cache() -> None:
+    """Desactivar la memoización activada con :func:`activar_cache`."""
+    global _CACHE
+    _CACHE = None
+
+
+def _clave(func: Callable, args: tuple, kwargs: dict, completa: bool, extra: tuple = ()) -> str:
+    # ``repr`` de arrays grandes se trunca con "...": se usa su huella
+    def _normalizar(valor: Any) -> Any:
+        if isinstance(valor, (pd.DataFrame, pd.Series)):
+            return ("huella", huella(pd.DataFrame(valor), completa=completa))
+        if isinstance(valor, np.ndarray):
+            filas = valor.reshape(len(valor), -1) if valor.ndim else valor.reshape(1, 1)
+            return ("array", valor.shape, huella(pd.DataFrame(filas), completa=completa))
+        if isinstance(valor, (pd.Index, pd.api.extensions.ExtensionArray)):
+            tipo = valor.dtype
+            if isinstance(tipo, pd.CategoricalDtype):
+                tipo = (_normalizar(tipo.categories), tipo.ordered)
+            return ("array", tipo, huella(pd.DataFrame({"valor": valor}), completa=completa))
+        if isinstance(valor, (list, tuple)):
+            return (type(valor).__name__, [_normalizar(v) for v in valor])
+        if isinstance(valor, dict):
+            return ("dict", sorted((repr(k), _normalizar(v)) for k, v in valor.items()))
+        return valor
+
+    partes = (
+        func.__module__,
+        func.__qualname__,
+        [_normalizar(a) for a in args],
+        sorted((k, _normalizar(v)) for k, v in kwargs.items()),
+        extra,
+    )
+    return hashlib.blake2b(repr(partes).encode(), digest_size=16).hexdigest()
+
+
+def memoizar(func: Callable) -> Callable:
+    """Decorador que guarda en la caché activa los resultados de ``func``.
+
+    Solo actúa si hay una caché activa y el primer argumento es un
+    DataFrame; en otro caso (por ejemplo con iteradores de bloques) llama a
+    ``func`` sin más. Se devuelve siempre una copia del resultado guardado,
+    de modo que modificarlo no altera la caché.
+    """
+
+    @functools.wraps(func)
+    def envoltura(*args: Any, **kwargs: Any) -> Any:
+        cache = _CACHE
+        if cache is None or not args or not isinstance(args[0], pd.DataFrame):
+            return func(*args, **kwargs)
+        try:
+            clave = _clave(func, args, kwargs, cache.completa)
+        except TypeError:  # valores no hashables, p. ej. listas en columnas object
+            return func(*args, **kwargs)
+        try:
+            return copy.deepcopy(cache.obtener(clave))
+        except KeyError:
+            pass
+        resultado = func(*args, **kwargs)
+        cache.guardar(clave, resultado)
+        return copy.deepcopy(resultado)
+
+    return envoltura
+
+
+class CacheModelos(CacheResultados):
+    """Caché en disco de modelos entrenados, guardados con ``joblib``.
+
+    Igual que :class:`CacheResultados` pero con ``directorio`` obligatorio,
+    huella completa de los datos y límite opcional de bytes en disco; ver
+    :func:`activar_cache_modelos`.
+    """
+
+    _EXTENSION = ".joblib"
+
+    def __init__(
+        self,
+        directorio: Union[str, os.PathLike],
+        max_entradas_disco: int = 64,
+        max_bytes_disco: Optional[int] = None,
+        max_entradas: int = 8,
+    ) -> None:
+        super().__init__(max_entradas, directorio, True, max_entradas_disco, max_bytes_disco)
+
+    def _leer(self, ruta: str) -> Any:
+        import joblib
+
+        return joblib.load(ruta)
+
+    def _escribir(self, valor: Any, ruta: str) -> None:
+        import joblib
+
+        joblib.dump(valor, ruta)
+
+
+def activar_cache_modelos(
+    directorio: Union[str, os.PathLike] = ".cache_modelos",
+    max_entradas_disco: int = 64,
+    max_bytes_disco: Optional[int] = None,
+    max_entradas: int = 8,
+) -> CacheModelos:
+    """Activar la caché de modelos de las funciones ``entrenar_*``.
+
+    Mientras esté activa, ``entrenar_regresion_logistica``, ``entrenar_mlp``
+    y ``entrenar_random_forest`` guardan en ``directorio`` cada modelo
+    ajustado y, ante una llamada idéntica, lo cargan en lugar de volver a
+    entrenarlo. La clave combina la huella completa de ``X_train`` e
+    ``y_train``, la función (y con ella la clase del estimador), todos los
+    parámetros, incluidos los que toman su valor por defecto, y las
+    versiones de Python, NumPy, pandas y scikit-learn. Al superar
+    ``max_entradas_disco`` archivos o ``max_bytes_disco`` bytes se borran
+    los modelos usados hace más tiempo.
+
+    Parameters
+    ----------
+    directorio : str or PathLike, optional
+        Carpeta donde se guardan los modelos.
+    max_entradas_disco : int, optional
+        Modelos que se conservan en disco.
+    max_bytes_disco : int, optional
+        Tamaño máximo en bytes de la carpeta.
+    max_entradas : int, optional
+        Modelos que se conservan además en memoria.
+
+    Returns
+    -------
+    CacheModelos
+        Caché activa.
+
+    Examples
+    --------
+    >>> activar_cache_modelos(max_bytes_disco=2 * 1024**3)
+    >>> modelo = entrenar_random_forest(X_train, y_train, n_estimators=500)  # entrena
+    >>> modelo = entrenar_random_forest(X_train, y_train, n_estimators=500)  # carga
+    """
+    global _CACHE_MODELOS
+    _CACHE_MODELOS = CacheModelos(directorio, max_entradas_disco, max_bytes_disco, max_entradas)
+    return _CACHE_MODELOS
+
+
+def desactivar_cache_modelos() -> None:
+    """Desactivar la caché activada con :func:`activar_cache_modelos`."""
+    global _CACHE_MODELOS
+    _CACHE_MODELOS = None
+
+
+@contextlib.contextmanager
+def _sin_cache_modelos():
+    """Entrenar sin pasar por la caché de modelos dentro del bloque.
+
+    A diferencia de llamar a ``func.__wrapped__``, conserva los demás
+    decoradores que tenga la función de entrenamiento.
+    """
+    anterior = getattr(_LOCAL, "sin_cache", False)
+    _LOCAL.sin_cache = True
+    try:
+        yield
+    finally:
+        _LOCAL.sin_cache = anterior
+
+
+def _versiones() -> tuple:
+    versiones = [platform.python_version(), np.__version__, pd.__version__]
+    try:
+        import sklearn
+
+        versiones.append(sklearn.__version__)
+    except ImportError:
+        pass
+    return tuple(versiones)
+
+
+def _argumentos(func: Callable, args: tuple, kwargs: dict) -> dict:
+    """Argumentos de la llamada por nombre, con los valores por defecto."""
+    ligados = inspect.signature(func).bind(*args, **kwargs)
+    ligados.apply_defaults()
+    argumentos = {}
+    for nombre, valor in ligados.arguments.items():
+        if ligados.signature.parameters[nombre].kind is inspect.Parameter.VAR_KEYWORD:
+            argumentos.update(valor)
+        else:
+            argumentos[nombre] = valor
+    return argumentos
+
+
+def memoizar_modelo(func: Callable) -> Callable:
+    """Decorador que guarda en la caché de modelos los modelos de ``func``.
+
+    Solo actúa si hay una caché activada con :func:`activar_cache_modelos`.
+    Como :func:`memoizar`, devuelve siempre una copia del modelo guardado.
+    """
+
+    @functools.wraps(func)
+    def envoltura(*args: Any, **kwargs: Any) -> Any:
+        cache = _CACHE_MODELOS
+        if cache is None or getattr(_LOCAL, "sin_cache", False):
+            return func(*args, **kwargs)
+        try:
+            clave = _clave(func, (), _argumentos(func, args, kwargs), True, _versiones())
+        except TypeError:
+            return func(*args, **kwargs)
+        try:
+            modelo = copy.deepcopy(cache.obtener(clave))
+            logger.debug("Modelo de %s cargado de la caché", func.__name__)
+            return modelo
+        except KeyError:
+            pass
+        modelo = func(*args, **kwargs)
+        cache.guardar(clave, modelo)
+        return copy.deepcopy(modelo)
+
+    return envoltura
@@ -0,0 +1,183 @@
+"""Codificación one-hot con vocabulario ajustado y salida dispersa."""
+
+import os
+import pickle
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class CodificadorOneHot:
+    """Codificador one-hot con vocabulario estable entre lotes.
+
+    El vocabulario de cada columna se fija al ajustar, por lo que todos los
+    lotes transformados tienen exactamente las mismas columnas en el mismo
+    orden; las categorías no vistas van a la categoría ``otros`` (o a ninguna
+    si no existe). Con ``max_categorias`` o ``frecuencia_min`` las categorías
+    poco frecuentes se agrupan en ``otros`` para limitar la anchura del
+    resultado. Por defecto la salida es dispersa, de modo que su memoria es
+    proporcional al número de filas y no al de categorías.
+
+    Parameters
+    ----------
+    columnas : str or iterable of str
+        Columnas categóricas a codificar.
+    max_categorias : int, optional
+        Número máximo de categorías por columna, las más frecuentes.
+    frecuencia_min : int, optional
+        Apariciones mínimas para que una categoría tenga columna propia.
+    otros : str, optional
+        Nombre de la categoría que agrupa las poco frecuentes y las no vistas.
+    disperso : bool, optional
+        Si ``True`` (por defecto) las columnas codificadas son dispersas.
+
+    Examples
+    --------
+    >>> codificador = CodificadorOneHot(["pais"], max_categorias=50).ajustar(train)
+    >>> codificador.guardar("codificador.pkl")
+    >>> for lote in pd.read_csv("scoring.csv", chunksize=100_000):
+    ...     X = codificador.transformar_matriz(lote)
+    """
+
+    def __init__(
+        self,
+        columnas: Union[str, Iterable[str]],
+        max_categorias: Optional[int] = None,
+        frecuencia_min: Optional[int] = None,
+        otros: str = "otros",
+        disperso: bool = True,
+    ) -> None:
+        if max_categorias is not None and max_categorias < 1:
+            raise ValueError("max_categorias debe ser positivo")
+        self.columnas: List[str] = [columnas] if isinstance(columnas, str) else list(columnas)
+        self.max_categorias = max_categorias
+        self.frecuencia_min = frecuencia_min
+        self.otros = otros
+        self.disperso = disperso
+        self._conteos: Dict[str, pd.Series] = {}
+        self._con_otros: Dict[str, bool] = {}
+        self.vocabulario_: Optional[Dict[str, pd.Index]] = None
+        self.columnas_salida_: Optional[List[str]] = None
+
+    def ajustar_parcial(self, df: pd.DataFrame) -> "CodificadorOneHot":
+        """Actualizar las frecuencias de las categorías con un bloque."""
+        for col in self.columnas:
+            conteos = df[col].value_counts(sort=False)
+            if col in self._conteos:
+                conteos = conteos.add(self._conteos[col], fill_value=0)
+            self._conteos[col] = conteos
+        self._finalizar()
+        return self
+
+    def ajustar(
+        self, datos: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> "CodificadorOneHot":
+        """Ajustar el vocabulario sobre un DataFrame o un iterador de bloques."""
+        self._conteos = {}
+        bloques = [datos] if isinstance(datos, pd.DataFrame) else datos
+        for bloque in bloques:
+            self.ajustar_parcial(bloque)
+        return self
+
+    def _finalizar(self) -> None:
+        """Fijar el vocabulario a partir de las frecuencias acumuladas."""
+        vocabulario, con_otros = {}, {}
+        for col in self.columnas:
+            conteos = self._conteos[col]
+            try:
+                conteos = conteos.sort_index()
+            except TypeError:
+                pass
+            conservadas = conteos
+            if self.frecuencia_min is not None:
+                conservadas = conservadas[conservadas >= self.frecuencia_min]
+            if self.max_categorias is not None and len(conservadas) > self.max_categorias:
+                # Orden estable: a igual frecuencia se conserva la menor categoría
+                mayores = conservadas.sort_values(ascending=False, kind="stable")
+                elegidas = mayores.index[: self.max_categorias]
+                conservadas = conservadas[conservadas.index.isin(elegidas)]
+            categorias = conservadas.index
+            con_otros[col] = len(conservadas) < len(conteos)
+            if con_otros[col]:
+                categorias = categorias.astype(object).append(pd.Index([self.otros]))
+            vocabulario[col] = categorias
+        self.vocabulario_ = vocabulario
+        self._con_otros = con_otros
+        self.columnas_salida_ = [
+            f"{col}_{categoria}" for col, cats in vocabulario.items() for categoria in cats
+        ]
+
+    def _codigos(self, serie: pd.Series, col: str) -> np.ndarray:
+        """Posición de cada valor en el vocabulario; ``-1`` si no tiene columna."""
+        categorias = self.vocabulario_[col]
+        if not self._con_otros[col]:
+            return categorias.get_indexer(serie)
+        codigos = categorias[:-1].get_indexer(serie)
+        codigos[(codigos == -1) & serie.notna().to_numpy()] = len(categorias) - 1
+        return codigos
+
+    def transformar_matriz(self, df: pd.DataFrame) -> sparse.csr_matrix:
+        """Codificar ``df`` como matriz dispersa CSR con :attr:`columnas_salida_`."""
+        if self.vocabulario_ is None:
+            raise ValueError("El codificador no está ajustado")
+        bloques = []
+        for col, categorias in self.vocabulario_.items():
+            codigos = self._codigos(df[col], col)
+            filas = np.flatnonzero(codigos >= 0)
+            bloques.append(
+                sparse.csr_matrix(
+                    (np.ones(len(filas), dtype=bool), (filas, codigos[filas])),
+                    shape=(len(df), len(categorias)),
+                )
+            )
+        return sparse.hstack(bloques, format="csr")
+
+    def transformar(
+        self, datos: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Sustituir las columnas codificadas por sus indicadoras.
+
+        Parameters
+        ----------
+        datos : pandas.DataFrame or iterable of pandas.DataFrame
+            Datos a codificar. Si es un iterador de bloques se devuelve un
+            generador que codifica cada bloque al consumirlo.
+
+        Returns
+        -------
+        pandas.DataFrame or iterator of pandas.DataFrame
+            Datos con las columnas no codificadas seguidas de las indicadoras,
+            como :func:`pandas.get_dummies`.
+        """
+        if not isinstance(datos, pd.DataFrame):
+            return (self.transformar(bloque) for bloque in datos)
+        matriz = self.transformar_matriz(datos)
+        if self.disperso:
+            codificadas = pd.DataFrame.sparse.from_spmatrix(
+                matriz, index=datos.index, columns=self.columnas_salida_
+            )
+        else:
+            codificadas = pd.DataFrame(
+                matriz.toarray(), index=datos.index, columns=self.columnas_salida_
+            )
+        return pd.concat([datos.drop(columns=self.columnas), codificadas], axis=1)
+
+    def ajustar_transformar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Ajustar sobre ``df`` y devolverlo codificado."""
+        return self.ajustar(df).transformar(df)
+
+    def guardar(self, ruta: Union[str, os.PathLike]) -> None:
+        """Guardar el codificador ajustado en ``ruta``."""
+        with open(os.path.abspath(ruta), "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def cargar(cls, ruta: Union[str, os.PathLike]) -> "CodificadorOneHot":
+        """Cargar un codificador guardado con :meth:`guardar`."""
+        with open(os.path.abspath(ruta), "rb") as f:
+            codificador = pickle.load(f)
+        if not isinstance(codificador, cls):
+            raise TypeError(f"{ruta} no contiene un {cls.__name__}")
+        return codificador
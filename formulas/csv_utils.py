@@ -4,7 +4,7 @@ import csv
 import logging
 import os
 import sys
-from typing import Union
+from typing import Iterator, Union
 
 import pandas as pd
 
@@ -64,7 +64,7 @@ def cargar_csv(
     imprimir: bool = True,
     modo: str = "auto",  # 'auto', 'print' o 'logger'
     **kwargs,
-) -> Union[pd.DataFrame, None]:
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame], None]:
     """Carga un CSV con detección de delimitador y codificación.
 
     Parameters
@@ -79,7 +79,9 @@ def cargar_csv(
         Con ``"print"`` se utiliza siempre ``print`` y con ``"logger"`` se
         envían los mensajes al ``logger``.
     **kwargs : dict, optional
-        Parámetros adicionales que se pasarán a :func:`pandas.read_csv`.
+        Parámetros adicionales que se pasarán a :func:`pandas.read_csv`. Con
+        ``chunksize`` se devuelve el lector por bloques, por ejemplo para
+        :class:`~formulas.estadisticas.PerfilIncremental`.
     """
 
     # Permitir recibir "modo" dentro de kwargs y hacerlo case-insensitive
@@ -118,6 +120,10 @@ def cargar_csv(
     try:
         df = pd.read_csv(ruta_archivo, **params, **kwargs)
 
+        if not isinstance(df, pd.DataFrame):
+            # Con ``chunksize`` o ``iterator`` se devuelve el lector por bloques
+            return df
+
         if imprimir:
             msg = [
                 f"✅ Archivo CSV cargado: {nombre_archivo_simple}",
@@ -1,27 +1,489 @@
 """Cálculos estadísticos básicos y avanzados."""
 
-from typing import Iterable, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from scipy.stats import norm, probplot, shapiro
+from scipy.stats import anderson, norm, normaltest, probplot, shapiro
+
+from .aproximados import (
+    CuantilesKLL,
+    HyperLogLog,
+    Momentos,
+    TopK,
+    asimetria_momentos,
+    curtosis_momentos,
+)
+from .cache import memoizar
+from .particionado import _hash_filas
+
+
+# Percentiles que incluye ``DataFrame.describe`` por defecto
+_PERCENTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+def _momentos(ordenados: np.ndarray) -> Dict[str, float]:
+    """Media, desviación, asimetría y curtosis con las fórmulas de pandas."""
+    momentos = Momentos().actualizar(ordenados)
+    return {
+        "mean": momentos.media,
+        "std": momentos.desviacion(),
+        "Asimetría": momentos.asimetria(),
+        "Curtosis": momentos.curtosis(),
+    }
+
+
+# Columnas que tiene siempre el perfil, aunque ``df`` no tenga columnas
+_COLUMNAS_PERFIL = ["Tipo", "Nulos", "Ejemplo", "Valores únicos"]
+
+
+def _perfil_columna(serie: pd.Series, estadisticas: bool) -> Dict[str, Any]:
+    """Métricas de una columna reutilizando una única máscara de nulos."""
+    nulos_col = serie.isna().to_numpy()
+    n_nulos = int(nulos_col.sum())
+    validos = len(serie) - n_nulos
+    fila: Dict[str, Any] = {
+        "Tipo": serie.dtype,
+        "Nulos": n_nulos,
+        "Ejemplo": serie.iloc[nulos_col.argmin()] if validos else "-",
+    }
+    numerica = pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(
+        serie
+    )
+    if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "iuf":
+        # Una sola ordenación da mínimo, máximo, cuartiles y valores únicos
+        valores = serie.to_numpy()
+        ordenados = np.sort(valores[~nulos_col] if n_nulos else valores)
+        fila["Valores únicos"] = int(validos and 1 + np.count_nonzero(np.diff(ordenados)))
+        if estadisticas:
+            ordenados = ordenados.astype(np.float64, copy=False)
+            fila["count"] = float(validos)
+            fila.update(_momentos(ordenados))
+            if validos:
+                fila["min"], fila["max"] = ordenados[0], ordenados[-1]
+                cuartiles = np.quantile(ordenados, list(_PERCENTILES.values()))
+                fila.update(zip(_PERCENTILES, cuartiles))
+        return fila
+    fila["Valores únicos"] = int(serie.nunique())
+    if estadisticas:
+        descripcion = serie.describe()
+        fila.update({k: descripcion[k] for k in descripcion.index})
+        if numerica:
+            fila.update({"Asimetría": serie.skew(), "Curtosis": serie.kurt()})
+    return fila
+
+
+def _contar_duplicados(df: pd.DataFrame) -> int:
+    """Número de filas duplicadas, como ``df.duplicated().sum()``.
+
+    Se calcula primero un hash por fila, mucho más barato que factorizar
+    cada columna, y solo las filas cuyo hash se repite se comparan de forma
+    exacta. Las columnas ``object`` (donde ``1`` y ``1.0`` son iguales pero
+    su hash no) se comparan siempre de forma exacta.
+    """
+    if df.empty or any(t == object for t in df.dtypes):
+        return int(df.duplicated().sum())
+    candidatas = pd.Series(_hash_filas(df)).duplicated(keep=False).to_numpy()
+    return int(df[candidatas].duplicated().sum())
+
+
+def _hash_valores(serie: pd.Series) -> np.ndarray:
+    """Hash de 64 bits de cada valor; los números se comparan como flotantes."""
+    if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "iuf":
+        return pd.util.hash_array(serie.to_numpy(dtype=np.float64) + 0.0)
+    return pd.util.hash_pandas_object(serie, index=False).to_numpy()
+
+
+def _tipo_comun(tipos: List[Any]) -> Any:
+    if len(set(tipos)) == 1:
+        return tipos[0]
+    if all(isinstance(t, np.dtype) and t.kind in "iuf" for t in tipos):
+        return np.result_type(*tipos)
+    return np.dtype(object)
+
+
+class PerfilIncremental:
+    """Perfil de columnas que se actualiza bloque a bloque.
+
+    Es la versión en flujo de :func:`perfilar` para datos que no caben en
+    memoria (por ejemplo los bloques de ``cargar_csv(..., chunksize=...)`` o
+    de ``leer_query(..., tam_bloque=...)``). Todo su estado es combinable,
+    de modo que los perfiles parciales calculados en paralelo se unen con
+    :meth:`combinar` en un único informe. Respecto al perfil en memoria:
+
+    * filas, nulos, recuento, mínimo y máximo son exactos;
+    * media, desviación, asimetría y curtosis son exactas salvo redondeo
+      (momentos combinables de Welford/Chan);
+    * los valores únicos se estiman con :class:`HyperLogLog`, con un error
+      relativo típico de ``1.04 / sqrt(2**precision)`` (0.8 %);
+    * los cuartiles se estiman con :class:`CuantilesKLL`, con un error de
+      rango de aproximadamente ``1.7 / k`` (0.9 % de las posiciones);
+    * ``top``/``freq`` de las columnas no numéricas salen de :class:`TopK`:
+      la frecuencia puede exceder a la real en menos de ``filas / capacidad``;
+    * las filas duplicadas se cuentan guardando el hash de 64 bits de cada
+      fila distinta; si hay más de ``max_hashes_filas`` se estiman como
+      filas menos filas distintas (HyperLogLog de precisión 16, error del
+      0.4 % de las filas distintas).
+
+    Parameters
+    ----------
+    estadisticas : bool, optional
+        Calcular también las estadísticas descriptivas.
+    k : int, optional
+        Precisión de los bocetos de cuantiles.
+    precision : int, optional
+        Precisión de los estimadores de valores distintos.
+    capacidad_top : int, optional
+        Contadores de valores frecuentes por columna no numérica.
+    max_hashes_filas : int, optional
+        Filas distintas hasta las que los duplicados se cuentan de forma
+        exacta (8 bytes por fila distinta).
+    semilla : int, optional
+        Semilla de los bocetos de cuantiles, para que el perfil sea
+        reproducible. ``None`` para una semilla aleatoria.
+
+    Examples
+    --------
+    >>> perfil = PerfilIncremental()
+    >>> for bloque in cargar_csv("ventas.csv", chunksize=1_000_000):
+    ...     perfil.actualizar(bloque)
+    >>> resumen_columnas(None, perfil=perfil.perfil())
+    """
+
+    def __init__(
+        self,
+        estadisticas: bool = True,
+        k: int = 200,
+        precision: int = 14,
+        capacidad_top: int = 1000,
+        max_hashes_filas: int = 10_000_000,
+        semilla: Optional[int] = 0,
+    ) -> None:
+        self.estadisticas = estadisticas
+        self.k = k
+        self.semilla = semilla
+        self.precision = precision
+        self.capacidad_top = capacidad_top
+        self.max_hashes_filas = max_hashes_filas
+        self.filas = 0
+        self._hashes_filas: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+        self._hashes_pendientes: List[np.ndarray] = []
+        self._filas_distintas = HyperLogLog(16)
+        self._columnas: Dict[Any, Dict[str, Any]] = {}
+
+    def _estado(self) -> Dict[str, Any]:
+        return {
+            "tipos": [],
+            "nulos": 0,
+            "ejemplo": [],
+            "distintos": HyperLogLog(self.precision),
+            "momentos": Momentos(),
+            "cuantiles": CuantilesKLL(self.k, semilla=self.semilla),
+            "top": TopK(self.capacidad_top),
+        }
+
+    def actualizar(self, df: pd.DataFrame) -> "PerfilIncremental":
+        """Incorporar un bloque de filas."""
+        self.filas += len(df)
+        hashes = _hash_filas(df)
+        self._filas_distintas.agregar(hashes)
+        self._acumular_hashes([hashes])
+        for col, serie in df.items():
+            estado = self._columnas.setdefault(col, self._estado())
+            if serie.dtype not in estado["tipos"]:
+                estado["tipos"].append(serie.dtype)
+            nulos_col = serie.isna().to_numpy()
+            estado["nulos"] += int(nulos_col.sum())
+            validos = serie[~nulos_col] if nulos_col.any() else serie
+            if not len(validos):
+                continue
+            if not estado["ejemplo"]:
+                estado["ejemplo"].append(validos.iloc[0])
+            estado["distintos"].agregar(_hash_valores(validos))
+            if not self.estadisticas:
+                continue
+            tipo = validos.dtype
+            if isinstance(tipo, np.dtype) and tipo.kind in "iufM":
+                valores = validos.to_numpy()
+                if tipo.kind == "M":
+                    valores = valores.view(np.int64)
+                valores = valores.astype(np.float64)
+                estado["momentos"].actualizar(valores)
+                estado["cuantiles"].actualizar(valores)
+            else:
+                estado["top"].actualizar(validos)
+        return self
+
+    def _acumular_hashes(self, hashes: List[np.ndarray]) -> None:
+        """Guardar hashes de filas, deduplicando cuando se acumulan demasiados."""
+        if self._hashes_filas is None:
+            return
+        self._hashes_pendientes.extend(hashes)
+        pendientes = sum(len(h) for h in self._hashes_pendientes)
+        # Deduplicar solo al duplicar el tamaño mantiene el coste amortizado lineal
+        if pendientes > max(len(self._hashes_filas), 1_000_000):
+            self._deduplicar_hashes()
+
+    def _deduplicar_hashes(self) -> None:
+        if self._hashes_filas is None or not self._hashes_pendientes:
+            return
+        self._hashes_filas = np.unique(
+            np.concatenate([self._hashes_filas, *self._hashes_pendientes])
+        )
+        self._hashes_pendientes = []
+        if len(self._hashes_filas) > self.max_hashes_filas:
+            self._hashes_filas = None
+
+    def combinar(self, otro: "PerfilIncremental") -> "PerfilIncremental":
+        """Incorporar el perfil de otras filas (por ejemplo de otro proceso)."""
+        self.filas += otro.filas
+        self._filas_distintas.combinar(otro._filas_distintas)
+        if otro._hashes_filas is None:
+            self._hashes_filas, self._hashes_pendientes = None, []
+        else:
+            self._acumular_hashes([otro._hashes_filas, *otro._hashes_pendientes])
+        for col, ajeno in otro._columnas.items():
+            if col not in self._columnas:
+                self._columnas[col] = ajeno
+                continue
+            estado = self._columnas[col]
+            estado["tipos"].extend(t for t in ajeno["tipos"] if t not in estado["tipos"])
+            estado["nulos"] += ajeno["nulos"]
+            estado["ejemplo"] = estado["ejemplo"] or ajeno["ejemplo"]
+            for clave in ("distintos", "momentos", "cuantiles", "top"):
+                estado[clave].combinar(ajeno[clave])
+        return self
+
+    def _fila(self, estado: Dict[str, Any]) -> Dict[str, Any]:
+        tipo = _tipo_comun(estado["tipos"])
+        validos = self.filas - estado["nulos"]
+        fila: Dict[str, Any] = {
+            "Tipo": tipo,
+            "Nulos": estado["nulos"],
+            "Ejemplo": estado["ejemplo"][0] if estado["ejemplo"] else "-",
+            "Valores únicos": int(min(round(estado["distintos"].estimar()), validos)),
+        }
+        if not self.estadisticas:
+            return fila
+        momentos, cuantiles = estado["momentos"], estado["cuantiles"]
+        fila["count"] = validos if momentos.n == 0 else float(validos)
+        if momentos.n == 0:
+            top = estado["top"].mas_frecuentes(1)
+            fila["unique"] = fila["Valores únicos"]
+            if len(top):
+                fila["top"], fila["freq"] = top["valor"].iloc[0], top["frecuencia"].iloc[0]
+            return fila
+        cuartiles = dict(zip(_PERCENTILES, cuantiles.cuantil(list(_PERCENTILES.values()))))
+        if isinstance(tipo, np.dtype) and tipo.kind == "M":
+            unidad = np.datetime_data(tipo)[0]
+            valores = {"mean": momentos.media, "min": cuantiles.minimo}
+            valores.update(cuartiles)
+            valores["max"] = cuantiles.maximo
+            fila.update(
+                {c: pd.Timestamp(np.datetime64(int(round(v)), unidad)) for c, v in valores.items()}
+            )
+            return fila
+        fila.update(
+            {
+                "mean": momentos.media,
+                "std": momentos.desviacion(),
+                "Asimetría": momentos.asimetria(),
+                "Curtosis": momentos.curtosis(),
+                "min": cuantiles.minimo,
+                "max": cuantiles.maximo,
+            }
+        )
+        fila.update(cuartiles)
+        return fila
+
+    def perfil(self) -> pd.DataFrame:
+        """Perfil con el mismo formato que el de :func:`perfilar`."""
+        filas = {col: self._fila(estado) for col, estado in self._columnas.items()}
+        perfil = pd.DataFrame.from_dict(filas, orient="index")
+        self._deduplicar_hashes()
+        if self._hashes_filas is None:
+            distintas = round(self._filas_distintas.estimar())
+        else:
+            distintas = len(self._hashes_filas)
+        perfil.attrs["filas"] = self.filas
+        perfil.attrs["duplicados"] = int(max(0, self.filas - distintas))
+        perfil.attrs["estadisticas"] = self.estadisticas
+        perfil.attrs["aproximado"] = True
+        return perfil
+
+
+def _perfil_parcial(bloque: pd.DataFrame, estadisticas: bool) -> PerfilIncremental:
+    return PerfilIncremental(estadisticas).actualizar(bloque)
+
+
+def _perfilar_bloques(
+    bloques: Iterable[pd.DataFrame], estadisticas: bool, n_workers: int
+) -> pd.DataFrame:
+    """Perfilar un flujo de bloques, repartiéndolos entre procesos si se pide."""
+    perfil = PerfilIncremental(estadisticas)
+    if n_workers <= 1:
+        for bloque in bloques:
+            perfil.actualizar(bloque)
+        return perfil.perfil()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        # Como mucho dos bloques por proceso en vuelo para acotar la memoria;
+        # se combinan en orden para que el ejemplo sea el del primer bloque
+        pendientes: deque = deque()
+        for bloque in bloques:
+            pendientes.append(pool.submit(_perfil_parcial, bloque, estadisticas))
+            if len(pendientes) >= 2 * n_workers:
+                perfil.combinar(pendientes.popleft().result())
+        while pendientes:
+            perfil.combinar(pendientes.popleft().result())
+    return perfil.perfil()
+
+
+@memoizar
+def perfilar(
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    estadisticas: bool = True,
+    n_workers: int = 1,
+) -> pd.DataFrame:
+    """Calcular en una sola pasada todas las métricas por columna.
+
+    Es el motor común de :func:`nulos`, :func:`resumen_dataset` y
+    :func:`resumen_columnas`: cada columna se recorre una vez para obtener
+    sus nulos, valores únicos, un ejemplo y, si ``estadisticas`` es ``True``,
+    la media, desviación, cuartiles, asimetría y curtosis. Las filas
+    duplicadas se cuentan una sola vez para todo el DataFrame. Pasar el
+    resultado a esas funciones mediante ``perfil`` evita volver a recorrer
+    los datos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame a perfilar. Con un iterador de bloques se usa
+        :class:`PerfilIncremental` y algunas métricas son aproximadas (ver
+        sus cotas de error); ``attrs["aproximado"]`` vale entonces ``True``.
+    estadisticas : bool, optional
+        Calcular también las estadísticas descriptivas.
+    n_workers : int, optional
+        Procesos entre los que repartir los bloques de un iterador.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una fila por columna de ``df``. El número de filas y de filas
+        duplicadas se guardan en ``attrs["filas"]`` y ``attrs["duplicados"]``.
+
+    Examples
+    --------
+    >>> perfil = perfilar(df)
+    >>> nulos(df, perfil=perfil)
+    >>> resumen_columnas(df, perfil=perfil)
+    """
+    if not isinstance(df, pd.DataFrame):
+        return _perfilar_bloques(df, estadisticas, n_workers)
+    # Por posición: con nombres de columna repetidos ``df[col]`` es un DataFrame
+    filas = [_perfil_columna(df.iloc[:, i], estadisticas) for i in range(df.shape[1])]
+    perfil = pd.DataFrame(filas, index=df.columns)
+    for col in _COLUMNAS_PERFIL:
+        if col not in perfil.columns:
+            perfil[col] = pd.Series(dtype=object)
+    perfil.attrs["filas"] = len(df)
+    perfil.attrs["duplicados"] = _contar_duplicados(df)
+    perfil.attrs["estadisticas"] = estadisticas
+    return perfil
+
+
+def _diseno_muestral(df: Any) -> Optional[tuple]:
+    """Estrato de cada fila y filas de cada estrato en la población.
+
+    Solo para muestras de :func:`~formulas.file_utils.cargar_muestra`; un
+    muestreo aleatorio simple es un único estrato con todas las filas.
+    """
+    info = df.attrs.get("muestra") if isinstance(df, pd.DataFrame) else None
+    if not info:
+        return None
+    estratos = info.get("estratos")
+    if estratos and any(col not in df.columns for col in estratos):
+        # Una selección de columnas conserva ``attrs`` pero sin los estratos
+        # no se puede reconstruir el diseño
+        return None
+    if estratos:
+        grupos = df.groupby(estratos, dropna=False, observed=True, sort=False)
+        codigos = grupos.ngroup().to_numpy()
+        claves = grupos.size().index.to_frame(index=False)
+        filas = info["filas_por_estrato"]
+        tamanos = pd.DataFrame(
+            [k if isinstance(k, tuple) else (k,) for k in filas], columns=estratos
+        )
+        tamanos["_filas"] = list(filas.values())
+        # ``merge`` empareja también los estratos con claves nulas
+        poblacion = claves.merge(tamanos, on=estratos, how="left")["_filas"]
+        poblacion = poblacion.to_numpy(dtype=float)
+    else:
+        codigos = np.zeros(len(df), dtype=np.int64)
+        poblacion = np.array([info["filas_totales"]], dtype=float)
+    return codigos, poblacion
+
+
+def _intervalos_muestra(valores: pd.DataFrame, diseno: tuple, nivel: float) -> tuple:
+    """Estimación poblacional de la media de cada columna y su intervalo.
+
+    Estimador estratificado: medias por estrato ponderadas por las filas no
+    nulas estimadas en la población, con corrección por población finita.
+    """
+    codigos, poblacion = diseno
+    grupos = valores.groupby(codigos)
+    validos = grupos.count().to_numpy(dtype=float)
+    medias = grupos.mean().to_numpy(dtype=float)
+    varianzas = np.nan_to_num(grupos.var().to_numpy(dtype=float))
+    muestra = np.bincount(codigos).astype(float)[:, None]
+    poblacion = poblacion[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pesos = poblacion * validos / muestra
+        pesos = pesos / pesos.sum(axis=0)
+        estimacion = np.nansum(pesos * medias, axis=0)
+        correccion = np.clip(1 - muestra / poblacion, 0, 1)
+        varianza = np.nansum(pesos**2 * correccion * varianzas / validos, axis=0)
+    margen = norm.ppf(0.5 + nivel / 2) * np.sqrt(varianza)
+    estimacion = pd.Series(estimacion, index=valores.columns)
+    return estimacion, estimacion - margen, estimacion + margen
+
+
+def _obtener_perfil(
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]], perfil: Optional[pd.DataFrame], estadisticas: bool
+) -> pd.DataFrame:
+    if perfil is None or (estadisticas and not perfil.attrs.get("estadisticas")):
+        return perfilar(df, estadisticas=estadisticas)
+    return perfil
 
 
 def nulos(
-    df: pd.DataFrame, ordenar_por: str = "Nulos", imprimir: bool = True
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    ordenar_por: str = "Nulos",
+    imprimir: bool = True,
+    perfil: Optional[pd.DataFrame] = None,
+    nivel_confianza: float = 0.95,
 ) -> pd.DataFrame:
     """Resumen de valores nulos, porcentaje y valores únicos.
 
+    Si ``df`` es una muestra de :func:`~formulas.file_utils.cargar_muestra`,
+    el porcentaje de nulos es la estimación para el origen completo y se
+    añaden las columnas ``IC Inferior %`` e ``IC Superior %``.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        DataFrame de entrada.
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame de entrada o iterador de bloques (ver :func:`perfilar`).
     ordenar_por : str, optional
         Columna por la que ordenar el resultado.
     imprimir : bool, optional
         Si se debe imprimir el resumen por pantalla.
+    perfil : pandas.DataFrame, optional
+        Resultado de :func:`perfilar` sobre ``df`` para no recalcularlo.
+    nivel_confianza : float, optional
+        Nivel de los intervalos de confianza de las muestras.
 
     Returns
     -------
@@ -32,18 +494,27 @@ def nulos(
     --------
     >>> resumen = nulos(df)
     """
-    nulos_por_columna = df.isnull().sum()
-    porcentaje = (nulos_por_columna / len(df)) * 100
-    valores_unicos = df.nunique()
-    filas_dup = df.duplicated().sum()
+    perfil = _obtener_perfil(df, perfil, estadisticas=False)
+    filas = perfil.attrs["filas"]
+    filas_dup = perfil.attrs["duplicados"]
     resumen = pd.DataFrame(
         {
-            "Nulos": nulos_por_columna,
-            "Porcentaje Nulos": porcentaje.round(2),
-            "Valores únicos": valores_unicos,
+            "Nulos": perfil["Nulos"].astype("int64"),
+            "Porcentaje Nulos": (perfil["Nulos"] / filas * 100).astype(float).round(2),
+            "Valores únicos": perfil["Valores únicos"].astype("int64"),
         }
     )
-    resumen.loc["Duplicados"] = [filas_dup, (filas_dup / len(df)) * 100, "N/A"]
+    duplicados = [filas_dup, (filas_dup / filas) * 100 if filas else np.nan, "N/A"]
+    diseno = _diseno_muestral(df)
+    if diseno is not None:
+        estimacion, inferior, superior = _intervalos_muestra(
+            df[perfil.index].isna().astype(float), diseno, nivel_confianza
+        )
+        resumen["Porcentaje Nulos"] = (estimacion * 100).round(2)
+        resumen["IC Inferior %"] = (inferior.clip(lower=0) * 100).round(2)
+        resumen["IC Superior %"] = (superior.clip(upper=1) * 100).round(2)
+        duplicados += ["N/A", "N/A"]
+    resumen.loc["Duplicados"] = duplicados
     if ordenar_por in resumen.columns:
         resumen = resumen.sort_values(by=ordenar_por, ascending=False)
     if imprimir:
@@ -52,76 +523,567 @@ def nulos(
     return resumen
 
 
+# Filas por tramo al resumir frecuencias, para acotar la memoria de value_counts
+_TRAMO_FRECUENCIAS = 1_000_000
+
+
+def _frecuencias_parciales(
+    df: pd.DataFrame, columnas: List[str], capacidad: int
+) -> Dict[str, Dict[str, Any]]:
+    """Nulos, valores distintos y más frecuentes de ``columnas`` en bocetos."""
+    estados = {}
+    for col in columnas:
+        serie = df[col]
+        estado = {
+            "tipo": serie.dtype,
+            "nulos": 0,
+            "distintos": HyperLogLog(),
+            "top": TopK(capacidad),
+        }
+        for inicio in range(0, len(serie), _TRAMO_FRECUENCIAS):
+            tramo = serie.iloc[inicio : inicio + _TRAMO_FRECUENCIAS]
+            nulos_tramo = tramo.isna().to_numpy()
+            estado["nulos"] += int(nulos_tramo.sum())
+            # Un único value_counts por tramo: sus valores distintos bastan
+            # para el HyperLogLog, que ignora las repeticiones
+            conteos = tramo[~nulos_tramo].value_counts(sort=False)
+            estado["distintos"].agregar(_hash_valores(conteos.index.to_series()))
+            estado["top"].agregar_conteos(conteos)
+        estados[col] = estado
+    return estados
+
+
+def _combinar_frecuencias(
+    acumulado: Dict[str, Dict[str, Any]], parcial: Dict[str, Dict[str, Any]]
+) -> None:
+    for col, estado in parcial.items():
+        if col not in acumulado:
+            acumulado[col] = estado
+            continue
+        acumulado[col]["nulos"] += estado["nulos"]
+        acumulado[col]["distintos"].combinar(estado["distintos"])
+        acumulado[col]["top"].combinar(estado["top"])
+
+
+def _frecuencias_aproximadas(
+    datos: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    columnas: List[str],
+    capacidad: int,
+    n_workers: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Bocetos de frecuencias de un DataFrame (columnas en paralelo) o flujo."""
+    estados: Dict[str, Dict[str, Any]] = {}
+    if isinstance(datos, pd.DataFrame):
+        if n_workers <= 1 or len(columnas) < 2:
+            return _frecuencias_parciales(datos, columnas, capacidad)
+        grupos = [list(g) for g in np.array_split(np.array(columnas, dtype=object), n_workers)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futuros = [
+                pool.submit(_frecuencias_parciales, datos[g], g, capacidad) for g in grupos if g
+            ]
+            for futuro in futuros:
+                estados.update(futuro.result())
+        return {col: estados[col] for col in columnas}
+    if n_workers <= 1:
+        for bloque in datos:
+            _combinar_frecuencias(estados, _frecuencias_parciales(bloque, columnas, capacidad))
+        return estados
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pendientes: deque = deque()
+        for bloque in datos:
+            pendientes.append(
+                pool.submit(_frecuencias_parciales, bloque[columnas], columnas, capacidad)
+            )
+            if len(pendientes) >= 2 * n_workers:
+                _combinar_frecuencias(estados, pendientes.popleft().result())
+        while pendientes:
+            _combinar_frecuencias(estados, pendientes.popleft().result())
+    return estados
+
+
+def _tabla_frecuencias(conteos: pd.Series, col: str) -> pd.DataFrame:
+    """Tabla devuelta por :func:`describir_columnas` a partir de ``value_counts``."""
+    return conteos.reset_index().rename(columns={"index": "valor", col: "frecuencia"})
+
+
 def describir_columnas(
-    df: pd.DataFrame, columnas: Iterable[str]
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    columnas: Iterable[str],
+    n_valores: int = 10,
+    aproximado: bool = False,
+    capacidad: int = 1000,
+    n_workers: int = 1,
+    imprimir: bool = True,
 ) -> dict[str, pd.DataFrame]:
     """Mostrar y resumir información de un conjunto de columnas.
 
+    Con ``aproximado=True`` (obligatorio si ``df`` es un iterador de
+    bloques) los valores más frecuentes se obtienen con :class:`TopK` en
+    memoria acotada por ``capacidad`` en lugar de con un ``value_counts``
+    completo, y los valores distintos se estiman con :class:`HyperLogLog`.
+    Las frecuencias son entonces cotas superiores: la real está entre
+    ``count - error`` y ``count``, y ``error`` nunca supera
+    ``filas / capacidad``.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        DataFrame con los datos.
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame con los datos o iterador de bloques.
     columnas : iterable of str
         Columnas a describir.
+    n_valores : int, optional
+        Número de valores más frecuentes a devolver por columna.
+    aproximado : bool, optional
+        Usar bocetos de memoria acotada.
+    capacidad : int, optional
+        Contadores del boceto de valores frecuentes por columna.
+    n_workers : int, optional
+        Procesos entre los que repartir las columnas o los bloques.
+    imprimir : bool, optional
+        Mostrar o no el resumen por pantalla.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Valores más frecuentes de cada columna y su frecuencia; en modo
+        aproximado con la columna adicional ``error``.
 
     Examples
     --------
     >>> describir_columnas(df, ["col1", "col2"])
+    >>> describir_columnas(cargar_csv("eventos.csv", chunksize=1_000_000), ["usuario"])
     """
+    columnas = list(columnas)
     resumen: dict[str, pd.DataFrame] = {}
+    if isinstance(df, pd.DataFrame):
+        for col in [c for c in columnas if c not in df.columns]:
+            print(f"La columna {col} no existe en el DataFrame")
+        columnas = [c for c in columnas if c in df.columns]
+    else:
+        aproximado = True
+
+    if not aproximado:
+        for col in columnas:
+            top = df[col].value_counts().head(n_valores)
+            if imprimir:
+                print(f"\nColumna: {col} - Tipo de datos: {df[col].dtype}")
+                print(
+                    f"Valores nulos: {df[col].isnull().sum()}  -  Valores distintos: {df[col].nunique()}"
+                )
+                print("Valores más frecuentes:")
+                for valor, cuenta in top.items():
+                    print(f"{valor:<20} {cuenta}")
+            resumen[col] = _tabla_frecuencias(top, col)
+        return resumen
+
+    estados = _frecuencias_aproximadas(df, columnas, capacidad, n_workers)
     for col in columnas:
-        if col not in df.columns:
+        if col not in estados:
             print(f"La columna {col} no existe en el DataFrame")
             continue
-        print(f"\nColumna: {col} - Tipo de datos: {df[col].dtype}")
-        print(
-            f"Valores nulos: {df[col].isnull().sum()}  -  Valores distintos: {df[col].nunique()}"
-        )
-        print("Valores más frecuentes:")
-        top = df[col].value_counts().head(10)
-        for valor, cuenta in top.items():
-            print(f"{valor:<20} {cuenta}")
-        resumen[col] = top.reset_index().rename(
-            columns={"index": "valor", col: "frecuencia"}
+        estado = estados[col]
+        top = estado["top"].mas_frecuentes(n_valores)
+        if imprimir:
+            print(f"\nColumna: {col} - Tipo de datos: {estado['tipo']}")
+            print(
+                f"Valores nulos: {estado['nulos']}  -  "
+                f"Valores distintos: ~{round(estado['distintos'].estimar())}"
+            )
+            print("Valores más frecuentes (aproximados):")
+            for valor, cuenta, error in top.itertuples(index=False):
+                print(f"{valor:<20} {cuenta}" + (f" (±{error})" if error else ""))
+        conteos = pd.Series(
+            top["frecuencia"].to_numpy(), index=pd.Index(top["valor"], name=col), name="count"
         )
+        resumen[col] = _tabla_frecuencias(conteos, col)
+        resumen[col]["error"] = top["error"].to_numpy()
     return resumen
 
 
+# Columnas a partir de las cuales el mapa de calor se dibuja sin anotaciones
+_MAX_ANOTACIONES = 50
+
+
+def _estandarizar(
+    df_num: pd.DataFrame, metodo: str, dtype: np.dtype, tam_bloque: int
+) -> tuple:
+    """Columnas tipificadas (nulos a 0) y máscara de válidos, por bloques.
+
+    Tipificar antes de acumular los productos evita la cancelación de las
+    sumas sin centrar, lo que permite calcular en ``float32``.
+    """
+    n, p = df_num.shape
+    z = np.empty((n, p), dtype=dtype, order="F")
+    validos = None
+    for inicio in range(0, p, tam_bloque):
+        bloque = df_num.iloc[:, inicio : inicio + tam_bloque]
+        if metodo == "spearman":
+            # Una sola pasada de rangos por columna (empates con rango medio)
+            bloque = bloque.rank()
+        x = bloque.to_numpy(dtype=np.float64, na_value=np.nan)
+        nulos_bloque = np.isnan(x)
+        if nulos_bloque.any():
+            if validos is None:
+                validos = np.ones((n, p), dtype=bool, order="F")
+            validos[:, inicio : inicio + x.shape[1]] = ~nulos_bloque
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = np.nanmean(x, axis=0) if n else np.zeros(x.shape[1])
+            escala = np.nanstd(x, axis=0) if n else np.zeros(x.shape[1])
+        constantes = ~(escala > 0)
+        escala[constantes] = 1.0
+        x = (x - media) / escala
+        x[:, constantes] = 0.0
+        x[nulos_bloque] = 0.0
+        z[:, inicio : inicio + x.shape[1]] = x
+    return z, validos
+
+
+def _correlacion_bloque(
+    z: np.ndarray, validos: Optional[np.ndarray], i: slice, j: slice
+) -> np.ndarray:
+    """Correlación entre dos bloques de columnas con casos completos por pares."""
+    zi, zj = z[:, i], z[:, j]
+    productos = zi.T @ zj
+    if validos is None:
+        n = np.float64(len(z))
+        suma_i = np.zeros((zi.shape[1], 1))
+        suma_j = np.zeros((1, zj.shape[1]))
+        cuadrados_i = (zi * zi).sum(axis=0, dtype=np.float64)[:, None]
+        cuadrados_j = (zj * zj).sum(axis=0, dtype=np.float64)[None, :]
+    else:
+        mi, mj = validos[:, i].astype(z.dtype), validos[:, j].astype(z.dtype)
+        n = (mi.T @ mj).astype(np.float64)
+        suma_i = (zi.T @ mj).astype(np.float64)
+        suma_j = (mi.T @ zj).astype(np.float64)
+        cuadrados_i = ((zi * zi).T @ mj).astype(np.float64)
+        cuadrados_j = (mi.T @ (zj * zj)).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covarianza = productos - suma_i * suma_j / n
+        varianza_i = cuadrados_i - suma_i * suma_i / n
+        varianza_j = cuadrados_j - suma_j * suma_j / n
+        divisor = np.sqrt(varianza_i * varianza_j)
+        r = np.where(divisor > 0, covarianza / divisor, np.nan)
+    return np.clip(r, -1.0, 1.0)
+
+
+def _pares_bloque(
+    r: np.ndarray, i: slice, j: slice, umbral: float, top_k: Optional[int]
+) -> tuple:
+    """Pares ``(fila, columna, r)`` del bloque con ``|r| >= umbral``."""
+    absoluto = np.abs(r)
+    seleccion = absoluto >= umbral
+    if i == j:
+        seleccion &= np.triu(np.ones(r.shape, dtype=bool), k=1)
+    filas, columnas = np.nonzero(seleccion)
+    valores = r[filas, columnas]
+    if top_k is not None and len(valores) > top_k:
+        mejores = np.argpartition(-np.abs(valores), top_k - 1)[:top_k]
+        filas, columnas, valores = filas[mejores], columnas[mejores], valores[mejores]
+    return filas + i.start, columnas + j.start, valores
+
+
+@memoizar
+def _correlacion(
+    df: pd.DataFrame,
+    metodo: str = "pearson",
+    dtype: str = "float64",
+    tam_bloque: int = 512,
+    n_workers: int = 1,
+    top_k: Optional[int] = None,
+    umbral: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    df_num = df.select_dtypes(include=["number"])
+    columnas = df_num.columns
+    p = len(columnas)
+    if p < 2:
+        return None
+    por_pares = top_k is not None or umbral is not None
+    if metodo not in ("pearson", "spearman"):
+        if por_pares:
+            raise ValueError("top_k y umbral solo admiten 'pearson' o 'spearman'")
+        return df_num.corr(method=metodo)
+
+    z, validos = _estandarizar(df_num, metodo, np.dtype(dtype), tam_bloque)
+    bloques = [slice(a, min(a + tam_bloque, p)) for a in range(0, p, tam_bloque)]
+    tareas = [(i, j) for a, i in enumerate(bloques) for j in bloques[a:]]
+
+    def _calcular(tarea: tuple) -> tuple:
+        i, j = tarea
+        r = _correlacion_bloque(z, validos, i, j)
+        if por_pares:
+            return i, j, _pares_bloque(r, i, j, umbral or 0.0, top_k)
+        return i, j, r
+
+    # Los productos de matrices liberan el GIL, así que basta con hilos que
+    # comparten los datos tipificados sin copiarlos
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            resultados = list(pool.map(_calcular, tareas))
+    else:
+        resultados = [_calcular(t) for t in tareas]
+
+    if por_pares:
+        filas = np.concatenate([res[0] for _, _, res in resultados])
+        cols = np.concatenate([res[1] for _, _, res in resultados])
+        valores = np.concatenate([res[2] for _, _, res in resultados])
+        orden = np.argsort(-np.abs(valores), kind="stable")[:top_k]
+        return pd.DataFrame(
+            {
+                "variable_1": columnas[filas[orden]],
+                "variable_2": columnas[cols[orden]],
+                "correlacion": valores[orden].astype(dtype),
+            }
+        )
+
+    matriz = np.empty((p, p), dtype=dtype)
+    for i, j, r in resultados:
+        matriz[i, j] = r
+        matriz[j, i] = r.T
+    # La diagonal es 1 salvo en columnas sin variación, como en pandas
+    diagonal = np.diagonal(matriz).copy()
+    np.fill_diagonal(matriz, np.where(np.isnan(diagonal), np.nan, 1.0))
+    return pd.DataFrame(matriz, index=columnas, columns=columnas)
+
+
 def matriz_correlacion(
-    df: pd.DataFrame, imprimir: bool = False
+    df: pd.DataFrame,
+    imprimir: bool = False,
+    metodo: str = "pearson",
+    graficar: bool = True,
+    top_k: Optional[int] = None,
+    umbral: Optional[float] = None,
+    dtype: str = "float64",
+    tam_bloque: int = 512,
+    n_workers: int = 1,
 ) -> Optional[pd.DataFrame]:
     """Calcular y mostrar la matriz de correlación para columnas numéricas.
 
+    La matriz se calcula por bloques de columnas con productos de matrices,
+    usando en cada par los casos completos (como ``DataFrame.corr``), por lo
+    que escala a miles de columnas. Spearman se obtiene con una única pasada
+    de rangos por columna; si las columnas tienen nulos en filas distintas
+    puede diferir ligeramente de pandas, que vuelve a ordenar cada par.
+
     Parameters
     ----------
     df : pandas.DataFrame
         Conjunto de datos de entrada.
     imprimir : bool, optional
         Mostrar o no la matriz en consola.
+    metodo : {"pearson", "spearman", "kendall"}, optional
+        Coeficiente de correlación. ``"kendall"`` se delega en pandas.
+    graficar : bool, optional
+        Dibujar el mapa de calor. Con ``False`` solo se calcula.
+    top_k : int, optional
+        Devolver solo los ``top_k`` pares con mayor ``|r|``.
+    umbral : float, optional
+        Devolver solo los pares con ``|r| >= umbral``.
+    dtype : {"float64", "float32"}, optional
+        Precisión del cálculo. ``"float32"`` reduce a la mitad la memoria y
+        el tiempo con un error del orden de ``1e-4``.
+    tam_bloque : int, optional
+        Columnas por bloque.
+    n_workers : int, optional
+        Hilos entre los que repartir los pares de bloques.
 
     Returns
     -------
     pandas.DataFrame or None
-        Matriz de correlación calculada.
+        Matriz de correlación calculada o, con ``top_k`` o ``umbral``, los
+        pares ``variable_1``, ``variable_2`` y ``correlacion`` ordenados por
+        ``|r|`` descendente.
+
+    Examples
+    --------
+    >>> matriz_correlacion(df, graficar=False, metodo="spearman", dtype="float32")
+    >>> matriz_correlacion(df, graficar=False, top_k=20, umbral=0.8, n_workers=4)
     """
-    df_num = df.select_dtypes(include=["number"])
-    if df_num.shape[1] < 2:
+    corr = _correlacion(
+        df,
+        metodo=metodo,
+        dtype=dtype,
+        tam_bloque=tam_bloque,
+        n_workers=n_workers,
+        top_k=top_k,
+        umbral=umbral,
+    )
+    if corr is None:
         print(
             "El DataFrame no tiene suficientes columnas numéricas para calcular la correlación."
         )
         return None
-    corr = df_num.corr()
+    por_pares = top_k is not None or umbral is not None
     if imprimir:
-        print("Matriz de correlación:")
+        print("Pares más correlacionados:" if por_pares else "Matriz de correlación:")
         print(corr)
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(corr, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5)
-    plt.title("Mapa de Calor - Matriz de Correlación")
-    plt.show()
+    if graficar and not por_pares:
+        anotar = len(corr) <= _MAX_ANOTACIONES
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(corr, annot=anotar, cmap="coolwarm", fmt=".2f", linewidths=0.5 if anotar else 0)
+        plt.title("Mapa de Calor - Matriz de Correlación")
+        plt.show()
     return corr
 
 
-def resumen_dataset(df: pd.DataFrame, imprimir: bool = True) -> pd.DataFrame:
+def _ordenar_por_grupo(valores: np.ndarray, grupos: np.ndarray, n_grupos: int) -> np.ndarray:
+    """Permutación que ordena por grupo y, dentro de cada grupo, por valor."""
+    if n_grupos > np.iinfo(np.uint16).max + 1:
+        return np.lexsort((valores, grupos))
+    # Con hasta 65536 grupos la ordenación estable de códigos uint16 es una
+    # ordenación radix lineal, varias veces más rápida que ``lexsort``
+    por_valor = np.argsort(valores)
+    return por_valor[np.argsort(grupos[por_valor].astype(np.uint16), kind="stable")]
+
+
+def _estadisticas_grupo(
+    serie: pd.Series, codigos: np.ndarray, n_grupos: int
+) -> Dict[str, np.ndarray]:
+    """Métricas de ``serie`` en cada grupo a partir de los códigos de grupo.
+
+    Una ordenación por (grupo, valor) da a la vez valores distintos, mínimo,
+    máximo y cuartiles; media y momentos centrados salen de ``bincount``.
+    """
+    nulos_col = serie.isna().to_numpy()
+    en_grupo = codigos >= 0
+    validos = ~nulos_col & en_grupo
+    c = codigos[validos]
+    n = np.bincount(c, minlength=n_grupos)
+    fila: Dict[str, np.ndarray] = {
+        "Nulos": np.bincount(codigos[nulos_col & en_grupo], minlength=n_grupos),
+        "count": n,
+    }
+    tipo = serie.dtype
+    if not pd.api.types.is_numeric_dtype(tipo) or pd.api.types.is_bool_dtype(tipo):
+        valores, _ = pd.factorize(serie[validos])
+        pares = np.unique(c.astype(np.int64) * (int(valores.max(initial=0)) + 1) + valores)
+        fila["Valores únicos"] = np.bincount(
+            pares // (int(valores.max(initial=0)) + 1), minlength=n_grupos
+        )
+        return fila
+
+    if isinstance(tipo, np.dtype):
+        x = serie.to_numpy()[validos]
+    else:
+        # Los tipos nulables (``Int64``, ``Float64``) se pasan a ``float64``
+        x = serie.to_numpy(dtype=float, na_value=np.nan)[validos]
+    orden = _ordenar_por_grupo(x, c, n_grupos)
+    ordenados, grupos = x[orden], c[orden]
+    nuevo = np.ones(len(ordenados), dtype=bool)
+    nuevo[1:] = (ordenados[1:] != ordenados[:-1]) | (grupos[1:] != grupos[:-1])
+    fila["Valores únicos"] = np.bincount(grupos[nuevo], minlength=n_grupos)
+
+    ordenados = ordenados.astype(np.float64)
+    hay = n > 0
+    inicios = np.cumsum(n) - n
+    ultimos = np.where(hay, inicios + n - 1, 0)
+    inicios = np.where(hay, inicios, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = np.bincount(grupos, weights=ordenados, minlength=n_grupos) / n
+        centrados = ordenados - media[grupos]
+        cuadrados = centrados * centrados
+        m2 = np.bincount(grupos, weights=cuadrados, minlength=n_grupos)
+        m3 = np.bincount(grupos, weights=cuadrados * centrados, minlength=n_grupos)
+        m4 = np.bincount(grupos, weights=cuadrados * cuadrados, minlength=n_grupos)
+        fila["mean"] = media
+        fila["std"] = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+    if len(ordenados):
+        fila["min"] = np.where(hay, ordenados[inicios], np.nan)
+        for nombre, q in _PERCENTILES.items():
+            # Interpolación lineal entre posiciones, como ``quantile``
+            posicion = inicios + q * (np.maximum(n, 1) - 1)
+            bajo = np.floor(posicion).astype(np.int64)
+            alto = np.ceil(posicion).astype(np.int64)
+            fraccion = posicion - bajo
+            valor = ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * fraccion
+            fila[nombre] = np.where(hay, valor, np.nan)
+        fila["max"] = np.where(hay, ordenados[ultimos], np.nan)
+    else:
+        for nombre in ["min", *_PERCENTILES, "max"]:
+            fila[nombre] = np.full(n_grupos, np.nan)
+    fila["Asimetría"] = asimetria_momentos(n, m2, m3)
+    fila["Curtosis"] = curtosis_momentos(n, m2, m4)
+    return fila
+
+
+def resumen_por_grupos(
+    df: pd.DataFrame,
+    por: Union[str, Iterable[str]],
+    columnas: Optional[Iterable[str]] = None,
+    dropna: bool = True,
+) -> pd.DataFrame:
+    """Estadísticas de cada columna en cada grupo, en formato largo.
+
+    Equivale a aplicar :func:`resumen_columnas` a cada grupo de
+    ``df.groupby(por)``, pero se calcula para todos los grupos a la vez: cada
+    columna se ordena una sola vez por (grupo, valor) para obtener valores
+    distintos, mínimo, máximo y cuartiles, y media, desviación, asimetría y
+    curtosis salen de sumas por grupo de los momentos centrados. Las columnas
+    no numéricas solo tienen nulos, recuento y valores distintos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Datos a resumir.
+    por : str or iterable of str
+        Columnas que definen los grupos (segmentos).
+    columnas : iterable of str, optional
+        Columnas a resumir. Por defecto todas salvo las de ``por``. Sin
+        columnas se devuelve una tabla vacía.
+    dropna : bool, optional
+        Descartar las filas con nulos en las claves, como ``groupby``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una fila por grupo y columna con las claves, ``Variable``, ``Nulos``,
+        ``count``, ``Valores únicos``, ``mean``, ``std``, ``min``, ``25%``,
+        ``50%``, ``75%``, ``max``, ``Asimetría`` y ``Curtosis``, ordenada por
+        grupo.
+
+    Examples
+    --------
+    >>> resumen = resumen_por_grupos(ventas, por=["pais", "producto"])
+    >>> resumen.query("Variable == 'importe'").nlargest(10, "mean")
+    """
+    por = [por] if isinstance(por, str) else list(por)
+    if columnas is None:
+        columnas = [c for c in df.columns if c not in por]
+    columnas = list(columnas)
+    grupos = df.groupby(por, sort=True, dropna=dropna, observed=True)
+    # Las filas con claves nulas descartadas reciben el código -1
+    codigos = grupos.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    claves = grupos.size().index.to_frame(index=False)
+    n_grupos = len(claves)
+
+    metricas = [
+        "Nulos",
+        "count",
+        "Valores únicos",
+        "mean",
+        "std",
+        "min",
+        *_PERCENTILES,
+        "max",
+        "Asimetría",
+        "Curtosis",
+    ]
+    if not columnas:
+        return pd.DataFrame(columns=[*por, "Variable", *metricas])
+    partes = [
+        pd.DataFrame(_estadisticas_grupo(df[col], codigos, n_grupos), columns=metricas)
+        for col in columnas
+    ]
+    # Bloques por columna reordenados por grupo: fila = grupo * columnas + j
+    orden = np.arange(n_grupos * len(columnas)).reshape(len(columnas), n_grupos).T.ravel()
+    resultado = pd.concat(partes, ignore_index=True).iloc[orden].reset_index(drop=True)
+    resultado.insert(0, "Variable", np.tile(np.array(columnas, dtype=object), n_grupos))
+    claves = claves.iloc[np.repeat(np.arange(n_grupos), len(columnas))].reset_index(drop=True)
+    return pd.concat([claves, resultado], axis=1)
+
+
+def resumen_dataset(
+    df: pd.DataFrame, imprimir: bool = True, perfil: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """Obtener un resumen general de un DataFrame.
 
     Parameters
@@ -130,6 +1092,8 @@ def resumen_dataset(df: pd.DataFrame, imprimir: bool = True) -> pd.DataFrame:
         DataFrame de entrada.
     imprimir : bool, optional
         Mostrar o no el resumen por pantalla.
+    perfil : pandas.DataFrame, optional
+        Resultado de :func:`perfilar` sobre ``df`` para no recalcularlo.
 
     Returns
     -------
@@ -140,14 +1104,16 @@ def resumen_dataset(df: pd.DataFrame, imprimir: bool = True) -> pd.DataFrame:
     --------
     >>> resumen = resumen_dataset(df)
     """
+    perfil = _obtener_perfil(df, perfil, estadisticas=False)
+    nulos_col = perfil["Nulos"].astype("int64")
+    celdas = perfil.attrs["filas"] * len(perfil)
     info = {
-        "Filas": len(df),
-        "Columnas": df.shape[1],
-        "Porcentaje Nulos": (df.isnull().sum().sum() / df.size) * 100,
+        "Filas": perfil.attrs["filas"],
+        "Columnas": len(perfil),
+        "Porcentaje Nulos": (nulos_col.sum() / celdas) * 100 if celdas else np.nan,
     }
-    tipos = df.dtypes.to_frame("Tipo")
-    resumen = tipos.copy()
-    resumen["Nulos"] = df.isnull().sum()
+    resumen = df.dtypes.to_frame("Tipo")
+    resumen["Nulos"] = nulos_col.to_numpy()
     if imprimir:
         print("Resumen general del DataFrame:")
         print(info)
@@ -158,18 +1124,29 @@ def resumen_dataset(df: pd.DataFrame, imprimir: bool = True) -> pd.DataFrame:
     return resumen
 
 
-def resumen_columnas(df: pd.DataFrame) -> pd.DataFrame:
+def resumen_columnas(
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    perfil: Optional[pd.DataFrame] = None,
+    nivel_confianza: float = 0.95,
+) -> pd.DataFrame:
     """Obtener un resumen detallado de cada columna de un ``DataFrame``.
 
     El resultado contiene estadísticas descriptivas, tipo de dato,
     recuento de valores únicos, nulos y duplicados, así como un ejemplo de
     valor no nulo.  Para las columnas numéricas se calcula además la
-    asimetría y la curtosis.
+    asimetría y la curtosis.  Si ``df`` es una muestra de
+    :func:`~formulas.file_utils.cargar_muestra`, ``mean`` es la estimación
+    para el origen completo y se añade su intervalo de confianza.
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        Conjunto de datos a analizar.
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        Conjunto de datos a analizar o iterador de bloques (ver
+        :func:`perfilar`).
+    perfil : pandas.DataFrame, optional
+        Resultado de :func:`perfilar` sobre ``df`` para no recalcularlo.
+    nivel_confianza : float, optional
+        Nivel de los intervalos de confianza de las muestras.
 
     Returns
     -------
@@ -182,25 +1159,30 @@ def resumen_columnas(df: pd.DataFrame) -> pd.DataFrame:
     >>> resumen.head()
     """
 
-    # Estadísticas básicas generadas por ``pandas`` y transpuestas para
-    # trabajar por columna en lugar de por fila
-    column_info = df.describe(include="all").T
-
-    # Añadimos información adicional de tipo de dato y distintos conteos
-    column_info["Nombre"] = column_info.index
-    column_info["Tipo de Dato"] = df.dtypes
-    column_info["Valores Únicos"] = df.nunique()
-    column_info["Valores Nulos"] = df.isnull().sum()
-    column_info["Valores duplicados"] = df.duplicated().sum()
-
-    # Ejemplo de valor no nulo por columna (si existe)
-    column_info["Ejemplo de Valor"] = df.apply(
-        lambda x: x.dropna().iloc[0] if not x.dropna().empty else "-", axis=0
+    perfil = _obtener_perfil(df, perfil, estadisticas=True)
+    column_info = perfil.rename(
+        columns={
+            "Tipo": "Tipo de Dato",
+            "Valores únicos": "Valores Únicos",
+            "Nulos": "Valores Nulos",
+            "Ejemplo": "Ejemplo de Valor",
+        }
     )
-
-    # Asimetría y curtosis solo aplican a columnas numéricas
-    column_info["Asimetría"] = df.select_dtypes(include="number").skew()
-    column_info["Curtosis"] = df.select_dtypes(include="number").kurtosis()
+    column_info.insert(0, "Nombre", column_info.index)
+    column_info["Valores duplicados"] = perfil.attrs["duplicados"]
+    for col in ("Asimetría", "Curtosis"):
+        if col not in column_info.columns:
+            column_info[col] = np.nan
+    diseno = _diseno_muestral(df)
+    numericas = df.select_dtypes(include="number").columns if diseno is not None else []
+    if len(numericas):
+        estimacion, inferior, superior = _intervalos_muestra(
+            df[numericas].astype(float), diseno, nivel_confianza
+        )
+        column_info["mean"] = column_info["mean"].astype(object)
+        column_info.loc[numericas, "mean"] = estimacion
+        column_info["IC Media Inferior"] = inferior
+        column_info["IC Media Superior"] = superior
 
     # Orden de columnas para una visualización más cómoda
     columnas_deseadas = [
@@ -211,6 +1193,8 @@ def resumen_columnas(df: pd.DataFrame) -> pd.DataFrame:
         "Valores duplicados",
         "Ejemplo de Valor",
         "mean",
+        "IC Media Inferior",
+        "IC Media Superior",
         "std",
         "min",
         "25%",
@@ -226,9 +1210,9 @@ def resumen_columnas(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     # Redondear valores numéricos para hacer el resultado más legible
-    column_info = column_info.applymap(
-        lambda x: round(x, 2) if isinstance(x, (int, float)) else x
-    )
+    # (``DataFrame.applymap`` se renombró a ``DataFrame.map`` en pandas 2.1)
+    redondear = getattr(column_info, "map", None) or column_info.applymap
+    column_info = redondear(lambda x: round(x, 2) if isinstance(x, (int, float)) else x)
 
     # Reiniciar el índice para obtener un DataFrame limpio
     column_info.reset_index(drop=True, inplace=True)
@@ -236,8 +1220,83 @@ def resumen_columnas(df: pd.DataFrame) -> pd.DataFrame:
     return column_info
 
 
+# Tamaño a partir del cual Shapiro-Wilk deja de ser fiable (aviso de scipy)
+_MAX_SHAPIRO = 5000
+# Puntos del Q-Q plot obtenidos del boceto de cuantiles en columnas grandes
+_PUNTOS_QQ = 500
+_METODOS_NORMALIDAD = {"shapiro", "auto", "dagostino", "anderson"}
+
+
+def _anderson(valores: np.ndarray) -> tuple:
+    """Estadístico y p-valor de Anderson-Darling para la normal."""
+    try:
+        resultado = anderson(valores, method="interpolate")
+        return resultado.statistic, resultado.pvalue
+    except TypeError:  # scipy < 1.17: interpolar en la tabla de valores críticos
+        resultado = anderson(valores)
+        niveles = resultado.significance_level / 100
+        return resultado.statistic, float(
+            np.interp(resultado.statistic, resultado.critical_values, niveles)
+        )
+
+
+def _datos_qq(valores: np.ndarray) -> tuple:
+    """Cuantiles teóricos, muestrales y recta ajustada del Q-Q plot.
+
+    Hasta ``_MAX_SHAPIRO`` valores coincide con :func:`scipy.stats.probplot`;
+    por encima los cuantiles muestrales salen de un boceto :class:`CuantilesKLL`
+    en ``_PUNTOS_QQ`` posiciones, sin ordenar la columna completa.
+    """
+    valores = valores[~np.isnan(valores)]
+    if len(valores) <= _MAX_SHAPIRO:
+        (teoricos, muestrales), (pendiente, ordenada, _) = probplot(valores, dist=norm)
+        return teoricos, muestrales, pendiente, ordenada
+    posiciones = (np.arange(_PUNTOS_QQ) + 0.5) / _PUNTOS_QQ
+    teoricos = norm.ppf(posiciones)
+    muestrales = CuantilesKLL(semilla=0).actualizar(valores).cuantil(posiciones)
+    pendiente, ordenada = np.polyfit(teoricos, muestrales, 1)
+    return teoricos, muestrales, pendiente, ordenada
+
+
+def _test_normalidad(
+    valores: np.ndarray,
+    metodo: str,
+    max_muestra: Optional[int],
+    semilla: int,
+    graficar: bool,
+) -> tuple:
+    """Test de normalidad de una columna y, si se pide, sus datos Q-Q."""
+    if metodo == "shapiro" and max_muestra is None:
+        # Comportamiento original: Shapiro sobre la columna tal cual
+        estadistico, p_valor = shapiro(valores)
+        test = "shapiro"
+    else:
+        validos = valores[~np.isnan(valores)]
+        if metodo == "auto":
+            metodo = "shapiro" if len(validos) <= _MAX_SHAPIRO else "dagostino"
+        if metodo == "dagostino":
+            estadistico, p_valor = normaltest(validos)
+        elif metodo == "anderson":
+            estadistico, p_valor = _anderson(validos)
+        else:
+            limite = max_muestra or _MAX_SHAPIRO
+            if len(validos) > limite:
+                rng = np.random.default_rng(semilla)
+                validos = validos[rng.choice(len(validos), limite, replace=False)]
+            estadistico, p_valor = shapiro(validos)
+        test = metodo
+    qq = _datos_qq(valores) if graficar else None
+    return float(estadistico), float(p_valor), test, qq
+
+
 def comprueba_normalidad(
-    df: pd.DataFrame, titulo: str = "Comprobación de normalidad"
+    df: pd.DataFrame,
+    titulo: str = "Comprobación de normalidad",
+    metodo: str = "shapiro",
+    graficar: bool = True,
+    n_workers: int = 1,
+    max_muestra: Optional[int] = None,
+    semilla: int = 0,
 ) -> pd.DataFrame:
     """Evaluar la normalidad de cada columna numérica de ``df``.
 
@@ -245,43 +1304,81 @@ def comprueba_normalidad(
     test de Shapiro-Wilk.  El DataFrame resultante incluye el estadístico y el
     ``p-value`` de cada variable.
 
+    Shapiro-Wilk deja de ser fiable por encima de 5000 valores. Con
+    ``metodo="auto"`` se aplica Shapiro hasta ese tamaño y D'Agostino-Pearson
+    (basado en momentos, lineal en el número de filas) por encima; también
+    pueden elegirse D'Agostino, Anderson-Darling o Shapiro sobre una
+    submuestra reproducible (``max_muestra``). En las columnas grandes el
+    Q-Q plot se dibuja a partir de un boceto de cuantiles en lugar de ordenar
+    todos los valores.
+
     Parameters
     ----------
     df : pandas.DataFrame
         Datos a evaluar. Solo se tendrán en cuenta las columnas numéricas.
     titulo : str, optional
         Texto mostrado como título de la figura.
+    metodo : {"shapiro", "auto", "dagostino", "anderson"}, optional
+        Test a aplicar. Salvo con ``"shapiro"`` se descartan los nulos.
+    graficar : bool, optional
+        Dibujar los Q-Q plots. Con ``False`` solo se calculan los tests.
+    n_workers : int, optional
+        Procesos entre los que repartir las columnas.
+    max_muestra : int, optional
+        Tamaño de la submuestra aleatoria sobre la que aplicar Shapiro.
+    semilla : int, optional
+        Semilla de la submuestra.
 
     Returns
     -------
     pandas.DataFrame
-        Resultados del test de Shapiro-Wilk por columna.
+        Estadístico y p-valor por columna. Si ``metodo`` no es ``"shapiro"``
+        se añade la columna ``Test`` con el test aplicado a cada una.
 
     Examples
     --------
     >>> comprueba_normalidad(df[["edad", "ingresos"]])
+    >>> comprueba_normalidad(df, metodo="auto", graficar=False, n_workers=8)
     """
+    if metodo not in _METODOS_NORMALIDAD:
+        raise ValueError(f"metodo debe ser uno de {sorted(_METODOS_NORMALIDAD)}")
+    df = df.select_dtypes(include="number")
+    columnas = list(df.columns)
+    argumentos = [
+        (df[col].to_numpy(dtype=np.float64, na_value=np.nan), metodo, max_muestra, semilla, graficar)
+        for col in columnas
+    ]
+    if n_workers > 1 and len(columnas) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            salidas = list(pool.map(_test_normalidad, *zip(*argumentos)))
+    else:
+        salidas = [_test_normalidad(*a) for a in argumentos]
+
+    if graficar:
+        # Número de gráficos y distribución en la figura
+        fig_tot = len(columnas)
+        fig_por_fila = 3
+        tamanio_fig = 4.0
+        num_filas = int(np.ceil(fig_tot / fig_por_fila))
 
-    # Número de gráficos y distribución en la figura
-    fig_tot = len(df.columns)
-    fig_por_fila = 3.0
-    tamanio_fig = 4.0
-    num_filas = int(np.ceil(fig_tot / fig_por_fila))
-
-    # Creamos la figura donde se dibujarán los Q-Q plots
-    plt.figure(figsize=(fig_por_fila * tamanio_fig + 5, num_filas * tamanio_fig + 2))
-    resultados: dict[str, tuple[float, float]] = {}
-    for i, col in enumerate(df.columns):
-        ax = plt.subplot(num_filas, fig_por_fila, i + 1)
-        probplot(x=df[col], dist=norm, plot=ax)
-        plt.title(col)
-        # Guardamos el estadístico y p-valor del test de Shapiro
-        resultados[col] = shapiro(df[col])
-
-    plt.suptitle(titulo)
-    plt.show()
+        # Creamos la figura donde se dibujarán los Q-Q plots
+        plt.figure(figsize=(fig_por_fila * tamanio_fig + 5, num_filas * tamanio_fig + 2))
+        for i, (col, (_, _, _, qq)) in enumerate(zip(columnas, salidas)):
+            ax = plt.subplot(num_filas, fig_por_fila, i + 1)
+            teoricos, muestrales, pendiente, ordenada = qq
+            ax.plot(teoricos, muestrales, "bo")
+            ax.plot(teoricos, pendiente * teoricos + ordenada, "r-")
+            ax.set_xlabel("Theoretical quantiles")
+            ax.set_ylabel("Ordered Values")
+            plt.title(col)
+        plt.suptitle(titulo)
+        plt.show()
 
     resultados = pd.DataFrame(
-        resultados, index=["Test Statistic", "p-value"]
-    ).transpose()
+        [salida[:2] for salida in salidas],
+        index=columnas,
+        columns=["Test Statistic", "p-value"],
+    )
+    if metodo != "shapiro":
+        resultados["Test"] = [salida[2] for salida in salidas]
     return resultados
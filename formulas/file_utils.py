@@ -1,15 +1,20 @@
 """Funciones genéricas para detección de archivos."""
 
 import os
-from typing import Union
+from typing import Any, Iterable, Iterator, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
-from .csv_utils import cargar_csv
+from .csv_utils import cargar_csv, detectar_delimitador, detectar_encoding
 from .excel_utils import cargar_excel
 from .html_utils import cargar_html
 from .json_utils import cargar_json
 
+# Columnas auxiliares del muestreo; se eliminan antes de devolver la muestra
+_CLAVE_MUESTRA = "__clave_muestra"
+_FILA_MUESTRA = "__fila_muestra"
+
 
 def cargar_archivo(nombre_archivo: Union[str, os.PathLike]) -> pd.DataFrame:
     """Cargar un archivo según su extensión.
@@ -51,3 +56,137 @@ def cargar_archivo(nombre_archivo: Union[str, os.PathLike]) -> pd.DataFrame:
     if extension == ".sav":
         return pd.read_spss(ruta_archivo)
     raise ValueError(f"Formato de archivo no soportado: {extension}")
+
+
+def _bloques_origen(
+    origen: Union[str, os.PathLike, Iterable[pd.DataFrame]],
+    tam_bloque: int,
+    engine: Any,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """Bloques de filas de un archivo, una consulta SQL o un iterador."""
+    if engine is not None:
+        from .sql_utils import leer_query
+
+        yield from leer_query(str(origen), engine, tam_bloque=tam_bloque)
+        return
+    if not isinstance(origen, (str, os.PathLike)):
+        yield from origen
+        return
+    ruta = os.path.abspath(origen)
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        # Misma detección que ``cargar_csv`` pero con el motor C de pandas,
+        # mucho más rápido que el de Python en archivos grandes
+        kwargs.setdefault("encoding", detectar_encoding(ruta))
+        kwargs.setdefault("sep", detectar_delimitador(ruta))
+        with pd.read_csv(ruta, chunksize=tam_bloque, **kwargs) as lector:
+            yield from lector
+    elif extension in [".json", ".jsonl", ".ndjson"]:
+        with pd.read_json(ruta, lines=True, chunksize=tam_bloque, **kwargs) as lector:
+            yield from lector
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tam_bloque, **kwargs):
+            yield lote.to_pandas()
+    else:
+        raise ValueError(f"Formato de archivo no soportado para muestreo: {extension}")
+
+
+def cargar_muestra(
+    origen: Union[str, os.PathLike, Iterable[pd.DataFrame]],
+    n: int = 100_000,
+    estratos: Optional[Union[str, List[str]]] = None,
+    semilla: Optional[int] = 0,
+    tam_bloque: int = 100_000,
+    engine: Any = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Cargar una muestra aleatoria de un origen demasiado grande para memoria.
+
+    Recorre el origen una sola vez por bloques y conserva en cada momento
+    solo la muestra: a cada fila se le asigna una clave aleatoria y se
+    guardan las ``n`` de menor clave (muestreo de reservorio), de modo que
+    todas las filas tienen la misma probabilidad de salir. Con ``estratos``
+    se guardan ``n`` filas de cada estrato, útil para no perder segmentos
+    poco frecuentes.
+
+    La descripción del muestreo queda en ``df.attrs["muestra"]`` (filas
+    totales del origen, tamaño, estratos y filas de cada estrato), y con ella
+    :func:`~formulas.estadisticas.nulos` y
+    :func:`~formulas.estadisticas.resumen_columnas` añaden intervalos de
+    confianza para la población.
+
+    Parameters
+    ----------
+    origen : str, PathLike or iterable of pandas.DataFrame
+        Archivo CSV, NDJSON (``.json``, ``.jsonl``, ``.ndjson``) o Parquet,
+        consulta SQL si se indica ``engine``, o un iterador de bloques.
+    n : int, optional
+        Tamaño de la muestra (por estrato si se indica ``estratos``).
+    estratos : str or list of str, optional
+        Columnas que definen los estratos.
+    semilla : int, optional
+        Semilla del generador aleatorio.
+    tam_bloque : int, optional
+        Filas leídas en cada bloque.
+    engine : sqlalchemy.Engine, optional
+        Conexión con la que ejecutar ``origen`` como consulta SQL.
+    **kwargs : dict, optional
+        Parámetros adicionales para el lector del formato.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Filas muestreadas en el orden en que aparecen en el origen.
+
+    Examples
+    --------
+    >>> muestra = cargar_muestra("eventos.csv", n=200_000)
+    >>> muestra.attrs["muestra"]["filas_totales"]
+    >>> nulos(muestra)  # con intervalos de confianza del 95 %
+    """
+    if n < 1:
+        raise ValueError("n debe ser positivo")
+    if isinstance(estratos, str):
+        estratos = [estratos]
+    rng = np.random.default_rng(semilla)
+    reserva: Optional[pd.DataFrame] = None
+    por_estrato: Optional[pd.Series] = None
+    vistas = 0
+    for bloque in _bloques_origen(origen, tam_bloque, engine, **kwargs):
+        claves = rng.random(len(bloque))
+        bloque = bloque.reset_index(drop=True)
+        bloque[_FILA_MUESTRA] = np.arange(vistas, vistas + len(bloque))
+        bloque[_CLAVE_MUESTRA] = claves
+        vistas += len(bloque)
+        if estratos:
+            tamanos = bloque.groupby(estratos, dropna=False, observed=True).size()
+            por_estrato = tamanos if por_estrato is None else por_estrato.add(tamanos, fill_value=0)
+        elif reserva is not None and len(reserva) == n:
+            # Con la reserva llena solo pueden entrar claves menores que la mayor
+            bloque = bloque[claves < reserva[_CLAVE_MUESTRA].max()]
+        combinada = bloque if reserva is None else pd.concat([reserva, bloque], ignore_index=True)
+        if estratos:
+            combinada = combinada.sort_values(_CLAVE_MUESTRA, kind="stable")
+            orden = combinada.groupby(estratos, dropna=False, observed=True).cumcount()
+            reserva = combinada[orden.to_numpy() < n]
+        else:
+            reserva = combinada.nsmallest(n, _CLAVE_MUESTRA) if len(combinada) > n else combinada
+    if reserva is None:
+        raise ValueError(f"{origen} no contiene filas")
+
+    muestra = reserva.sort_values(_FILA_MUESTRA).drop(columns=[_CLAVE_MUESTRA, _FILA_MUESTRA])
+    muestra = muestra.reset_index(drop=True)
+    muestra.attrs["muestra"] = {
+        "metodo": "estratificado" if estratos else "aleatorio",
+        "filas_totales": vistas,
+        "tamano": len(muestra),
+        "estratos": estratos,
+        # Un dict y no una Series: pandas compara ``attrs`` al propagarlos
+        "filas_por_estrato": por_estrato.astype("int64").to_dict() if estratos else None,
+        "semilla": semilla,
+    }
+    return muestra
@@ -0,0 +1,293 @@
+"""Imputación de nulos con estadísticos ajustados y reutilizables."""
+
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .aproximados import CuantilesKLL
+
+_ESTRATEGIAS = {"media", "mediana", "moda", "constante"}
+
+
+def _como_lista(columnas: Optional[Union[str, Iterable[str]]]) -> Optional[List[str]]:
+    if columnas is None:
+        return None
+    return [columnas] if isinstance(columnas, str) else list(columnas)
+
+
+def _moda(conteos: pd.Series) -> object:
+    """Valor más frecuente; en caso de empate el menor, como ``Series.mode``."""
+    if conteos.empty:
+        return np.nan
+    maximos = conteos[conteos == conteos.max()].index
+    try:
+        return min(maximos)
+    except TypeError:
+        return maximos[0]
+
+
+class Imputador:
+    """Imputador de nulos con ajuste y aplicación separados.
+
+    Calcula los estadísticos de todas las columnas en una pasada vectorizada
+    y los guarda para aplicarlos después a otros datos (por ejemplo lotes de
+    scoring) con un simple ``fillna``. Admite imputación por grupos (``por``),
+    con el estadístico global como respaldo para grupos no vistos, y ajuste
+    incremental por bloques mediante :meth:`ajustar_parcial` o combinando
+    imputadores ajustados en paralelo con :meth:`combinar`.
+
+    Con ``estrategia="mediana"`` el ajuste incremental usa bocetos
+    :class:`CuantilesKLL`, por lo que la mediana es aproximada; con
+    :meth:`ajustar` sobre un DataFrame completo es exacta.
+
+    Parameters
+    ----------
+    estrategia : {"media", "mediana", "moda", "constante"}, optional
+        Estadístico con el que rellenar los nulos.
+    columnas : str or iterable of str, optional
+        Columnas a imputar. Por defecto las numéricas del primer ajuste.
+    valor : object, optional
+        Valor a utilizar si ``estrategia`` es ``"constante"``.
+    por : str or iterable of str, optional
+        Columnas que definen los grupos (segmentos) de imputación.
+    semilla : int, optional
+        Semilla de los bocetos de la mediana incremental, para que el
+        resultado sea reproducible.
+
+    Examples
+    --------
+    >>> imputador = Imputador("mediana", por="pais").ajustar(train)
+    >>> imputador.guardar("imputador.pkl")
+    >>> scoring = Imputador.cargar("imputador.pkl").transformar(scoring)
+    """
+
+    def __init__(
+        self,
+        estrategia: str = "media",
+        columnas: Optional[Union[str, Iterable[str]]] = None,
+        valor: Optional[object] = None,
+        por: Optional[Union[str, Iterable[str]]] = None,
+        semilla: Optional[int] = 0,
+    ) -> None:
+        if estrategia not in _ESTRATEGIAS:
+            raise ValueError("Estrategia no soportada")
+        self.estrategia = estrategia
+        self.columnas = _como_lista(columnas)
+        self.valor = valor
+        self.por = _como_lista(por)
+        self.semilla = semilla
+        self._reiniciar()
+
+    def _reiniciar(self) -> None:
+        self._sumas: Optional[pd.DataFrame] = None
+        self._conteos: Optional[pd.DataFrame] = None
+        self._frecuencias: Dict[str, pd.Series] = {}
+        self._bocetos: Dict[object, CuantilesKLL] = {}
+        self._exactos: Optional[tuple] = None
+        self._solo_exactos = False
+        self.estadisticos_: Optional[pd.Series] = None
+        self.estadisticos_grupo_: Optional[pd.DataFrame] = None
+
+    def _resolver_columnas(self, df: pd.DataFrame) -> List[str]:
+        if self.columnas is None:
+            columnas = df.select_dtypes(include="number").columns
+            self.columnas = [c for c in columnas if not self.por or c not in self.por]
+        return self.columnas
+
+    def _claves_grupo(self, df: pd.DataFrame) -> pd.Index:
+        if len(self.por) == 1:
+            return pd.Index(df[self.por[0]])
+        return pd.MultiIndex.from_frame(df[self.por])
+
+    def _boceto(self) -> CuantilesKLL:
+        return CuantilesKLL(semilla=self.semilla)
+
+    def ajustar_parcial(self, df: pd.DataFrame) -> "Imputador":
+        """Actualizar los estadísticos con un bloque de datos."""
+        columnas = self._resolver_columnas(df)
+        self._exactos = None
+        if self.estrategia == "media":
+            datos = df[columnas]
+            if self.por:
+                grupos = datos.groupby(self._claves_grupo(df), dropna=False)
+                sumas, conteos = grupos.sum(), grupos.count()
+            else:
+                sumas, conteos = datos.sum().to_frame().T, datos.count().to_frame().T
+            if self._sumas is not None:
+                sumas = sumas.add(self._sumas, fill_value=0)
+                conteos = conteos.add(self._conteos, fill_value=0)
+            self._sumas, self._conteos = sumas, conteos
+        elif self.estrategia == "moda":
+            for col in columnas:
+                validos = df.loc[df[col].notna()]
+                claves = [validos[c] for c in self.por] if self.por else []
+                frecuencias = validos.groupby(claves + [validos[col]], dropna=False).size()
+                if col in self._frecuencias:
+                    frecuencias = frecuencias.add(self._frecuencias[col], fill_value=0)
+                self._frecuencias[col] = frecuencias
+        elif self.estrategia == "mediana":
+            if self._solo_exactos:
+                raise ValueError(
+                    "Un imputador de medianas ajustado con ajustar() no admite ajustes "
+                    "parciales; use ajustar_parcial() desde el principio"
+                )
+            if self.por:
+                for grupo, bloque in df.groupby(self._claves_grupo(df), dropna=False):
+                    for col in columnas:
+                        boceto = self._bocetos.setdefault((grupo, col), self._boceto())
+                        boceto.actualizar(bloque[col])
+            for col in columnas:
+                self._bocetos.setdefault((None, col), self._boceto()).actualizar(df[col])
+        self._finalizar()
+        return self
+
+    def ajustar(self, df: pd.DataFrame) -> "Imputador":
+        """Ajustar los estadísticos sobre ``df`` descartando ajustes previos."""
+        self._reiniciar()
+        if self.estrategia != "mediana":
+            return self.ajustar_parcial(df)
+        columnas = self._resolver_columnas(df)
+        globales = df[columnas].median()
+        grupos = None
+        if self.por:
+            grupos = df[columnas].groupby(self._claves_grupo(df), dropna=False).median()
+        self._exactos = (globales, grupos)
+        self._solo_exactos = True
+        self._finalizar()
+        return self
+
+    def combinar(self, otro: "Imputador") -> "Imputador":
+        """Incorporar los estadísticos de otro imputador ajustado en paralelo."""
+        if (otro.estrategia, otro.por) != (self.estrategia, self.por):
+            raise ValueError(
+                "Solo se pueden combinar imputadores con igual estrategia y grupos"
+            )
+        if self.columnas is None:
+            self.columnas = otro.columnas
+        self._exactos = None
+        if self.estrategia == "media" and otro._sumas is not None:
+            if self._sumas is None:
+                self._sumas, self._conteos = otro._sumas, otro._conteos
+            else:
+                self._sumas = self._sumas.add(otro._sumas, fill_value=0)
+                self._conteos = self._conteos.add(otro._conteos, fill_value=0)
+        elif self.estrategia == "moda":
+            for col, frecuencias in otro._frecuencias.items():
+                if col in self._frecuencias:
+                    frecuencias = frecuencias.add(self._frecuencias[col], fill_value=0)
+                self._frecuencias[col] = frecuencias
+        elif self.estrategia == "mediana":
+            if self._solo_exactos or otro._solo_exactos:
+                raise ValueError("No se pueden combinar medianas ajustadas con ajustar()")
+            for clave, boceto in otro._bocetos.items():
+                if clave in self._bocetos:
+                    self._bocetos[clave].combinar(boceto)
+                else:
+                    self._bocetos[clave] = boceto
+        self._finalizar()
+        return self
+
+    def _finalizar(self) -> None:
+        """Calcular los valores de relleno a partir del estado acumulado."""
+        columnas = self.columnas
+        grupos = None
+        if self.estrategia == "constante":
+            globales = pd.Series(self.valor, index=columnas, dtype=object)
+        elif self.estrategia == "media":
+            if self.por:
+                grupos = self._sumas / self._conteos.replace(0, np.nan)
+                globales = self._sumas.sum() / self._conteos.sum().replace(0, np.nan)
+            else:
+                globales = (self._sumas / self._conteos.replace(0, np.nan)).iloc[0]
+        elif self.estrategia == "moda":
+            globales = pd.Series(
+                {c: _moda(f.groupby(level=-1).sum()) for c, f in self._frecuencias.items()},
+                dtype=object,
+            )
+            if self.por:
+                grupos = pd.DataFrame(
+                    {c: self._modas_por_grupo(f) for c, f in self._frecuencias.items()}
+                )
+        elif self._exactos is not None:
+            globales, grupos = self._exactos
+        else:
+            globales = pd.Series(
+                {c: self._bocetos[(None, c)].cuantil(0.5) for c in columnas}, dtype=float
+            )
+            if self.por:
+                filas: Dict[object, Dict[str, float]] = {}
+                for (grupo, col), boceto in self._bocetos.items():
+                    if grupo is not None:
+                        filas.setdefault(grupo, {})[col] = boceto.cuantil(0.5)
+                grupos = pd.DataFrame.from_dict(filas, orient="index")
+                if len(self.por) > 1:
+                    grupos.index = pd.MultiIndex.from_tuples(grupos.index, names=self.por)
+                else:
+                    grupos.index.name = self.por[0]
+        self.estadisticos_ = globales.reindex(columnas)
+        if grupos is not None:
+            grupos = grupos.reindex(columns=columnas)
+        self.estadisticos_grupo_ = grupos
+
+    def _modas_por_grupo(self, frecuencias: pd.Series) -> pd.Series:
+        """Moda de cada grupo a partir de los conteos ``(grupo..., valor)``."""
+        tabla = frecuencias.rename("_n").reset_index()
+        valor = tabla.columns[-2]
+        try:
+            tabla = tabla.sort_values(["_n", valor], ascending=[False, True], kind="stable")
+        except TypeError:
+            tabla = tabla.sort_values("_n", ascending=False, kind="stable")
+        grupos = list(tabla.columns[:-2])
+        modas = tabla.drop_duplicates(subset=grupos).set_index(grupos)[valor]
+        return modas.set_axis(modas.index.set_names(self.por))
+
+    def transformar(self, df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+        """Rellenar los nulos de ``df`` con los estadísticos ajustados.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Datos a imputar.
+        copiar : bool, optional
+            Si ``False`` se rellena ``df`` en el sitio.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame con los valores imputados.
+        """
+        if self.estadisticos_ is None:
+            if self.estrategia != "constante":
+                raise ValueError("El imputador no está ajustado")
+            self._resolver_columnas(df)
+            self._finalizar()
+        if copiar:
+            df = df.copy()
+        if self.estadisticos_grupo_ is None:
+            df.fillna(self.estadisticos_.to_dict(), inplace=True)
+            return df
+        rellenos = self.estadisticos_grupo_.reindex(self._claves_grupo(df))
+        rellenos = rellenos.fillna(self.estadisticos_).set_axis(df.index)
+        df.fillna(rellenos, inplace=True)
+        return df
+
+    def ajustar_transformar(self, df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+        """Ajustar sobre ``df`` y devolverlo imputado."""
+        return self.ajustar(df).transformar(df, copiar=copiar)
+
+    def guardar(self, ruta: Union[str, os.PathLike]) -> None:
+        """Guardar el imputador ajustado en ``ruta``."""
+        with open(os.path.abspath(ruta), "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def cargar(cls, ruta: Union[str, os.PathLike]) -> "Imputador":
+        """Cargar un imputador guardado con :meth:`guardar`."""
+        with open(os.path.abspath(ruta), "rb") as f:
+            imputador = pickle.load(f)
+        if not isinstance(imputador, cls):
+            raise TypeError(f"{ruta} no contiene un {cls.__name__}")
+        return imputador
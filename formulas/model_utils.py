@@ -52,6 +52,7 @@ def dividir_train_test(
 def estandarizar_datos(
     df: pd.DataFrame,
     columnas: Optional[Iterable[str]] = None,
+    copiar: bool = True,
 ) -> Tuple[pd.DataFrame, StandardScaler]:
     """Aplicar ``StandardScaler`` a columnas numéricas.
 
@@ -61,6 +62,9 @@ def estandarizar_datos(
         Datos de entrada.
     columnas : iterable of str, optional
         Columnas a escalar. Por defecto numéricas.
+    copiar : bool, optional
+        Si ``False`` las columnas escaladas se sustituyen en ``df`` sin copiar
+        el resto del DataFrame.
 
     Returns
     -------
@@ -71,7 +75,8 @@ def estandarizar_datos(
     --------
     >>> df_std, scaler = estandarizar_datos(df, ["edad", "ingresos"])
     """
-    df = df.copy()
+    if copiar:
+        df = df.copy()
     if columnas is None:
         columnas = df.select_dtypes(include="number").columns
     scaler = StandardScaler()
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional, Sequence
+import logging
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence, Union
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from sklearn.ensemble import RandomForestClassifier
@@ -15,13 +21,28 @@ from sklearn.metrics import (
     classification_report,
     confusion_matrix,
     f1_score,
+    get_scorer,
     precision_score,
     recall_score,
 )
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import (
+    KFold,
+    ParameterGrid,
+    ParameterSampler,
+    StratifiedKFold,
+    train_test_split,
+)
 from sklearn.neural_network import MLPClassifier
 
+from .cache import _sin_cache_modelos, memoizar_modelo
+
+logger = logging.getLogger(__name__)
+
+# Arrays de la búsqueda en curso abiertos en cada proceso, por rutas
+_DATOS_COMPARTIDOS: dict = {}
+
 
+@memoizar_modelo
 def entrenar_regresion_logistica(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -52,6 +73,7 @@ def entrenar_regresion_logistica(
     return model
 
 
+@memoizar_modelo
 def entrenar_mlp(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -92,6 +114,7 @@ def entrenar_mlp(
     return model
 
 
+@memoizar_modelo
 def entrenar_random_forest(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -299,3 +322,207 @@ def entrenar_modelo_con_split(
         "f1": f1_score(y_test, y_pred, zero_division=0),
     }
     return y_pred, metricas, model
+
+
+def _cargar_compartidos(rutas: tuple) -> tuple:
+    """Abrir como ``memmap`` los arrays de la búsqueda, una vez por proceso."""
+    datos = _DATOS_COMPARTIDOS.get(rutas)
+    if datos is None:
+        _DATOS_COMPARTIDOS.clear()
+        datos = tuple(np.load(ruta, mmap_mode="r") for ruta in rutas)
+        _DATOS_COMPARTIDOS[rutas] = datos
+    return datos
+
+
+def _evaluar_candidato(tarea: tuple) -> float:
+    """Entrenar una configuración en un pliegue y puntuarla en su validación."""
+    rutas, entrenar, parametros, pliegue, recursos, metrica = tarea
+    X, y, pliegues, rango = _cargar_compartidos(rutas)
+    validacion = pliegues == pliegue
+    entreno = ~validacion & (rango < recursos)
+    # Los modelos de cada pliegue no pasan por la caché de modelos
+    with _sin_cache_modelos():
+        modelo = entrenar(X[entreno], y[entreno], **parametros)
+    return get_scorer(metrica)(modelo, X[validacion], y[validacion])
+
+
+def buscar_hiperparametros(
+    entrenar: Callable[..., Any],
+    X: pd.DataFrame,
+    y: pd.Series,
+    parametros: Union[dict, Sequence[dict]],
+    n_iter: Optional[int] = None,
+    cv: int = 5,
+    estratificar: bool = True,
+    metrica: str = "accuracy",
+    factor: Optional[int] = None,
+    n_workers: int = 1,
+    semilla: Optional[int] = 0,
+    reentrenar: bool = True,
+) -> tuple[Any, pd.DataFrame]:
+    """Buscar hiperparámetros con validación cruzada en paralelo.
+
+    Evalúa cada configuración de ``parametros`` con ``entrenar`` (por ejemplo
+    :func:`entrenar_random_forest`) en ``cv`` pliegues. Con ``factor`` se
+    aplica *successive halving*: todas las configuraciones empiezan con una
+    fracción de las filas de entrenamiento y en cada ronda solo la mejor
+    ``1/factor`` parte pasa a la siguiente con ``factor`` veces más filas,
+    hasta usar todas. Con ``n_workers > 1`` los entrenamientos se reparten
+    en un pool de procesos; los datos se guardan una vez como ``.npy`` y
+    cada proceso los abre como ``memmap`` en lugar de recibir una copia por
+    tarea.
+
+    Parameters
+    ----------
+    entrenar : callable
+        Función ``entrenar(X, y, **parametros)`` que devuelve un modelo
+        ajustado. Con ``n_workers > 1`` debe estar definida a nivel de
+        módulo para poder enviarse a los procesos.
+    X : pandas.DataFrame
+        Variables independientes numéricas.
+    y : pandas.Series
+        Variable objetivo.
+    parametros : dict or list of dict
+        Rejilla de valores por parámetro. Con ``n_iter`` los valores pueden
+        ser también distribuciones de ``scipy.stats``.
+    n_iter : int, optional
+        Si se indica, búsqueda aleatoria de ``n_iter`` configuraciones en
+        lugar de la rejilla completa.
+    cv : int, optional
+        Número de pliegues.
+    estratificar : bool, optional
+        Pliegues estratificados según ``y``; las filas de cada ronda del
+        *successive halving* mantienen también la proporción de clases.
+    metrica : str, optional
+        Nombre de una métrica de ``sklearn.metrics.get_scorer``.
+    factor : int, optional
+        Factor de reducción del *successive halving*. Por defecto se evalúan
+        todas las configuraciones con todas las filas.
+    n_workers : int, optional
+        Número de procesos.
+    semilla : int, optional
+        Semilla de los pliegues, del muestreo de configuraciones y de las
+        filas de cada ronda.
+    reentrenar : bool, optional
+        Entrenar con todos los datos la mejor configuración. Con la caché de
+        :func:`~formulas.cache.activar_cache_modelos` activa solo este
+        modelo se guarda en ella, no los de cada pliegue.
+
+    Returns
+    -------
+    tuple[Any, pandas.DataFrame]
+        Modelo reentrenado (``None`` si ``reentrenar=False``) y resultados
+        de cada configuración y ronda (``ronda``, ``filas``, ``parametros``,
+        ``puntuacion`` y ``desviacion``), la mejor en la primera fila.
+
+    Examples
+    --------
+    >>> modelo, resultados = buscar_hiperparametros(
+    ...     entrenar_random_forest, X, y,
+    ...     {"n_estimators": [100, 300], "max_depth": [None, 5, 10]},
+    ...     factor=3, n_workers=4,
+    ... )
+    >>> resultados.head()
+    """
+    if n_iter is None:
+        candidatos = list(ParameterGrid(parametros))
+    else:
+        candidatos = list(ParameterSampler(parametros, n_iter, random_state=semilla))
+    if not candidatos:
+        raise ValueError("No hay configuraciones que evaluar")
+    if factor is not None and factor < 2:
+        raise ValueError("factor debe ser al menos 2")
+
+    X_arr = np.ascontiguousarray(X, dtype=float)
+    y_arr = np.asarray(y)
+    if y_arr.dtype.kind not in "biuf":
+        y_arr = np.unique(y_arr, return_inverse=True)[1]
+    n = len(X_arr)
+    divisor = (
+        StratifiedKFold(cv, shuffle=True, random_state=semilla)
+        if estratificar
+        else KFold(cv, shuffle=True, random_state=semilla)
+    )
+    pliegues = np.empty(n, dtype=np.int32)
+    for k, (_, validacion) in enumerate(divisor.split(X_arr, y_arr)):
+        pliegues[validacion] = k
+    # Las filas de entrenamiento de cada ronda son las de menor rango
+    orden = np.random.default_rng(semilla).permutation(n)
+    if estratificar:
+        # Dentro de cada par (pliegue, clase) la fila j-ésima, en orden
+        # aleatorio, ocupa la posición relativa j / tamaño: cualquier ronda
+        # conserva en cada pliegue la proporción de clases e incluye todas
+        # ellas aunque alguna sea muy minoritaria
+        clases = np.unique(y_arr, return_inverse=True)[1]
+        estrato = (pliegues.astype(np.int64) * (clases.max() + 1) + clases)[orden]
+        tamanos = np.bincount(estrato)
+        por_estrato = np.argsort(estrato, kind="stable")
+        inicio = np.cumsum(tamanos) - tamanos
+        relativa = np.empty(n)
+        relativa[por_estrato] = (np.arange(n) - np.repeat(inicio, tamanos)) / np.repeat(tamanos, tamanos)
+        orden = orden[np.argsort(relativa, kind="stable")]
+    rango = np.empty(n, dtype=np.int64)
+    rango[orden] = np.arange(n)
+
+    if factor is None:
+        plan = [n]
+    else:
+        # Rondas hasta dejar una configuración, en enteros para potencias exactas
+        rondas, restantes = 1, factor
+        while restantes < len(candidatos):
+            rondas += 1
+            restantes *= factor
+        minimo = max(n // factor ** (rondas - 1), 10 * cv)
+        plan = [min(n, minimo * factor**r) for r in range(rondas - 1)] + [n]
+
+    filas = []
+    vivos = list(range(len(candidatos)))
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = []
+        compartidos = {"X": X_arr, "y": y_arr, "pliegues": pliegues, "rango": rango}
+        for nombre, valores in compartidos.items():
+            ruta = os.path.join(directorio, f"{nombre}.npy")
+            np.save(ruta, valores)
+            rutas.append(ruta)
+        rutas = tuple(rutas)
+        executor = ProcessPoolExecutor(n_workers) if n_workers > 1 else None
+        try:
+            mapa = executor.map if executor is not None else map
+            for ronda, recursos in enumerate(plan):
+                tareas = [
+                    (rutas, entrenar, candidatos[i], k, recursos, metrica)
+                    for i in vivos
+                    for k in range(cv)
+                ]
+                opciones = {}
+                if executor is not None:
+                    opciones["chunksize"] = max(1, len(tareas) // (4 * n_workers))
+                puntos = np.array(list(mapa(_evaluar_candidato, tareas, **opciones)))
+                puntos = puntos.reshape(len(vivos), cv)
+                logger.info(
+                    "Ronda %d: %d configuraciones con %d filas", ronda, len(vivos), recursos
+                )
+                for i, p in zip(vivos, puntos):
+                    filas.append(
+                        {
+                            "ronda": ronda,
+                            "filas": recursos,
+                            "parametros": candidatos[i],
+                            "puntuacion": p.mean(),
+                            "desviacion": p.std(),
+                        }
+                    )
+                orden = np.argsort(-puntos.mean(axis=1), kind="stable")
+                conservar = len(vivos) if factor is None else math.ceil(len(vivos) / factor)
+                vivos = [vivos[j] for j in orden[:conservar]]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            _DATOS_COMPARTIDOS.clear()
+
+    resultados = pd.DataFrame(filas).sort_values(
+        ["ronda", "puntuacion"], ascending=False, kind="stable"
+    )
+    resultados = resultados.reset_index(drop=True)
+    modelo = entrenar(X, y, **candidatos[vivos[0]]) if reentrenar else None
+    return modelo, resultados
@@ -1,29 +1,157 @@
 """Transformaciones comunes con pandas."""
 
 import logging
-from typing import Callable, Iterable, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+from scipy import sparse
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pragma: no cover - pandas < 2.1
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+from .aproximados import CuantilesKLL
+from .codificacion import CodificadorOneHot
+from .imputacion import Imputador
+from .particionado import (
+    alinear_tipos_claves,
+    combinar_por_particiones,
+    eliminar_duplicados_por_bloques,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class IndiceCombinacion:
+    """Índice precalculado sobre las claves de un DataFrame.
+
+    Construir la tabla hash de las claves es la parte cara de un merge. Este
+    objeto la construye una vez sobre el DataFrame de dimensiones y permite
+    reutilizarla en sucesivas llamadas a :func:`combinar` con distintas
+    tablas de hechos. Si las claves son únicas, las combinaciones ``inner`` y
+    ``left`` se resuelven con una búsqueda directa en el índice; en otro caso
+    se recurre a :func:`pandas.merge`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame a indexar (normalmente la tabla de dimensiones).
+    on : str or iterable of str
+        Columnas clave.
+
+    Examples
+    --------
+    >>> indice = IndiceCombinacion(clientes, on="id_cliente")
+    >>> ventas_2023 = combinar(ventas_2023, indice, on="id_cliente", how="left")
+    >>> ventas_2024 = combinar(ventas_2024, indice, on="id_cliente", how="left")
+    """
+
+    def __init__(self, df: pd.DataFrame, on: Union[str, Iterable[str]]) -> None:
+        self.on = [on] if isinstance(on, str) else list(on)
+        faltan = [c for c in self.on if c not in df.columns]
+        if faltan:
+            raise KeyError(f"Las columnas {faltan} no existen en el DataFrame")
+        self.df = df
+        self._indices: Dict[Tuple[str, ...], pd.Index] = {}
+        self._indice(df)
+
+    def _indice(self, df: pd.DataFrame) -> pd.Index:
+        """Índice de claves para los tipos de ``df``, construido una sola vez."""
+        tipos = tuple(str(df[c].dtype) for c in self.on)
+        if tipos not in self._indices:
+            if len(self.on) == 1:
+                indice = pd.Index(df[self.on[0]])
+            else:
+                indice = pd.MultiIndex.from_frame(df[self.on])
+            # Fuerza la creación de la tabla hash para que se reutilice
+            indice.get_indexer(indice[:1])
+            self._indices[tipos] = indice
+        return self._indices[tipos]
+
+    def combinar(self, izq: pd.DataFrame, how: str = "inner") -> pd.DataFrame:
+        """Combinar ``izq`` con el DataFrame indexado.
+
+        Parameters
+        ----------
+        izq : pandas.DataFrame
+            DataFrame que se combina por la izquierda.
+        how : str, optional
+            Tipo de combinación (``"inner"``, ``"left"``...).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Mismo resultado que ``pd.merge(izq, df, on=on, how=how)``.
+        """
+        izq, der = alinear_tipos_claves(izq, self.df, self.on)
+        indice = self._indice(der)
+        if how not in {"inner", "left"} or not indice.is_unique:
+            return pd.merge(izq, der, on=self.on, how=how)
+
+        if len(self.on) == 1:
+            claves = izq[self.on[0]]
+        else:
+            claves = pd.MultiIndex.from_frame(izq[self.on])
+        posiciones = indice.get_indexer(claves)
+        if how == "inner":
+            encontradas = posiciones >= 0
+            izq = izq.loc[encontradas]
+            posiciones = posiciones[encontradas]
+
+        valores = der.drop(columns=self.on).reset_index(drop=True)
+        derecha = valores.reindex(posiciones).reset_index(drop=True)
+        izquierda = izq.reset_index(drop=True)
+        comunes = izquierda.columns.intersection(derecha.columns)
+        if len(comunes):
+            izquierda = izquierda.rename(columns={c: f"{c}_x" for c in comunes})
+            derecha = derecha.rename(columns={c: f"{c}_y" for c in comunes})
+        return pd.concat([izquierda, derecha], axis=1)
+
+
 def combinar(
     df1: pd.DataFrame,
-    df2: pd.DataFrame,
+    df2: Union[pd.DataFrame, IndiceCombinacion],
     on: Union[str, Iterable[str]],
     how: str = "inner",
+    memoria_max: Optional[int] = None,
+    n_workers: int = 1,
 ) -> pd.DataFrame:
     """Realizar merge entre dos DataFrames.
 
+    Las columnas clave con tipos distintos pero compatibles (``int32`` e
+    ``int64``, ``category`` y texto...) se convierten a un tipo común antes de
+    combinar para no caer en las rutas lentas de tipo ``object``.
+
     Parameters
     ----------
-    df1, df2 : pandas.DataFrame
-        DataFrames a combinar.
+    df1 : pandas.DataFrame
+        DataFrame izquierdo.
+    df2 : pandas.DataFrame or IndiceCombinacion
+        DataFrame derecho, o un :class:`IndiceCombinacion` ya construido sobre
+        él para reutilizar su tabla hash.
     on : str or iterable of str
         Columnas por las que se realizará el merge.
     how : str, optional
         Tipo de combinación (``"inner"``, ``"left"``...).
+    memoria_max : int, optional
+        Presupuesto de memoria en bytes. Si se indica, la unión se hace fuera
+        de memoria con :func:`combinar_por_particiones` y el orden de las
+        filas puede diferir del de :func:`pandas.merge`.
+    n_workers : int, optional
+        Procesos usados en la unión fuera de memoria.
 
     Returns
     -------
@@ -34,43 +162,261 @@ def combinar(
     --------
     >>> combinado = combinar(df1, df2, on="id")
     """
-    return pd.merge(df1, df2, on=on, how=how)
+    cols = [on] if isinstance(on, str) else list(on)
+    if isinstance(df2, IndiceCombinacion):
+        if cols != df2.on:
+            raise ValueError(f"El índice se construyó sobre {df2.on}, no sobre {cols}")
+        if memoria_max is None:
+            return df2.combinar(df1, how=how)
+        df2 = df2.df
+    if memoria_max is None:
+        df1, df2 = alinear_tipos_claves(df1, df2, cols)
+        return pd.merge(df1, df2, on=on, how=how)
+    partes = list(
+        combinar_por_particiones(
+            df1, df2, on=on, how=how, memoria_max=memoria_max, n_workers=n_workers
+        )
+    )
+    return pd.concat(partes, ignore_index=True)
+
+
+# Agregaciones que se pueden calcular por bloques y la función con la que
+# se combinan los resultados parciales
+_AGREGACIONES_PARCIALES = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+def _como_claves(claves: Union[str, Iterable[str]]) -> List[str]:
+    return [claves] if isinstance(claves, str) else list(claves)
+
+
+def _agregar_por_bloques(
+    bloques: Iterable[pd.DataFrame],
+    claves: List[str],
+    valores: List[str],
+    funciones: List[str],
+) -> Dict[str, pd.DataFrame]:
+    """Agregar un flujo de bloques combinando los resultados parciales.
+
+    Cada bloque se agrupa por separado y su resultado se fusiona con el
+    acumulado, de modo que la memoria depende del número de grupos y no del
+    de filas. La media se obtiene al final como suma entre recuento.
+    """
+    parciales = set()
+    for func in funciones:
+        if func == "mean":
+            parciales.update({"sum", "count"})
+        elif func in _AGREGACIONES_PARCIALES:
+            parciales.add(func)
+        else:
+            raise ValueError(f"La agregación '{func}' no se puede calcular por bloques")
+    niveles = list(range(len(claves)))
+    acumulado: Dict[str, pd.DataFrame] = {}
+    for bloque in bloques:
+        agrupado = bloque.groupby(claves, sort=False, observed=True, dropna=True)[valores]
+        for func in parciales:
+            parte = agrupado.agg(func)
+            if func in acumulado:
+                parte = pd.concat([acumulado[func], parte]).groupby(
+                    level=niveles, sort=False
+                ).agg(_AGREGACIONES_PARCIALES[func])
+            acumulado[func] = parte
+    if not acumulado:
+        raise ValueError("No se ha recibido ningún bloque")
+    acumulado = {func: parte.sort_index() for func, parte in acumulado.items()}
+    if "mean" in funciones:
+        acumulado["mean"] = acumulado["sum"] / acumulado["count"].replace(0, np.nan)
+    return {func: acumulado[func] for func in funciones}
+
+
+def _codigos_niveles(indice: pd.MultiIndex, niveles: range) -> np.ndarray:
+    """Código combinado de varios niveles que respeta su orden lexicográfico."""
+    codigos = np.zeros(len(indice), dtype=np.int64)
+    for nivel in niveles:
+        cod, unicos = pd.factorize(indice.get_level_values(nivel), sort=True)
+        codigos = codigos * len(unicos) + cod
+    return codigos
+
+
+def _desplegar(
+    agregado: pd.DataFrame, n_filas: int, disperso: bool
+) -> Optional[pd.DataFrame]:
+    """Equivalente a ``agregado.unstack()`` de los niveles de columnas.
+
+    Escribe cada valor agregado directamente en su celda de una matriz
+    (densa o dispersa) en lugar de usar :meth:`pandas.DataFrame.unstack`,
+    que es lento y costoso en memoria con muchas columnas. Devuelve ``None``
+    si algún tipo no es numérico y hay que recurrir a ``unstack``.
+    """
+    if not all(isinstance(t, np.dtype) and t.kind in "iuf" for t in agregado.dtypes):
+        return None
+    indice = agregado.index
+    n_niveles = indice.nlevels
+    if np.prod([float(len(nivel)) for nivel in indice.levels]) >= 2**62:
+        return None
+    fila = _codigos_niveles(indice, range(n_filas))
+    columna = _codigos_niveles(indice, range(n_filas, n_niveles))
+    filas_u, primeras_f, pos_f = np.unique(fila, return_index=True, return_inverse=True)
+    cols_u, primeras_c, pos_c = np.unique(columna, return_index=True, return_inverse=True)
+    nombres_f = list(indice.names[:n_filas])
+    nombres_c = list(indice.names[n_filas:])
+    if n_filas == 1:
+        indice_filas = indice.get_level_values(0)[primeras_f].rename(nombres_f[0])
+    else:
+        indice_filas = pd.MultiIndex.from_arrays(
+            [indice.get_level_values(i)[primeras_f] for i in range(n_filas)],
+            names=nombres_f,
+        )
+    valores_c = [indice.get_level_values(i)[primeras_c] for i in range(n_filas, n_niveles)]
+    completo = len(agregado) == len(filas_u) * len(cols_u)
+    n_f, n_c = len(filas_u), len(cols_u)
+    etiquetas = sorted(agregado.columns)
+    datos_valores = []
+    for valor in etiquetas:
+        datos = agregado[valor].to_numpy()
+        if not completo and datos.dtype.kind in "iu":
+            # Como unstack: las celdas vacías fuerzan el paso a flotante
+            datos = datos.astype(np.float64)
+        validos = ~np.isnan(datos) if datos.dtype.kind == "f" else np.ones(len(datos), bool)
+        datos_valores.append((datos, validos))
+
+    def _nueva(tipo: np.dtype, ancho: int) -> np.ndarray:
+        if completo:
+            return np.empty((n_f, ancho), dtype=tipo)
+        return np.full((n_f, ancho), np.nan, dtype=tipo)
+
+    tipos = {datos.dtype for datos, _ in datos_valores}
+    if not disperso and len(tipos) == 1:
+        # Todos los valores en una sola matriz: un único bloque sin concatenar
+        matriz = _nueva(tipos.pop(), len(etiquetas) * n_c)
+        usadas = []
+        for j, (datos, validos) in enumerate(datos_valores):
+            matriz[pos_f, j * n_c + pos_c] = datos
+            usadas.append(j * n_c + np.unique(pos_c[validos]))
+        usadas = np.concatenate(usadas)
+        if len(usadas) < matriz.shape[1]:
+            matriz = matriz[:, usadas]
+        columnas = pd.MultiIndex.from_arrays(
+            [pd.Index(etiquetas)[usadas // n_c]] + [v[usadas % n_c] for v in valores_c],
+            names=[None] + nombres_c,
+        )
+        return pd.DataFrame(matriz, index=indice_filas, columns=columnas, copy=False)
+
+    partes = []
+    for datos, validos in datos_valores:
+        usadas = np.unique(pos_c[validos])
+        if len(valores_c) == 1:
+            indice_cols = valores_c[0][usadas].rename(nombres_c[0])
+        else:
+            indice_cols = pd.MultiIndex.from_arrays(
+                [v[usadas] for v in valores_c], names=nombres_c
+            )
+        posiciones = np.searchsorted(usadas, pos_c[validos])
+        if disperso:
+            matriz = sparse.csr_matrix(
+                (datos[validos], (pos_f[validos], posiciones)),
+                shape=(n_f, len(usadas)),
+            )
+            parte = pd.DataFrame.sparse.from_spmatrix(
+                matriz, index=indice_filas, columns=indice_cols
+            )
+        else:
+            matriz = _nueva(datos.dtype, len(usadas))
+            matriz[pos_f[validos], posiciones] = datos[validos]
+            parte = pd.DataFrame(matriz, index=indice_filas, columns=indice_cols, copy=False)
+        partes.append(parte)
+    return pd.concat(partes, axis=1, keys=etiquetas)
 
 
 def pivotar(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
     index: Union[str, Iterable[str]],
     columns: Union[str, Iterable[str]],
     values: Union[str, Iterable[str]],
     aggfunc: Union[str, Callable, Iterable[Union[str, Callable]]] = "sum",
+    disperso: bool = False,
 ) -> pd.DataFrame:
     """Crear tabla dinámica.
 
+    Devuelve lo mismo que :func:`pandas.pivot_table` seguido de
+    ``reset_index``, pero agrupa una sola vez para todas las funciones de
+    ``aggfunc`` y coloca cada valor agregado directamente en su celda en
+    lugar de usar ``unstack``, que es lo más lento con muchas columnas.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        Datos de entrada.
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        Datos de entrada. Con un iterador de bloques cada bloque se agrega
+        por separado y los resultados parciales se combinan; solo admite las
+        agregaciones ``"sum"``, ``"count"``, ``"min"``, ``"max"`` y ``"mean"``.
     index, columns, values : str or iterable of str
         Parámetros para :func:`pandas.pivot_table`.
     aggfunc : str, optional
         Función de agregación a utilizar.
+    disperso : bool, optional
+        Si ``True`` las columnas de valores numéricos son dispersas: solo se
+        guardan las celdas con valor. Útil cuando la mayoría de combinaciones
+        no existen.
 
     Returns
     -------
     pandas.DataFrame
         Tabla dinámica resultante.
+
+    Examples
+    --------
+    >>> bloques = pd.read_csv("ventas.csv", chunksize=1_000_000)
+    >>> tabla = pivotar(bloques, "cliente", "producto", "importe", disperso=True)
     """
-    tabla = pd.pivot_table(
-        df,
-        index=index,
-        columns=columns,
-        values=values,
-        aggfunc=aggfunc,
-    )
+    filas, columnas = _como_claves(index), _como_claves(columns)
+    claves = filas + columnas
+    valores = _como_claves(values)
+    funciones = aggfunc if isinstance(aggfunc, list) else [aggfunc]
+    if isinstance(df, pd.DataFrame):
+        directo = (
+            filas
+            and columnas
+            and all(isinstance(f, str) or callable(f) for f in funciones)
+            and "size" not in funciones
+            and not any(isinstance(df[c].dtype, pd.CategoricalDtype) for c in claves)
+        )
+        if not directo:
+            tabla = pd.pivot_table(
+                df,
+                index=index,
+                columns=columns,
+                values=values,
+                aggfunc=aggfunc,
+            )
+            return tabla.reset_index()
+        agrupado = df.groupby(claves, sort=True, observed=True, dropna=True)[valores]
+        agregados = [agrupado.agg(func) for func in funciones]
+    else:
+        if not all(isinstance(f, str) for f in funciones):
+            raise ValueError("Por bloques aggfunc debe ser un nombre de agregación")
+        parciales = _agregar_por_bloques(df, claves, valores, funciones)
+        agregados = [parciales[func] for func in funciones]
+    tablas = []
+    for agregado in agregados:
+        if len(agregado.columns):
+            agregado = agregado.dropna(how="all")
+        tabla = _desplegar(agregado, len(filas), disperso)
+        if tabla is None:
+            tabla = agregado.unstack(list(range(len(filas), len(claves))))
+            tabla = tabla.sort_index(axis=1).dropna(how="all", axis=1)
+        if isinstance(values, str) and tabla.columns.nlevels > 1:
+            tabla.columns = tabla.columns.droplevel(0)
+        tablas.append(tabla)
+    if isinstance(aggfunc, list):
+        nombres = [getattr(func, "__name__", func) for func in funciones]
+        tabla = pd.concat(tablas, keys=nombres, axis=1)
+    else:
+        tabla = tablas[0]
     return tabla.reset_index()
 
 
-def limpiar_nombres(df: pd.DataFrame, formato: str = "snake_case") -> pd.DataFrame:
+def limpiar_nombres(
+    df: pd.DataFrame, formato: str = "snake_case", copiar: bool = True
+) -> pd.DataFrame:
     """Normalizar los nombres de columna.
 
     Con ``formato="simple"`` se eliminan espacios iniciales/finales y se
@@ -83,20 +429,18 @@ def limpiar_nombres(df: pd.DataFrame, formato: str = "snake_case") -> pd.DataFra
         DataFrame cuyas columnas se normalizarán.
     formato : {"simple", "snake_case"}, optional
         Estilo deseado para los nombres. Por defecto ``"snake_case"``.
+    copiar : bool, optional
+        Si ``False`` se renombran las columnas de ``df`` directamente, sin
+        reservar memoria adicional.
 
     Returns
     -------
     pandas.DataFrame
-        Copia del DataFrame con los nombres normalizados.
+        Copia del DataFrame (o el propio ``df``) con los nombres normalizados.
     """
-    df = df.copy()
-    if formato not in {"simple", "snake_case"}:
-        raise ValueError("formato debe ser 'simple' o 'snake_case'")
-    df.columns = df.columns.str.strip().str.lower()
-    if formato == "snake_case":
-        df.columns = df.columns.str.replace(" ", "_").str.replace(
-            r"[^a-z0-9_]+", "", regex=True
-        )
+    if copiar:
+        df = df.copy()
+    df.columns = _nombres_limpios(df.columns, formato)
     return df
 
 
@@ -109,11 +453,82 @@ def limpiar_columnas(df: pd.DataFrame, formato: str = "simple") -> pd.DataFrame:
     return limpiar_nombres(df, formato=formato)
 
 
+# Tamaño de la muestra con la que se estima si una columna de fechas repite
+# lo bastante sus valores como para convertir solo los distintos
+_MUESTRA_FECHAS = 10_000
+
+
+def _preparar_fechas(
+    serie: pd.Series, formato: Optional[str]
+) -> Tuple[Any, Optional[np.ndarray], Optional[str]]:
+    """Decidir qué valores de ``serie`` hay que convertir y con qué formato.
+
+    Si la columna es de texto y repite valores se factoriza para convertir
+    solo los distintos; el formato, si no se indica, se infiere del primer
+    valor no nulo, igual que hace :func:`pandas.to_datetime`.
+    """
+    if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+        return serie, None, formato
+    codigos = None
+    paso = max(1, len(serie) // _MUESTRA_FECHAS)
+    muestra = serie.iloc[::paso]
+    if muestra.nunique() <= len(muestra) // 2:
+        codigos, serie = pd.factorize(serie)
+    if formato is None and len(serie):
+        if codigos is None:
+            validos = serie.notna().to_numpy()
+            primero = serie.iloc[validos.argmax()] if validos.any() else None
+        else:
+            primero = serie[0]
+        if isinstance(primero, str):
+            formato = guess_datetime_format(primero)
+    return serie, codigos, formato
+
+
+def _parsear_fechas(valores: Any, formato: Optional[str]) -> Any:
+    return pd.to_datetime(valores, format=formato, errors="coerce")
+
+
+def _a_fechas(
+    columnas: Dict[Any, pd.Series],
+    formato: Optional[str] = None,
+    n_workers: int = 1,
+) -> Dict[Any, pd.Series]:
+    """Convertir a ``datetime`` varias columnas, en paralelo si se pide."""
+    preparadas = {c: _preparar_fechas(s, formato) for c, s in columnas.items()}
+    valores = [v for v, _, _ in preparadas.values()]
+    formatos = [f for _, _, f in preparadas.values()]
+    if n_workers > 1 and len(preparadas) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            convertidos = list(pool.map(_parsear_fechas, valores, formatos))
+    else:
+        convertidos = [_parsear_fechas(v, f) for v, f in zip(valores, formatos)]
+    resultado = {}
+    for (c, (_, codigos, _)), fechas in zip(preparadas.items(), convertidos):
+        serie = columnas[c]
+        if codigos is not None:
+            fechas = pd.Series(
+                fechas.take(codigos, allow_fill=True, fill_value=pd.NaT),
+                index=serie.index,
+                name=serie.name,
+            )
+        resultado[c] = fechas
+    return resultado
+
+
 def convertir_a_datetime(
-    df: pd.DataFrame, columnas: Union[str, Iterable[str]], formato: Optional[str] = None
+    df: pd.DataFrame,
+    columnas: Union[str, Iterable[str]],
+    formato: Optional[str] = None,
+    copiar: bool = True,
+    n_workers: int = 1,
 ) -> pd.DataFrame:
     """Convertir columnas a tipo ``datetime``.
 
+    Si no se indica ``formato`` se infiere una vez por columna a partir del
+    primer valor no nulo. Las columnas de texto que repiten valores se
+    factorizan y solo se convierten sus valores distintos.
+
     Parameters
     ----------
     df : pandas.DataFrame
@@ -122,50 +537,146 @@ def convertir_a_datetime(
         Columnas a convertir.
     formato : str, optional
         Formato de fecha a utilizar.
+    copiar : bool, optional
+        Si ``False`` las columnas se sustituyen en ``df`` sin copiar el resto
+        del DataFrame.
+    n_workers : int, optional
+        Número de procesos con los que convertir las columnas en paralelo.
 
     Returns
     -------
     pandas.DataFrame
         DataFrame con las columnas convertidas.
     """
-    df = df.copy()
+    if copiar:
+        df = df.copy()
     cols = [columnas] if isinstance(columnas, str) else columnas
     for col in cols:
         if col not in df.columns:
             raise KeyError(f"La columna '{col}' no existe en el DataFrame")
-        df[col] = pd.to_datetime(df[col], format=formato, errors="coerce")
+    convertidas = _a_fechas({col: df[col] for col in cols}, formato, n_workers)
+    for col, serie in convertidas.items():
+        df[col] = serie
     return df
 
 
+def calcular_limites_iqr(
+    datos: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    columnas: Optional[Union[str, Iterable[str]]] = None,
+    factor: float = 1.5,
+    k: int = 200,
+    semilla: Optional[int] = 0,
+) -> pd.DataFrame:
+    """Calcular los límites IQR de varias columnas.
+
+    Con un DataFrame los cuartiles de todas las columnas se obtienen en una
+    única llamada vectorizada a :meth:`pandas.DataFrame.quantile`. Con un
+    iterador de bloques se ajusta un boceto :class:`CuantilesKLL` por columna
+    que se va actualizando bloque a bloque, de modo que los límites
+    (aproximados) se obtienen en una sola pasada y con memoria acotada.
+
+    Parameters
+    ----------
+    datos : pandas.DataFrame or iterable of pandas.DataFrame
+        Datos completos o secuencia de bloques.
+    columnas : str or iterable of str, optional
+        Columnas a evaluar. Por defecto las numéricas.
+    factor : float, optional
+        Multiplicador del rango intercuartílico, por defecto ``1.5``.
+    k : int, optional
+        Precisión de los bocetos cuando ``datos`` es un iterador.
+    semilla : int, optional
+        Semilla de los bocetos, para que los límites sean reproducibles.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una fila por columna con ``q1``, ``q3``, ``inferior`` y ``superior``.
+
+    Examples
+    --------
+    >>> limites = calcular_limites_iqr(pd.read_csv("ventas.csv", chunksize=10**6))
+    >>> mascara = detectar_outliers_iqr(df_nuevo, list(limites.index), limites=limites)
+    """
+    if isinstance(columnas, str):
+        columnas = [columnas]
+    if isinstance(datos, pd.DataFrame):
+        if columnas is None:
+            columnas = datos.select_dtypes(include="number").columns
+        cuartiles = datos[list(columnas)].quantile([0.25, 0.75])
+        q1, q3 = cuartiles.iloc[0], cuartiles.iloc[1]
+    else:
+        bocetos: Dict[str, CuantilesKLL] = {}
+        for bloque in datos:
+            if columnas is None:
+                columnas = list(bloque.select_dtypes(include="number").columns)
+            for col in columnas:
+                bocetos.setdefault(col, CuantilesKLL(k=k, semilla=semilla)).actualizar(bloque[col])
+        if columnas is None:
+            raise ValueError("No se recibió ningún bloque")
+        cols = list(columnas)
+        estimados = np.array([bocetos[c].cuantil([0.25, 0.75]) for c in cols])
+        q1 = pd.Series(estimados[:, 0] if cols else [], index=cols, dtype=float)
+        q3 = pd.Series(estimados[:, 1] if cols else [], index=cols, dtype=float)
+    iqr = q3 - q1
+    return pd.DataFrame(
+        {"q1": q1, "q3": q3, "inferior": q1 - factor * iqr, "superior": q3 + factor * iqr}
+    )
+
+
 def detectar_outliers_iqr(
-    df: pd.DataFrame, columna: str, factor: float = 1.5
+    df: pd.DataFrame,
+    columna: Union[str, Iterable[str]],
+    factor: float = 1.5,
+    criterio: str = "any",
+    limites: Optional[pd.DataFrame] = None,
 ) -> pd.Series:
-    """Detectar outliers en una columna utilizando el método IQR.
+    """Detectar outliers en una o varias columnas utilizando el método IQR.
 
     Parameters
     ----------
     df : pandas.DataFrame
         DataFrame de entrada.
-    columna : str
-        Columna sobre la que aplicar el método.
+    columna : str or iterable of str
+        Columna (o columnas) sobre la que aplicar el método.
     factor : float, optional
         Multiplicador del rango intercuartílico, por defecto ``1.5``.
+    criterio : {"any", "all"}, optional
+        Con varias columnas, marcar la fila si es outlier en alguna
+        (``"any"``) o en todas (``"all"``).
+    limites : pandas.DataFrame, optional
+        Límites ya calculados con :func:`calcular_limites_iqr`, por ejemplo
+        sobre un flujo de bloques. Si se omite se calculan sobre ``df``.
 
     Returns
     -------
     pandas.Series
         Serie booleana que indica si cada fila es un outlier.
     """
-    q1 = df[columna].quantile(0.25)
-    q3 = df[columna].quantile(0.75)
-    iqr = q3 - q1
-    lower = q1 - factor * iqr
-    upper = q3 + factor * iqr
-    return (df[columna] < lower) | (df[columna] > upper)
+    if criterio not in {"any", "all"}:
+        raise ValueError("criterio debe ser 'any' o 'all'")
+    cols = [columna] if isinstance(columna, str) else list(columna)
+    if limites is None:
+        limites = calcular_limites_iqr(df, cols, factor=factor)
+    limites = limites.loc[cols]
+    valores = df[cols]
+    fuera = valores.lt(limites["inferior"], axis=1) | valores.gt(
+        limites["superior"], axis=1
+    )
+    mascara = fuera.any(axis=1) if criterio == "any" else fuera.all(axis=1)
+    if isinstance(columna, str):
+        mascara.name = columna
+    else:
+        mascara.name = None
+    return mascara
 
 
 def eliminar_outliers(
-    df: pd.DataFrame, columna: str, factor: float = 1.5
+    df: pd.DataFrame,
+    columna: Union[str, Iterable[str]],
+    factor: float = 1.5,
+    criterio: str = "any",
+    limites: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """Eliminar filas con outliers de ``columna`` usando el método IQR.
 
@@ -173,10 +684,15 @@ def eliminar_outliers(
     ----------
     df : pandas.DataFrame
         DataFrame de entrada.
-    columna : str
-        Columna sobre la que se evaluarán los outliers.
+    columna : str or iterable of str
+        Columna (o columnas) sobre la que se evaluarán los outliers.
     factor : float, optional
         Multiplicador del rango intercuartílico, por defecto ``1.5``.
+    criterio : {"any", "all"}, optional
+        Con varias columnas, eliminar la fila si es outlier en alguna
+        (``"any"``) o en todas (``"all"``).
+    limites : pandas.DataFrame, optional
+        Límites ya calculados con :func:`calcular_limites_iqr`.
 
     Returns
     -------
@@ -186,22 +702,30 @@ def eliminar_outliers(
     Examples
     --------
     >>> df_sin_outliers = eliminar_outliers(df, "ventas")
+    >>> df_sin_outliers = eliminar_outliers(df, ["ventas", "unidades"], criterio="all")
     """
-    mascara = detectar_outliers_iqr(df, columna, factor=factor)
+    mascara = detectar_outliers_iqr(
+        df, columna, factor=factor, criterio=criterio, limites=limites
+    )
     return df.loc[~mascara].reset_index(drop=True)
 
 
 def eliminar_duplicados(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
     subset: Optional[Union[str, Iterable[str]]] = None,
     keep: str = "first",
     mensaje: bool = True,
-) -> pd.DataFrame:
+    copiar: bool = True,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """Eliminar filas duplicadas del DataFrame.
 
+    Si ``df`` es un iterador de bloques se delega en
+    :func:`eliminar_duplicados_por_bloques` y se devuelve otro iterador de
+    bloques sin duplicados.
+
     Parameters
     ----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame or iterable of pandas.DataFrame
         DataFrame de entrada.
     subset : str or iterable of str, optional
         Columnas a considerar para detectar duplicados.
@@ -209,6 +733,8 @@ def eliminar_duplicados(
         Cómo manejar las filas duplicadas.
     mensaje : bool, optional
         Mostrar por pantalla cuántas filas se eliminaron.
+    copiar : bool, optional
+        Si ``False`` las filas se eliminan de ``df`` en el sitio.
 
     Returns
     -------
@@ -219,9 +745,16 @@ def eliminar_duplicados(
     --------
     >>> df = eliminar_duplicados(df)
     """
-    df = df.copy()
+    if not isinstance(df, pd.DataFrame):
+        return eliminar_duplicados_por_bloques(
+            df, subset=subset, keep=keep, mensaje=mensaje
+        )
     antes = len(df)
-    df = df.drop_duplicates(subset=subset, keep=keep)
+    # ``drop_duplicates`` ya devuelve un objeto nuevo: no hace falta copiar antes
+    if copiar:
+        df = df.drop_duplicates(subset=subset, keep=keep)
+    else:
+        df.drop_duplicates(subset=subset, keep=keep, inplace=True)
     despues = len(df)
     if mensaje:
         logger.info("Filas eliminadas: %s", antes - despues)
@@ -233,6 +766,7 @@ def imputar_nulos(
     estrategia: str = "media",
     columnas: Optional[Union[str, Iterable[str]]] = None,
     valor: Optional[float] = None,
+    copiar: bool = True,
 ) -> pd.DataFrame:
     """Imputar valores nulos de forma sencilla.
 
@@ -246,33 +780,32 @@ def imputar_nulos(
         Columnas a procesar. Por defecto solo numéricas.
     valor : float, optional
         Valor a utilizar si ``estrategia`` es ``"constante"``.
+    copiar : bool, optional
+        Si ``False`` las columnas imputadas se sustituyen en ``df`` y el pico
+        de memoria se limita a una columna.
+
+    Notes
+    -----
+    Para reutilizar los estadísticos en otros datos, imputar por grupos o
+    ajustar por bloques, utilice :class:`Imputador`.
 
     Returns
     -------
     pandas.DataFrame
         DataFrame con valores imputados.
     """
-    df = df.copy()
-    if columnas is None:
-        columnas = df.select_dtypes(include="number").columns
-    if isinstance(columnas, str):
-        columnas = [columnas]
-    for col in columnas:
-        if estrategia == "media":
-            valor_imputado = df[col].mean()
-        elif estrategia == "mediana":
-            valor_imputado = df[col].median()
-        elif estrategia == "moda":
-            valor_imputado = df[col].mode().iloc[0]
-        elif estrategia == "constante":
-            valor_imputado = valor
-        else:
-            raise ValueError("Estrategia no soportada")
-        df[col] = df[col].fillna(valor_imputado)
-    return df
+    if isinstance(columnas, pd.Index):
+        columnas = list(columnas)
+    imputador = Imputador(estrategia, columnas=columnas, valor=valor)
+    return imputador.ajustar_transformar(df, copiar=copiar)
 
 
-def codificar_onehot(df: pd.DataFrame, columnas: Iterable[str]) -> pd.DataFrame:
+def codificar_onehot(
+    df: pd.DataFrame,
+    columnas: Iterable[str],
+    disperso: bool = False,
+    max_categorias: Optional[int] = None,
+) -> pd.DataFrame:
     """Aplicar one-hot encoding a columnas categóricas.
 
     Parameters
@@ -281,14 +814,298 @@ def codificar_onehot(df: pd.DataFrame, columnas: Iterable[str]) -> pd.DataFrame:
         DataFrame de entrada.
     columnas : iterable of str
         Columnas categóricas a codificar.
+    disperso : bool, optional
+        Si ``True`` las columnas codificadas son dispersas.
+    max_categorias : int, optional
+        Número máximo de categorías por columna; el resto se agrupa en una
+        columna ``<columna>_otros``.
 
     Returns
     -------
     pandas.DataFrame
         DataFrame con las columnas codificadas.
 
+    Notes
+    -----
+    Para obtener las mismas columnas en los datos de entrenamiento y en los
+    lotes de scoring, ajuste un :class:`CodificadorOneHot` y reutilícelo.
+
     Examples
     --------
     >>> df = codificar_onehot(df, ["genero", "pais"])
     """
-    return pd.get_dummies(df, columns=list(columnas), drop_first=False)
+    if not disperso and max_categorias is None:
+        return pd.get_dummies(df, columns=list(columnas), drop_first=False)
+    codificador = CodificadorOneHot(
+        columnas, max_categorias=max_categorias, disperso=disperso
+    )
+    return codificador.ajustar_transformar(df)
+
+
+def _nombres_limpios(columnas: pd.Index, formato: str) -> pd.Index:
+    """Aplicar a un índice de columnas la normalización de :func:`limpiar_nombres`."""
+    if formato not in {"simple", "snake_case"}:
+        raise ValueError("formato debe ser 'simple' o 'snake_case'")
+    columnas = columnas.str.strip().str.lower()
+    if formato == "snake_case":
+        columnas = columnas.str.replace(" ", "_").str.replace(
+            r"[^a-z0-9_]+", "", regex=True
+        )
+    return columnas
+
+
+class CadenaTransformaciones:
+    """Cadena diferida de transformaciones de limpieza.
+
+    Registra llamadas a :func:`limpiar_nombres`, :func:`convertir_a_datetime`,
+    :func:`eliminar_duplicados` e :func:`imputar_nulos` sin ejecutarlas. Al
+    llamar a :meth:`ejecutar` los pasos se combinan en un único plan que hace
+    como mucho una copia del DataFrame de entrada (ninguna si el plan empieza
+    eliminando duplicados) y modifica esa copia en el sitio:
+
+    * los renombrados se resuelven por posición y se aplican al final;
+    * ``eliminar_duplicados`` se adelanta a las conversiones de fecha que no
+      tocan sus columnas ``subset``, reduciendo las filas a convertir;
+    * conversiones e imputaciones consecutivas sobre columnas disjuntas se
+      agrupan en un solo paso.
+
+    El resultado es idéntico al de encadenar las funciones originales.
+
+    Examples
+    --------
+    >>> cadena = (
+    ...     CadenaTransformaciones()
+    ...     .limpiar_nombres()
+    ...     .convertir_a_datetime("fecha")
+    ...     .imputar_nulos("mediana")
+    ... )
+    >>> cadena.plan(df)
+    >>> df_limpio = cadena.ejecutar(df)
+    """
+
+    def __init__(self) -> None:
+        self._pasos: List[Tuple[str, Dict[str, Any]]] = []
+
+    def limpiar_nombres(self, formato: str = "snake_case") -> "CadenaTransformaciones":
+        """Registrar :func:`limpiar_nombres`."""
+        if formato not in {"simple", "snake_case"}:
+            raise ValueError("formato debe ser 'simple' o 'snake_case'")
+        self._pasos.append(("limpiar_nombres", {"formato": formato}))
+        return self
+
+    def convertir_a_datetime(
+        self, columnas: Union[str, Iterable[str]], formato: Optional[str] = None
+    ) -> "CadenaTransformaciones":
+        """Registrar :func:`convertir_a_datetime`."""
+        cols = [columnas] if isinstance(columnas, str) else list(columnas)
+        self._pasos.append(("convertir_a_datetime", {"columnas": cols, "formato": formato}))
+        return self
+
+    def eliminar_duplicados(
+        self,
+        subset: Optional[Union[str, Iterable[str]]] = None,
+        keep: str = "first",
+        mensaje: bool = True,
+    ) -> "CadenaTransformaciones":
+        """Registrar :func:`eliminar_duplicados`."""
+        if subset is not None:
+            subset = [subset] if isinstance(subset, str) else list(subset)
+        self._pasos.append(
+            ("eliminar_duplicados", {"subset": subset, "keep": keep, "mensaje": mensaje})
+        )
+        return self
+
+    def imputar_nulos(
+        self,
+        estrategia: str = "media",
+        columnas: Optional[Union[str, Iterable[str]]] = None,
+        valor: Optional[float] = None,
+    ) -> "CadenaTransformaciones":
+        """Registrar :func:`imputar_nulos`."""
+        if estrategia not in {"media", "mediana", "moda", "constante"}:
+            raise ValueError("Estrategia no soportada")
+        if columnas is not None:
+            columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+        self._pasos.append(
+            ("imputar_nulos", {"estrategia": estrategia, "columnas": columnas, "valor": valor})
+        )
+        return self
+
+    def _resolver(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], pd.Index]:
+        """Traducir los pasos a posiciones de columna sobre el esquema de ``df``."""
+        nombres = df.columns
+        tipos = list(df.dtypes)
+        resueltos: List[Dict[str, Any]] = []
+
+        def _posiciones(cols: Iterable[str]) -> List[int]:
+            posiciones = []
+            for col in cols:
+                if col not in nombres:
+                    raise KeyError(f"La columna '{col}' no existe en el DataFrame")
+                posiciones.append(nombres.get_loc(col))
+            return posiciones
+
+        for tipo, args in self._pasos:
+            if tipo == "limpiar_nombres":
+                nombres = _nombres_limpios(nombres, args["formato"])
+            elif tipo == "convertir_a_datetime":
+                posiciones = _posiciones(args["columnas"])
+                for p in posiciones:
+                    tipos[p] = np.dtype("datetime64[ns]")
+                resueltos.append(
+                    {"tipo": tipo, "columnas": {p: args["formato"] for p in posiciones}}
+                )
+            elif tipo == "eliminar_duplicados":
+                subset = args["subset"]
+                resueltos.append(
+                    {
+                        "tipo": tipo,
+                        "subset": None if subset is None else _posiciones(subset),
+                        "keep": args["keep"],
+                        "mensaje": args["mensaje"],
+                    }
+                )
+            else:
+                if args["columnas"] is None:
+                    esquema = pd.DataFrame(
+                        {i: pd.Series(dtype=t) for i, t in enumerate(tipos)}
+                    )
+                    posiciones = list(esquema.select_dtypes(include="number").columns)
+                else:
+                    posiciones = _posiciones(args["columnas"])
+                regla = (args["estrategia"], args["valor"])
+                resueltos.append(
+                    {"tipo": tipo, "columnas": {p: regla for p in posiciones}}
+                )
+        return resueltos, nombres
+
+    @staticmethod
+    def _optimizar(pasos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reordenar y agrupar los pasos resueltos."""
+        # Adelantar cada eliminación de duplicados sobre conversiones disjuntas
+        pasos = [dict(p) for p in pasos]
+        for i in range(len(pasos)):
+            j = i
+            while (
+                j > 0
+                and pasos[j]["tipo"] == "eliminar_duplicados"
+                and pasos[j]["subset"] is not None
+                and pasos[j - 1]["tipo"] == "convertir_a_datetime"
+                and not set(pasos[j]["subset"]) & set(pasos[j - 1]["columnas"])
+            ):
+                pasos[j - 1], pasos[j] = pasos[j], pasos[j - 1]
+                j -= 1
+
+        # Agrupar pasos consecutivos del mismo tipo sobre columnas disjuntas
+        agrupados: List[Dict[str, Any]] = []
+        for paso in pasos:
+            anterior = agrupados[-1] if agrupados else None
+            if (
+                anterior is not None
+                and paso["tipo"] in {"convertir_a_datetime", "imputar_nulos"}
+                and anterior["tipo"] == paso["tipo"]
+                and not set(anterior["columnas"]) & set(paso["columnas"])
+            ):
+                anterior["columnas"] = {**anterior["columnas"], **paso["columnas"]}
+            else:
+                agrupados.append(paso)
+        return agrupados
+
+    def plan(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Describir el plan optimizado y su memoria estimada sobre ``df``.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            DataFrame sobre el que se ejecutaría la cadena.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Un paso por fila con las columnas afectadas y los bytes adicionales
+            estimados que reserva.
+        """
+        pasos, nombres = self._resolver(df)
+        pasos = self._optimizar(pasos)
+        memoria = df.memory_usage(index=False, deep=True)
+        filas = []
+        necesita_copia = bool(pasos) and pasos[0]["tipo"] != "eliminar_duplicados"
+        if necesita_copia:
+            filas.append(("copia", list(nombres), int(memoria.sum())))
+        for paso in pasos:
+            if paso["tipo"] == "eliminar_duplicados":
+                cols = nombres if paso["subset"] is None else nombres[paso["subset"]]
+                estimada = int(memoria.sum()) + 9 * len(df)
+            elif paso["tipo"] == "convertir_a_datetime":
+                cols = nombres[list(paso["columnas"])]
+                estimada = 8 * len(df) * len(cols)
+            else:
+                cols = nombres[list(paso["columnas"])]
+                estimada = int(memoria.iloc[list(paso["columnas"])].sum())
+            filas.append((paso["tipo"], list(cols), estimada))
+        return pd.DataFrame(filas, columns=["paso", "columnas", "memoria_estimada"])
+
+    def memoria_estimada(self, df: pd.DataFrame) -> int:
+        """Estimar el pico de memoria adicional, en bytes, de :meth:`ejecutar`.
+
+        Los pasos que sustituyen columnas liberan las anteriores, por lo que el
+        pico es la copia inicial más el paso más costoso.
+        """
+        plan = self.plan(df)
+        copia = plan.loc[plan["paso"] == "copia", "memoria_estimada"].sum()
+        resto = plan.loc[plan["paso"] != "copia", "memoria_estimada"]
+        return int(copia + (resto.max() if len(resto) else 0))
+
+    def ejecutar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Ejecutar el plan optimizado sobre ``df`` sin modificarlo.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            DataFrame de entrada.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Resultado equivalente a aplicar los pasos en orden.
+        """
+        pasos, nombres = self._resolver(df)
+        pasos = self._optimizar(pasos)
+        if not pasos:
+            resultado = df.copy()
+            resultado.columns = nombres
+            return resultado
+
+        trabajo = df if pasos[0]["tipo"] == "eliminar_duplicados" else df.copy()
+        for paso in pasos:
+            if paso["tipo"] == "eliminar_duplicados":
+                antes = len(trabajo)
+                subset = (
+                    None
+                    if paso["subset"] is None
+                    else [trabajo.columns[p] for p in paso["subset"]]
+                )
+                trabajo = trabajo.drop_duplicates(subset=subset, keep=paso["keep"])
+                if paso["mensaje"]:
+                    logger.info("Filas eliminadas: %s", antes - len(trabajo))
+            elif paso["tipo"] == "convertir_a_datetime":
+                for p, formato in paso["columnas"].items():
+                    serie = _a_fechas({p: trabajo.iloc[:, p]}, formato)[p]
+                    trabajo.isetitem(p, serie)
+            else:
+                rellenos = {}
+                for p, (estrategia, valor) in paso["columnas"].items():
+                    serie = trabajo.iloc[:, p]
+                    if estrategia == "media":
+                        rellenos[p] = serie.mean()
+                    elif estrategia == "mediana":
+                        rellenos[p] = serie.median()
+                    elif estrategia == "moda":
+                        rellenos[p] = serie.mode().iloc[0]
+                    else:
+                        rellenos[p] = valor
+                trabajo.fillna(
+                    {trabajo.columns[p]: v for p, v in rellenos.items()}, inplace=True
+                )
+        trabajo.columns = nombres
+        return trabajo
@@ -0,0 +1,502 @@
+"""Operaciones fuera de memoria mediante particionado por hash en disco."""
+
+import glob
+import logging
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .aproximados import FiltroBloom
+
+logger = logging.getLogger(__name__)
+
+Datos = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def _tipo_comun(tipo1: np.dtype, tipo2: np.dtype) -> Optional[object]:
+    """Tipo al que convertir dos columnas clave para compararlas sin coste.
+
+    Devuelve ``None`` si los tipos ya coinciden.
+    """
+    if tipo1 == tipo2:
+        return None
+    categorico1 = isinstance(tipo1, pd.CategoricalDtype)
+    categorico2 = isinstance(tipo2, pd.CategoricalDtype)
+    if categorico1 or categorico2:
+        base1 = tipo1.categories.dtype if categorico1 else tipo1
+        base2 = tipo2.categories.dtype if categorico2 else tipo2
+        return _tipo_comun(base1, base2) or base1
+    if pd.api.types.is_numeric_dtype(tipo1) and pd.api.types.is_numeric_dtype(tipo2):
+        if pd.api.types.is_bool_dtype(tipo1) or pd.api.types.is_bool_dtype(tipo2):
+            return object
+        try:
+            return np.result_type(tipo1, tipo2)
+        except TypeError:
+            return object
+    if pd.api.types.is_string_dtype(tipo1) and pd.api.types.is_string_dtype(tipo2):
+        return object
+    return None
+
+
+def _conversiones_claves(
+    df1: pd.DataFrame, df2: pd.DataFrame, on: List[str]
+) -> Dict[str, object]:
+    """Tipo común de cada columna clave cuyo tipo difiere entre ``df1`` y ``df2``."""
+    conversiones = {}
+    for col in on:
+        tipo = _tipo_comun(df1[col].dtype, df2[col].dtype)
+        if tipo is not None:
+            conversiones[col] = tipo
+    return conversiones
+
+
+def alinear_tipos_claves(
+    df1: pd.DataFrame, df2: pd.DataFrame, on: List[str]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Convertir las columnas ``on`` de ambos DataFrames a un tipo común.
+
+    Evita que pandas caiga en rutas lentas de tipo ``object`` al unir, por
+    ejemplo, ``int32`` con ``int64`` o ``category`` con texto, y garantiza que
+    valores iguales produzcan el mismo hash al particionar.
+    """
+    conversiones = _conversiones_claves(df1, df2, on)
+    if not conversiones:
+        return df1, df2
+    return _convertir_columnas(df1, conversiones), _convertir_columnas(df2, conversiones)
+
+
+def _convertir_columnas(df: pd.DataFrame, conversiones: Dict[str, object]) -> pd.DataFrame:
+    """Convertir solo las columnas indicadas, sin copiar el resto."""
+    df = df.copy(deep=False)
+    for col, tipo in conversiones.items():
+        df[col] = df[col].astype(tipo)
+    return df
+
+
+def _a_bloques(datos: Datos, filas_por_bloque: int) -> Iterator[pd.DataFrame]:
+    """Recorrer ``datos`` como una secuencia de DataFrames."""
+    if isinstance(datos, pd.DataFrame):
+        for inicio in range(0, len(datos), filas_por_bloque):
+            yield datos.iloc[inicio : inicio + filas_por_bloque]
+    else:
+        yield from datos
+
+
+def _hash_numerico(serie: pd.Series) -> np.ndarray:
+    """Hash de cada valor de una columna numérica independiente de su tipo.
+
+    Los valores enteros se hashean como ``int64`` y el resto como
+    ``float64``, de modo que ``5``, ``5.0`` y ``Int64`` 5 coinciden sin
+    confundir enteros grandes que ``float64`` no distingue.
+    """
+    tipo = serie.dtype
+    if tipo.kind in "iu":
+        nulos = serie.isna().to_numpy()
+        hashes = pd.util.hash_array(serie.to_numpy(dtype=np.int64, na_value=0))
+        hashes[nulos] = pd.util.hash_array(np.array([np.nan]))[0]
+        return hashes
+    x = serie.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    # Las distintas representaciones de NaN deben coincidir
+    x[np.isnan(x)] = np.nan
+    hashes = pd.util.hash_array(x)
+    with np.errstate(invalid="ignore"):
+        enteros = np.isfinite(x) & (x == np.round(x)) & (np.abs(x) < 2.0**63)
+    if enteros.any():
+        hashes[enteros] = pd.util.hash_array(x[enteros].astype(np.int64))
+    return hashes
+
+
+def _hash_filas(df: pd.DataFrame) -> np.ndarray:
+    """Hash de cada fila de ``df`` estable frente a cambios de tipo numérico.
+
+    Un bloque de ``read_csv`` con nulos pasa una columna entera a
+    ``float64``; con :func:`_hash_numerico` las filas iguales de bloques con
+    distinto tipo siguen teniendo el mismo hash.
+    """
+    columnas = {}
+    for i in range(df.shape[1]):
+        serie = df.iloc[:, i]
+        tipo = serie.dtype
+        if pd.api.types.is_numeric_dtype(tipo) and not pd.api.types.is_bool_dtype(tipo):
+            columnas[i] = _hash_numerico(serie)
+        else:
+            columnas[i] = pd.util.hash_pandas_object(serie, index=False).to_numpy()
+    return pd.util.hash_pandas_object(pd.DataFrame(columnas), index=False).to_numpy()
+
+
+def _asignar_particion(df: pd.DataFrame, on: List[str], n: int) -> np.ndarray:
+    """Número de partición de cada fila según el hash de ``on``."""
+    hashes = _hash_filas(df[on])
+    return (hashes % np.uint64(n)).astype(np.int64)
+
+
+def _volcar_particiones(
+    bloques: Iterator[pd.DataFrame],
+    on: List[str],
+    n: int,
+    directorio: str,
+    prefijo: str,
+    conversiones: Dict[str, object],
+) -> Optional[pd.DataFrame]:
+    """Escribir cada bloque repartido en ``n`` particiones en disco.
+
+    Devuelve el esquema (DataFrame vacío con los tipos) de los datos.
+    """
+    esquema = None
+    for k, bloque in enumerate(bloques):
+        if conversiones:
+            # Un bloque posterior puede traer otro tipo (``float64`` con nulos)
+            propias = {
+                col: _tipo_comun(bloque[col].dtype, tipo) or tipo
+                for col, tipo in conversiones.items()
+            }
+            bloque = _convertir_columnas(bloque, propias)
+        if esquema is None:
+            esquema = bloque.iloc[0:0]
+        if bloque.empty:
+            continue
+        particiones = _asignar_particion(bloque, on, n)
+        orden = np.argsort(particiones, kind="stable")
+        ids, inicios = np.unique(particiones[orden], return_index=True)
+        limites = list(inicios[1:]) + [len(orden)]
+        for p, inicio, fin in zip(ids, inicios, limites):
+            ruta = os.path.join(directorio, f"{prefijo}_{p}_{k}.pkl")
+            bloque.iloc[orden[inicio:fin]].to_pickle(ruta)
+    return esquema
+
+
+def _leer_particion(
+    directorio: str, prefijo: str, p: int, esquema: pd.DataFrame
+) -> pd.DataFrame:
+    """Reunir los fragmentos de la partición ``p``."""
+    rutas = sorted(glob.glob(os.path.join(directorio, f"{prefijo}_{p}_*.pkl")))
+    if not rutas:
+        return esquema
+    partes = [pd.read_pickle(r) for r in rutas]
+    for r in rutas:
+        os.remove(r)
+    return pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+
+
+def _unir_particion(
+    directorio: str,
+    p: int,
+    on: List[str],
+    how: str,
+    esquema_izq: pd.DataFrame,
+    esquema_der: pd.DataFrame,
+) -> Optional[str]:
+    """Unir una partición y guardar el resultado; se ejecuta en un worker."""
+    izq = _leer_particion(directorio, "izq", p, esquema_izq)
+    der = _leer_particion(directorio, "der", p, esquema_der)
+    resultado = pd.merge(izq, der, on=on, how=how)
+    if resultado.empty:
+        return None
+    ruta = os.path.join(directorio, f"resultado_{p}.pkl")
+    resultado.to_pickle(ruta)
+    return ruta
+
+
+def combinar_por_particiones(
+    df1: Datos,
+    df2: Datos,
+    on: Union[str, Iterable[str]],
+    how: str = "inner",
+    memoria_max: int = 1024**3,
+    n_particiones: Optional[int] = None,
+    n_workers: int = 1,
+    directorio: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Unir dos conjuntos de datos que no caben en memoria.
+
+    Ambas entradas se reparten por el hash de las columnas ``on`` en
+    particiones que se guardan en disco; las filas con la misma clave caen
+    siempre en la misma partición, de modo que unir partición a partición da
+    el mismo resultado que :func:`pandas.merge` para ``inner``, ``left``,
+    ``right`` y ``outer`` (salvo el orden de las filas). Cada partición se une
+    en un proceso del pool y el resultado se devuelve bloque a bloque.
+
+    Parameters
+    ----------
+    df1, df2 : pandas.DataFrame or iterable of pandas.DataFrame
+        Datos a combinar, completos o como secuencia de bloques (por ejemplo
+        el iterador de ``pd.read_csv(..., chunksize=...)``).
+    on : str or iterable of str
+        Columnas por las que se realizará el merge.
+    how : {"inner", "left", "right", "outer"}, optional
+        Tipo de combinación.
+    memoria_max : int, optional
+        Presupuesto de memoria en bytes para el conjunto de workers.
+    n_particiones : int, optional
+        Número de particiones. Por defecto se calcula a partir del tamaño de
+        las entradas y de ``memoria_max`` (64 si se reciben iteradores).
+    n_workers : int, optional
+        Procesos que unen particiones en paralelo.
+    directorio : str, optional
+        Carpeta donde crear los archivos temporales.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Fragmentos del resultado, uno por partición no vacía. Si el resultado
+        no tiene filas se devuelve un único DataFrame vacío con sus columnas.
+
+    Examples
+    --------
+    >>> ventas = pd.read_csv("ventas.csv", chunksize=1_000_000)
+    >>> for parte in combinar_por_particiones(ventas, clientes, on="id"):
+    ...     parte.to_parquet(...)
+    """
+    if how not in {"inner", "left", "right", "outer"}:
+        raise ValueError("how debe ser 'inner', 'left', 'right' u 'outer'")
+    on = [on] if isinstance(on, str) else list(on)
+    n_workers = max(1, n_workers)
+    por_worker = memoria_max / n_workers
+
+    # Un bloque de entrada ocupa como mucho una cuarta parte del presupuesto
+    filas_por_bloque = 100_000
+    if isinstance(df1, pd.DataFrame) and isinstance(df2, pd.DataFrame):
+        tamanio = df1.memory_usage(deep=True).sum() + df2.memory_usage(deep=True).sum()
+        filas = max(len(df1) + len(df2), 1)
+        filas_por_bloque = max(1, int(memoria_max / 4 / (tamanio / filas)))
+        if n_particiones is None:
+            # Unir una partición ocupa del orden de tres veces sus datos
+            n_particiones = max(1, math.ceil(3 * tamanio / por_worker))
+    n_particiones = n_particiones or 64
+
+    bloques1 = _a_bloques(df1, filas_por_bloque)
+    bloques2 = _a_bloques(df2, filas_por_bloque)
+    primero1 = next(bloques1, None)
+    primero2 = next(bloques2, None)
+    if primero1 is None or primero2 is None:
+        raise ValueError("Las entradas deben contener al menos un bloque")
+    conversiones = _conversiones_claves(primero1, primero2, on)
+
+    with tempfile.TemporaryDirectory(prefix="combinar_", dir=directorio) as tmp:
+        esquema1 = _volcar_particiones(
+            chain([primero1], bloques1), on, n_particiones, tmp, "izq", conversiones
+        )
+        esquema2 = _volcar_particiones(
+            chain([primero2], bloques2), on, n_particiones, tmp, "der", conversiones
+        )
+        logger.info("Datos repartidos en %s particiones en %s", n_particiones, tmp)
+
+        argumentos = [
+            (tmp, p, on, how, esquema1, esquema2) for p in range(n_particiones)
+        ]
+        vacio = True
+        if n_workers == 1:
+            rutas = (_unir_particion(*args) for args in argumentos)
+            for ruta in rutas:
+                if ruta is not None:
+                    parte = pd.read_pickle(ruta)
+                    os.remove(ruta)
+                    vacio = False
+                    yield parte
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                for ruta in pool.map(_unir_particion, *zip(*argumentos)):
+                    if ruta is not None:
+                        parte = pd.read_pickle(ruta)
+                        os.remove(ruta)
+                        vacio = False
+                        yield parte
+        if vacio:
+            yield pd.merge(esquema1, esquema2, on=on, how=how)
+
+
+# Memoria aproximada que ocupa cada hash guardado en un ``set`` de Python
+_BYTES_POR_HASH = 72
+
+
+class _ConjuntoHashes:
+    """Conjunto de hashes vistos que se vuelca a disco al superar un presupuesto.
+
+    Los hashes volcados se guardan en ``n_particiones`` arrays ordenados, de
+    modo que comprobar si un hash ya se vio solo requiere abrir su partición
+    y hacer una búsqueda binaria. Con un :class:`FiltroBloom` se evita abrir
+    las particiones para los hashes que seguro son nuevos.
+    """
+
+    def __init__(
+        self,
+        memoria_max: int,
+        directorio: str,
+        bloom: Optional[FiltroBloom] = None,
+        n_particiones: int = 64,
+    ) -> None:
+        self._memoria: set = set()
+        self._max = max(1, memoria_max // _BYTES_POR_HASH)
+        self._directorio = directorio
+        self._bloom = bloom
+        self._n = n_particiones
+        self._en_disco = False
+
+    def _ruta(self, p: int) -> str:
+        return os.path.join(self._directorio, f"hashes_{p}.npy")
+
+    def _volcar(self) -> None:
+        """Mover los hashes en memoria a las particiones en disco."""
+        hashes = np.fromiter(self._memoria, dtype=np.uint64, count=len(self._memoria))
+        particiones = hashes % np.uint64(self._n)
+        for p in np.unique(particiones):
+            nuevos = hashes[particiones == p]
+            ruta = self._ruta(int(p))
+            if os.path.exists(ruta):
+                nuevos = np.union1d(np.load(ruta), nuevos)
+            else:
+                nuevos = np.unique(nuevos)
+            np.save(ruta, nuevos)
+        self._memoria.clear()
+        self._en_disco = True
+
+    def _en_particiones(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara de los ``hashes`` presentes en las particiones en disco."""
+        encontrados = np.zeros(len(hashes), dtype=bool)
+        particiones = hashes % np.uint64(self._n)
+        for p in np.unique(particiones):
+            ruta = self._ruta(int(p))
+            if not os.path.exists(ruta):
+                continue
+            guardados = np.load(ruta, mmap_mode="r")
+            seleccion = np.flatnonzero(particiones == p)
+            posicion = np.searchsorted(guardados, hashes[seleccion])
+            posicion = np.minimum(posicion, len(guardados) - 1)
+            encontrados[seleccion] = guardados[posicion] == hashes[seleccion]
+        return encontrados
+
+    def marcar_nuevos(self, hashes: np.ndarray) -> np.ndarray:
+        """Registrar ``hashes`` (sin repetidos) y devolver cuáles no se habían visto."""
+        vistos = self._memoria
+        nuevos = np.fromiter(
+            (h not in vistos for h in hashes.tolist()), dtype=bool, count=len(hashes)
+        )
+        if self._en_disco and nuevos.any():
+            candidatos = np.flatnonzero(nuevos)
+            if self._bloom is not None:
+                candidatos = candidatos[self._bloom.contiene(hashes[candidatos])]
+            if len(candidatos):
+                nuevos[candidatos[self._en_particiones(hashes[candidatos])]] = False
+        agregar = hashes[nuevos]
+        if self._bloom is not None:
+            self._bloom.agregar(agregar)
+        vistos.update(agregar.tolist())
+        if len(vistos) > self._max:
+            self._volcar()
+        return nuevos
+
+
+def _primeras_apariciones(hashes: np.ndarray, conjunto: _ConjuntoHashes) -> np.ndarray:
+    """Máscara de las filas cuyo hash aparece por primera vez."""
+    locales = ~pd.Series(hashes).duplicated(keep="first").to_numpy()
+    mascara = np.zeros(len(hashes), dtype=bool)
+    mascara[locales] = conjunto.marcar_nuevos(hashes[locales])
+    return mascara
+
+
+def eliminar_duplicados_por_bloques(
+    bloques: Iterable[pd.DataFrame],
+    subset: Optional[Union[str, Iterable[str]]] = None,
+    keep: Union[str, bool] = "first",
+    memoria_max: int = 256 * 1024**2,
+    filtro_bloom: bool = False,
+    capacidad_bloom: int = 10_000_000,
+    directorio: Optional[str] = None,
+    mensaje: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """Eliminar filas duplicadas de un flujo de bloques que no cabe en memoria.
+
+    Se guarda un hash de 64 bits de las columnas ``subset`` de cada fila ya
+    emitida. Cuando los hashes superan ``memoria_max`` se vuelcan a
+    particiones ordenadas en disco. Con ``keep="first"`` los bloques se
+    procesan en una sola pasada; con ``keep="last"`` o ``keep=False`` los
+    bloques se guardan antes en disco y se recorren también en orden inverso.
+
+    La comparación se hace por hash, por lo que dos filas distintas podrían
+    considerarse duplicadas con una probabilidad del orden de
+    ``n**2 / 2**65`` (despreciable para miles de millones de filas).
+
+    Parameters
+    ----------
+    bloques : iterable of pandas.DataFrame
+        Bloques de entrada, por ejemplo de ``pd.read_csv(..., chunksize=...)``.
+    subset : str or iterable of str, optional
+        Columnas a considerar para detectar duplicados.
+    keep : {"first", "last", False}, optional
+        Qué aparición conservar, como en :func:`pandas.DataFrame.drop_duplicates`.
+    memoria_max : int, optional
+        Bytes máximos para los hashes en memoria antes de volcarlos a disco.
+    filtro_bloom : bool, optional
+        Usar un filtro de Bloom para evitar consultar el disco con los hashes
+        que seguro son nuevos.
+    capacidad_bloom : int, optional
+        Número de filas distintas previstas para dimensionar el filtro.
+    directorio : str, optional
+        Carpeta donde crear los archivos temporales.
+    mensaje : bool, optional
+        Registrar cuántas filas se eliminaron.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Bloques sin duplicados, en el orden original.
+
+    Examples
+    --------
+    >>> bloques = pd.read_csv("eventos.csv", chunksize=1_000_000)
+    >>> for bloque in eliminar_duplicados_por_bloques(bloques, subset="id_evento"):
+    ...     bloque.to_csv("eventos_unicos.csv", mode="a", index=False)
+    """
+    if keep not in ("first", "last", False):
+        raise ValueError("keep debe ser 'first', 'last' o False")
+    if subset is not None:
+        subset = [subset] if isinstance(subset, str) else list(subset)
+
+    def _hashes(bloque: pd.DataFrame) -> np.ndarray:
+        return _hash_filas(bloque if subset is None else bloque[subset])
+
+    def _conjunto(tmp: str) -> _ConjuntoHashes:
+        bloom = FiltroBloom(capacidad_bloom) if filtro_bloom else None
+        carpeta = tempfile.mkdtemp(prefix="hashes_", dir=tmp)
+        return _ConjuntoHashes(memoria_max, carpeta, bloom=bloom)
+
+    eliminadas = 0
+    with tempfile.TemporaryDirectory(prefix="duplicados_", dir=directorio) as tmp:
+        if keep == "first":
+            conjunto = _conjunto(tmp)
+            for bloque in bloques:
+                mascara = _primeras_apariciones(_hashes(bloque), conjunto)
+                eliminadas += int((~mascara).sum())
+                yield bloque.loc[mascara]
+        else:
+            n_bloques = 0
+            for k, bloque in enumerate(bloques):
+                bloque.to_pickle(os.path.join(tmp, f"bloque_{k}.pkl"))
+                np.save(os.path.join(tmp, f"hash_{k}.npy"), _hashes(bloque))
+                n_bloques += 1
+
+            # Últimas apariciones: se recorren bloques y filas al revés
+            conjunto = _conjunto(tmp)
+            for k in reversed(range(n_bloques)):
+                hashes = np.load(os.path.join(tmp, f"hash_{k}.npy"))
+                ultimas = _primeras_apariciones(hashes[::-1], conjunto)[::-1]
+                np.save(os.path.join(tmp, f"mascara_{k}.npy"), ultimas)
+            del conjunto
+
+            conjunto = _conjunto(tmp) if keep is False else None
+            for k in range(n_bloques):
+                bloque = pd.read_pickle(os.path.join(tmp, f"bloque_{k}.pkl"))
+                mascara = np.load(os.path.join(tmp, f"mascara_{k}.npy"))
+                if conjunto is not None:
+                    hashes = np.load(os.path.join(tmp, f"hash_{k}.npy"))
+                    mascara &= _primeras_apariciones(hashes, conjunto)
+                eliminadas += int((~mascara).sum())
+                yield bloque.loc[mascara]
+    if mensaje:
+        logger.info("Filas eliminadas: %s", eliminadas)
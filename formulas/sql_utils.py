@@ -1,9 +1,45 @@
 """Módulo para trabajar con bases de datos usando SQLAlchemy."""
 
-from typing import Any
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import (
+    MetaData,
+    Table,
+    and_,
+    bindparam,
+    create_engine,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+try:
+    import duckdb
+except Exception:  # pragma: no cover - library optional
+    duckdb = None
+
+from .csv_utils import detectar_delimitador, detectar_encoding
+
+logger = logging.getLogger(__name__)
 
 
 def crear_conexion(url: str) -> Any:
@@ -27,7 +63,12 @@ def crear_conexion(url: str) -> Any:
     return engine
 
 
-def leer_query(sql: str, engine: Any) -> pd.DataFrame:
+def leer_query(
+    sql: str,
+    engine: Any,
+    params: Optional[Mapping[str, Any]] = None,
+    tam_bloque: Optional[int] = None,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """Ejecutar una consulta y devolver un DataFrame.
 
     Parameters
@@ -36,17 +77,44 @@ def leer_query(sql: str, engine: Any) -> pd.DataFrame:
         Consulta SQL a ejecutar.
     engine : sqlalchemy.Engine
         Conexión a utilizar.
+    params : mapping, optional
+        Parámetros enlazados a los marcadores ``:nombre`` de la consulta. Los
+        valores nunca se interpolan en el texto SQL.
+    tam_bloque : int, optional
+        Si se indica, se devuelve un iterador de DataFrames de como mucho
+        ``tam_bloque`` filas. La conexión permanece abierta hasta agotarlo.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame or iterator of pandas.DataFrame
         Resultado de la consulta.
+
+    Examples
+    --------
+    >>> leer_query('SELECT * FROM ventas WHERE pais = :pais', engine, {'pais': 'ES'})
+    >>> perfilar(leer_query('SELECT * FROM ventas', engine, tam_bloque=100_000))
     """
+    if tam_bloque is not None:
+        return _leer_query_bloques(sql, engine, params, tam_bloque)
     with engine.connect() as conn:
-        df = pd.read_sql(sql, conn)
+        if params is None:
+            df = pd.read_sql(sql, conn)
+        else:
+            df = pd.read_sql(text(sql), conn, params=dict(params))
     return df
 
 
+def _leer_query_bloques(
+    sql: str, engine: Any, params: Optional[Mapping[str, Any]], tam_bloque: int
+) -> Iterator[pd.DataFrame]:
+    with engine.connect() as conn:
+        if params is None:
+            bloques = pd.read_sql(sql, conn, chunksize=tam_bloque)
+        else:
+            bloques = pd.read_sql(text(sql), conn, params=dict(params), chunksize=tam_bloque)
+        yield from bloques
+
+
 def escribir_df(
     df: pd.DataFrame, tabla: str, engine: Any, if_exists: str = "replace"
 ) -> None:
@@ -69,3 +137,576 @@ def escribir_df(
     """
     with engine.connect() as conn:
         df.to_sql(tabla, conn, if_exists=if_exists, index=False)
+
+
+def _filas_como_registros(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convertir filas a diccionarios con ``None`` en lugar de nulos."""
+    datos = df.astype(object).where(df.notna(), None)
+    return datos.to_dict("records")
+
+
+def _hash_filas(df: pd.DataFrame, columnas: Sequence[str]) -> pd.Series:
+    """Calcular un hash por fila de las ``columnas`` indicadas."""
+    if not columnas:
+        return pd.Series(0, index=df.index, dtype="uint64")
+    return pd.util.hash_pandas_object(df[list(columnas)], index=False)
+
+
+def _alinear_tipos(actual: pd.DataFrame, referencia: pd.DataFrame) -> pd.DataFrame:
+    """Convertir las columnas de ``actual`` a los tipos de ``referencia``.
+
+    Los valores leídos de la base de datos pueden llegar con tipos distintos
+    (por ejemplo fechas como texto en SQLite); alinearlos evita detectar
+    cambios inexistentes al comparar los hashes.
+    """
+    actual = actual.copy()
+    for col in referencia.columns:
+        if col not in actual.columns or actual[col].dtype == referencia[col].dtype:
+            continue
+        try:
+            if pd.api.types.is_datetime64_any_dtype(referencia[col]):
+                actual[col] = pd.to_datetime(actual[col], errors="coerce")
+            actual[col] = actual[col].astype(referencia[col].dtype)
+        except (TypeError, ValueError):
+            logger.debug("No se pudo alinear el tipo de la columna %s", col)
+    return actual
+
+
+def sincronizar_df(
+    df: pd.DataFrame,
+    tabla: str,
+    engine: Any,
+    claves: Union[str, Iterable[str]],
+    tam_lote: int = 1000,
+    eliminar: bool = True,
+) -> Dict[str, int]:
+    """Sincronizar una tabla con un DataFrame aplicando solo las diferencias.
+
+    A diferencia de :func:`escribir_df` con ``if_exists="replace"``, la tabla
+    no se reescribe: se comparan hashes de las filas por clave primaria y se
+    ejecutan únicamente los ``INSERT``, ``UPDATE`` y ``DELETE`` necesarios, en
+    lotes y dentro de una única transacción. Si la tabla no existe se crea con
+    :func:`escribir_df`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Contenido deseado de la tabla.
+    tabla : str
+        Nombre de la tabla destino.
+    engine : sqlalchemy.Engine
+        Conexión a utilizar.
+    claves : str or iterable of str
+        Columnas que identifican cada fila (clave primaria).
+    tam_lote : int, optional
+        Número de filas por sentencia ``executemany``.
+    eliminar : bool, optional
+        Si ``True`` se borran las filas de la tabla ausentes en ``df``.
+
+    Returns
+    -------
+    dict[str, int]
+        Número de filas ``insertadas``, ``actualizadas`` y ``eliminadas``.
+
+    Examples
+    --------
+    >>> cambios = sincronizar_df(df, 'clientes', engine, claves='id')
+    """
+    claves = [claves] if isinstance(claves, str) else list(claves)
+    faltan = [c for c in claves if c not in df.columns]
+    if faltan:
+        raise KeyError(f"Las claves {faltan} no existen en el DataFrame")
+    if df.duplicated(subset=claves).any():
+        raise ValueError("Las claves no identifican de forma única cada fila")
+
+    if not inspect(engine).has_table(tabla):
+        escribir_df(df, tabla, engine, if_exists="fail")
+        return {"insertadas": len(df), "actualizadas": 0, "eliminadas": 0}
+
+    destino = Table(tabla, MetaData(), autoload_with=engine)
+    valores = [c for c in df.columns if c not in claves]
+    with engine.connect() as conn:
+        actual = pd.read_sql(select(*[destino.c[c] for c in df.columns]), conn)
+    actual = _alinear_tipos(actual, df)
+
+    nuevo = df.reset_index(drop=True)
+    nuevo_hash = nuevo[claves].assign(_hash=_hash_filas(nuevo, valores).values)
+    actual_hash = actual[claves].assign(_hash=_hash_filas(actual, valores).values)
+    cruce = nuevo_hash.merge(
+        actual_hash, on=claves, how="outer", suffixes=("", "_actual"), indicator=True
+    )
+
+    insertar = cruce.loc[cruce["_merge"] == "left_only", claves]
+    actualizar = cruce.loc[
+        (cruce["_merge"] == "both") & (cruce["_hash"] != cruce["_hash_actual"]), claves
+    ]
+    borrar = cruce.loc[cruce["_merge"] == "right_only", claves]
+
+    filas_insertar = nuevo.merge(insertar, on=claves)
+    filas_actualizar = nuevo.merge(actualizar, on=claves)
+
+    condicion = and_(*[destino.c[c] == bindparam(f"_k_{c}") for c in claves])
+    sentencia_update = (
+        destino.update()
+        .where(condicion)
+        .values({c: bindparam(c) for c in valores})
+    )
+    sentencia_delete = destino.delete().where(condicion)
+
+    def _renombrar_claves(registros: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for registro in registros:
+            for c in claves:
+                registro[f"_k_{c}"] = registro.pop(c)
+        return registros
+
+    with engine.begin() as conn:
+        for inicio in range(0, len(filas_insertar), tam_lote):
+            lote = filas_insertar.iloc[inicio : inicio + tam_lote]
+            conn.execute(destino.insert(), _filas_como_registros(lote))
+        if valores:
+            for inicio in range(0, len(filas_actualizar), tam_lote):
+                lote = filas_actualizar.iloc[inicio : inicio + tam_lote]
+                conn.execute(
+                    sentencia_update, _renombrar_claves(_filas_como_registros(lote))
+                )
+        if eliminar:
+            for inicio in range(0, len(borrar), tam_lote):
+                lote = borrar.iloc[inicio : inicio + tam_lote]
+                conn.execute(
+                    sentencia_delete, _renombrar_claves(_filas_como_registros(lote))
+                )
+
+    cambios = {
+        "insertadas": len(filas_insertar),
+        "actualizadas": len(filas_actualizar) if valores else 0,
+        "eliminadas": len(borrar) if eliminar else 0,
+    }
+    logger.info("Sincronización de %s: %s", tabla, cambios)
+    return cambios
+
+
+def _leer_marca(ruta_marca: str) -> Any:
+    """Recuperar la marca de agua guardada junto al snapshot."""
+    if not os.path.exists(ruta_marca):
+        return None
+    with open(ruta_marca, encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("tipo") == "timestamp":
+        return pd.Timestamp(datos["marca"])
+    return datos.get("marca")
+
+
+def _guardar_marca(ruta_marca: str, marca: Any) -> None:
+    """Persistir la marca de agua en formato JSON."""
+    if isinstance(marca, pd.Timestamp):
+        datos = {"tipo": "timestamp", "marca": marca.isoformat()}
+    else:
+        datos = {"tipo": "valor", "marca": marca.item() if hasattr(marca, "item") else marca}
+    temporal = f"{ruta_marca}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f)
+    os.replace(temporal, ruta_marca)
+
+
+def extraer_incremental(
+    tabla: str,
+    engine: Any,
+    snapshot: Union[str, os.PathLike],
+    claves: Union[str, Iterable[str]],
+    columna_marca: str = "updated_at",
+) -> pd.DataFrame:
+    """Extraer solo las filas nuevas o modificadas de una tabla.
+
+    Se mantiene una copia local de la tabla en Parquet (``snapshot``) y la
+    marca de agua (el mayor valor de ``columna_marca`` ya extraído) en un
+    archivo ``<snapshot>.marca.json``. En cada ejecución solo se consultan las
+    filas con ``columna_marca`` igual o posterior a la marca, se combinan con
+    el snapshot por ``claves`` (prevalece la versión más reciente) y se
+    guarda el resultado. Las filas con el mismo valor que la marca se
+    vuelven a leer para no perder las confirmadas después de la extracción
+    anterior con esa misma marca. La primera ejecución extrae la tabla
+    completa.
+
+    Parameters
+    ----------
+    tabla : str
+        Nombre de la tabla origen.
+    engine : sqlalchemy.Engine
+        Conexión a utilizar.
+    snapshot : str or PathLike
+        Ruta del archivo Parquet con la copia local.
+    claves : str or iterable of str
+        Columnas que identifican cada fila.
+    columna_marca : str, optional
+        Columna creciente con la fecha de modificación, por defecto
+        ``"updated_at"``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Contenido actualizado de la tabla.
+
+    Examples
+    --------
+    >>> df = extraer_incremental('pedidos', engine, 'pedidos.parquet', claves='id')
+    """
+    claves = [claves] if isinstance(claves, str) else list(claves)
+    ruta = os.path.abspath(snapshot)
+    ruta_marca = f"{ruta}.marca.json"
+
+    marca = _leer_marca(ruta_marca) if os.path.exists(ruta) else None
+    origen = Table(tabla, MetaData(), autoload_with=engine)
+    consulta = select(origen)
+    if marca is not None:
+        valor = marca.to_pydatetime() if isinstance(marca, pd.Timestamp) else marca
+        consulta = consulta.where(origen.c[columna_marca] >= valor)
+    with engine.connect() as conn:
+        nuevas = pd.read_sql(consulta, conn)
+
+    if marca is None:
+        df = nuevas
+    else:
+        anterior = pd.read_parquet(ruta)
+        # Las filas con la misma marca vuelven siempre: si todas están ya en el
+        # snapshot no hay nada que reescribir
+        columnas = list(nuevas.columns)
+        repetidas = nuevas.merge(
+            anterior[columnas].drop_duplicates(), on=columnas, how="left", indicator=True
+        )
+        if (repetidas["_merge"] == "both").all():
+            logger.info("Sin cambios en %s desde %s", tabla, marca)
+            return anterior
+        df = pd.concat([anterior, nuevas], ignore_index=True)
+        df = df.drop_duplicates(subset=claves, keep="last").reset_index(drop=True)
+
+    if not df.empty:
+        temporal = f"{ruta}.tmp"
+        df.to_parquet(temporal, index=False)
+        os.replace(temporal, ruta)
+        nueva_marca = df[columna_marca].max()
+        if marca is None or nueva_marca > marca:
+            _guardar_marca(ruta_marca, nueva_marca)
+    logger.info("Filas extraídas de %s: %s", tabla, len(nuevas))
+    return df
+
+
+def crear_conexion_async(url: str) -> Any:
+    """Crear un motor de conexión asíncrono a partir de una URL.
+
+    La URL debe usar un driver asíncrono, por ejemplo
+    ``"sqlite+aiosqlite:///data.db"`` o ``"postgresql+asyncpg://..."``.
+
+    Parameters
+    ----------
+    url : str
+        Cadena de conexión a la base de datos.
+
+    Returns
+    -------
+    sqlalchemy.ext.asyncio.AsyncEngine
+        Motor de conexión asíncrono.
+
+    Examples
+    --------
+    >>> engine = crear_conexion_async('sqlite+aiosqlite:///data.db')
+    """
+    return create_async_engine(url)
+
+
+async def leer_query_async(
+    sql: str, engine: Any, params: Optional[Mapping[str, Any]] = None
+) -> pd.DataFrame:
+    """Versión asíncrona de :func:`leer_query`.
+
+    La consulta se ejecuta sobre el motor asíncrono sin bloquear el bucle de
+    eventos; pandas construye el DataFrame en el contexto síncrono que
+    SQLAlchemy expone mediante ``run_sync``.
+
+    Parameters
+    ----------
+    sql : str
+        Consulta SQL a ejecutar.
+    engine : sqlalchemy.ext.asyncio.AsyncEngine
+        Conexión creada con :func:`crear_conexion_async`.
+    params : mapping, optional
+        Parámetros enlazados a los marcadores ``:nombre`` de la consulta.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Resultado de la consulta.
+
+    Examples
+    --------
+    >>> df = await leer_query_async('SELECT * FROM ventas', engine)
+    """
+    parametros = dict(params) if params is not None else None
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: pd.read_sql(text(sql), sync_conn, params=parametros)
+        )
+
+
+async def escribir_df_async(
+    df: pd.DataFrame, tabla: str, engine: Any, if_exists: str = "replace"
+) -> None:
+    """Versión asíncrona de :func:`escribir_df`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame a guardar.
+    tabla : str
+        Nombre de la tabla destino.
+    engine : sqlalchemy.ext.asyncio.AsyncEngine
+        Conexión creada con :func:`crear_conexion_async`.
+    if_exists : str, optional
+        Comportamiento si la tabla existe, por defecto ``"replace"``.
+
+    Examples
+    --------
+    >>> await escribir_df_async(df, 'ventas', engine)
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: df.to_sql(
+                tabla, sync_conn, if_exists=if_exists, index=False
+            )
+        )
+
+
+async def ejecutar_consultas_async(
+    consultas: Iterable[str], engine: Any, max_concurrencia: int = 5
+) -> List[pd.DataFrame]:
+    """Ejecutar varias consultas de forma concurrente.
+
+    Parameters
+    ----------
+    consultas : iterable of str
+        Consultas SQL a ejecutar.
+    engine : sqlalchemy.ext.asyncio.AsyncEngine
+        Conexión creada con :func:`crear_conexion_async`.
+    max_concurrencia : int, optional
+        Número máximo de consultas en curso a la vez, por defecto ``5``.
+
+    Returns
+    -------
+    list of pandas.DataFrame
+        Resultados en el mismo orden que ``consultas``.
+
+    Examples
+    --------
+    >>> ventas, clientes = await ejecutar_consultas_async(
+    ...     ['SELECT * FROM ventas', 'SELECT * FROM clientes'], engine
+    ... )
+    """
+    if max_concurrencia < 1:
+        raise ValueError("max_concurrencia debe ser mayor que 0")
+    semaforo = asyncio.Semaphore(max_concurrencia)
+
+    async def _ejecutar(sql: str) -> pd.DataFrame:
+        async with semaforo:
+            return await leer_query_async(sql, engine)
+
+    return list(await asyncio.gather(*(_ejecutar(sql) for sql in consultas)))
+
+
+# Máximo de parámetros enlazados por sentencia que admite cada motor. Oracle
+# limita las listas ``IN`` a 1000 elementos y SQL Server a 2100 parámetros.
+_LIMITE_PARAMETROS = {"sqlite": 999, "mssql": 2000, "oracle": 1000}
+
+
+def _escalar_python(valor: Any) -> Any:
+    """Convertir escalares de NumPy o pandas al tipo nativo que enlaza el driver."""
+    if isinstance(valor, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(valor).to_pydatetime()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def leer_por_claves(
+    tabla: str,
+    columna: str,
+    claves: Iterable[Any],
+    engine: Any,
+    columnas: Optional[Iterable[str]] = None,
+    tam_lote: Optional[int] = None,
+    max_workers: int = 4,
+) -> pd.DataFrame:
+    """Recuperar las filas cuyo valor de ``columna`` está en ``claves``.
+
+    Las claves se deduplican y se reparten en lotes de tamaño fijo que se
+    consultan con ``WHERE columna IN (...)`` usando parámetros enlazados, de
+    modo que los valores nunca se interpolan en el SQL. El último lote se
+    rellena repitiendo su última clave para que todas las sentencias tengan el
+    mismo texto y el motor reutilice la sentencia compilada. Los lotes se
+    ejecutan en paralelo sobre el pool de conexiones del ``engine``.
+
+    Parameters
+    ----------
+    tabla : str
+        Nombre de la tabla a consultar.
+    columna : str
+        Columna sobre la que se filtran las claves.
+    claves : iterable
+        Valores a buscar.
+    engine : sqlalchemy.Engine
+        Conexión a utilizar.
+    columnas : iterable of str, optional
+        Columnas a devolver. Por defecto todas.
+    tam_lote : int, optional
+        Claves por consulta. Por defecto el máximo razonable del motor.
+    max_workers : int, optional
+        Número de consultas simultáneas, por defecto ``4``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Filas encontradas de todos los lotes.
+
+    Examples
+    --------
+    >>> df = leer_por_claves('clientes', 'id', ids, engine, columnas=['id', 'pais'])
+    """
+    origen = Table(tabla, MetaData(), autoload_with=engine)
+    if columna not in origen.c:
+        raise KeyError(f"La columna '{columna}' no existe en la tabla {tabla}")
+    seleccion = [origen.c[c] for c in columnas] if columnas is not None else [origen]
+    consulta = select(*seleccion).where(
+        origen.c[columna].in_(bindparam("claves", expanding=True))
+    )
+
+    unicas = [_escalar_python(v) for v in claves]
+    unicas = pd.unique(pd.Series(unicas, dtype=object).dropna()).tolist()
+    if not unicas:
+        with engine.connect() as conn:
+            return pd.read_sql(select(*seleccion).limit(0), conn)
+
+    tam = tam_lote or _LIMITE_PARAMETROS.get(engine.dialect.name, 1000)
+    tam = min(tam, len(unicas))
+    lotes = [unicas[i : i + tam] for i in range(0, len(unicas), tam)]
+    lotes[-1] = lotes[-1] + [lotes[-1][-1]] * (tam - len(lotes[-1]))
+
+    def _leer(lote: List[Any]) -> pd.DataFrame:
+        with engine.connect() as conn:
+            return pd.read_sql(consulta, conn, params={"claves": lote})
+
+    if max_workers <= 1 or len(lotes) == 1:
+        resultados = [_leer(lote) for lote in lotes]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(lotes))) as pool:
+            resultados = list(pool.map(_leer, lotes))
+    return pd.concat(resultados, ignore_index=True)
+
+
+def _registrar_sqlite(
+    conn: sqlite3.Connection,
+    nombre: str,
+    origen: Union[str, os.PathLike, pd.DataFrame],
+    tam_bloque: int,
+) -> None:
+    """Volcar ``origen`` por bloques en una tabla SQLite en memoria."""
+    if isinstance(origen, pd.DataFrame):
+        origen.to_sql(nombre, conn, index=False, chunksize=tam_bloque)
+        return
+    ruta = os.path.abspath(origen)
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        bloques = pd.read_csv(
+            ruta,
+            sep=detectar_delimitador(ruta),
+            encoding=detectar_encoding(ruta),
+            chunksize=tam_bloque,
+        )
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        archivo = pq.ParquetFile(ruta)
+        bloques = (lote.to_pandas() for lote in archivo.iter_batches(tam_bloque))
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {extension}")
+    for bloque in bloques:
+        bloque.to_sql(nombre, conn, index=False, if_exists="append")
+
+
+def _registrar_duckdb(
+    conn: Any, nombre: str, origen: Union[str, os.PathLike, pd.DataFrame]
+) -> None:
+    """Registrar ``origen`` como vista de DuckDB sin cargarlo en memoria."""
+    if isinstance(origen, pd.DataFrame):
+        conn.register(nombre, origen)
+        return
+    ruta = os.path.abspath(origen)
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        relacion = conn.read_csv(ruta)
+    elif extension == ".parquet":
+        relacion = conn.read_parquet(ruta)
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {extension}")
+    relacion.create_view(nombre)
+
+
+def consultar_archivos(
+    sql: str,
+    tablas: Mapping[str, Union[str, os.PathLike, pd.DataFrame]],
+    motor: str = "auto",
+    tam_bloque: int = 100_000,
+) -> pd.DataFrame:
+    """Ejecutar SQL directamente sobre archivos CSV/Parquet y DataFrames.
+
+    Con DuckDB los archivos se registran como vistas y el motor lee solo las
+    columnas y filas que la consulta necesita (*projection* y *filter
+    pushdown*), por lo que nunca se cargan completos en pandas. Si DuckDB no
+    está instalado se usa SQLite en memoria: los archivos se vuelcan por
+    bloques de ``tam_bloque`` filas, sin pushdown pero con memoria acotada en
+    pandas.
+
+    Parameters
+    ----------
+    sql : str
+        Consulta a ejecutar. Las tablas se referencian por su nombre en
+        ``tablas``.
+    tablas : mapping of str to path or pandas.DataFrame
+        Nombre de cada tabla y su origen: ruta ``.csv``/``.parquet`` o
+        DataFrame en memoria.
+    motor : {"auto", "duckdb", "sqlite"}, optional
+        Motor embebido a utilizar. ``"auto"`` elige DuckDB si está disponible.
+    tam_bloque : int, optional
+        Filas por bloque al volcar archivos en SQLite.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Resultado de la consulta.
+
+    Examples
+    --------
+    >>> consultar_archivos(
+    ...     'SELECT c.pais, SUM(v.importe) AS total FROM ventas v '
+    ...     'JOIN clientes c USING (id) GROUP BY c.pais',
+    ...     {'ventas': 'ventas.parquet', 'clientes': df_clientes},
+    ... )
+    """
+    if motor not in {"auto", "duckdb", "sqlite"}:
+        raise ValueError("motor debe ser 'auto', 'duckdb' o 'sqlite'")
+    if motor == "duckdb" and duckdb is None:
+        raise ImportError("Se necesita el paquete 'duckdb' para usar motor='duckdb'")
+
+    if motor != "sqlite" and duckdb is not None:
+        conn = duckdb.connect()
+        try:
+            for nombre, origen in tablas.items():
+                _registrar_duckdb(conn, nombre, origen)
+            return conn.execute(sql).df()
+        finally:
+            conn.close()
+
+    conn = sqlite3.connect(":memory:")
+    try:
+        for nombre, origen in tablas.items():
+            _registrar_sqlite(conn, nombre, origen, tam_bloque)
+        return pd.read_sql(sql, conn)
+    finally:
+        conn.close()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from formulas.aproximados import CuantilesKLL, FiltroBloom, HyperLogLog, Momentos, TopK
+
+
+def test_filtro_bloom_sin_falsos_negativos():
+    rng = np.random.default_rng(0)
+    vistos = rng.integers(0, 2**63, 5000, dtype=np.uint64)
+    otros = rng.integers(0, 2**63, 5000, dtype=np.uint64)
+    filtro = FiltroBloom(5000, tasa_error=0.01)
+    filtro.agregar(vistos)
+
+    assert filtro.contiene(vistos).all()
+    assert filtro.contiene(otros).mean() < 0.03
+
+
+def test_cuantiles_kll_combinables():
+    rng = np.random.default_rng(0)
+    valores = rng.normal(size=200_000)
+    izq, der = CuantilesKLL(semilla=0), CuantilesKLL(semilla=1)
+    for i in range(0, 100_000, 10_000):
+        izq.actualizar(valores[i : i + 10_000])
+    der.actualizar(valores[100_000:])
+    boceto = izq.combinar(der)
+
+    q = [0.05, 0.25, 0.5, 0.75, 0.95]
+    rangos = np.searchsorted(np.sort(valores), boceto.cuantil(q)) / len(valores)
+    assert np.abs(rangos - q).max() < 0.01
+    assert boceto.n == len(valores)
+    assert boceto.cuantil(1.0) == valores.max()
+
+
+def test_momentos_combinables():
+    rng = np.random.default_rng(0)
+    valores = rng.exponential(size=50_000)
+    momentos = Momentos().actualizar(valores[:20_000])
+    momentos.combinar(Momentos().actualizar(valores[20_000:]))
+    serie = pd.Series(valores)
+
+    assert momentos.n == len(valores)
+    assert np.isclose(momentos.media, serie.mean())
+    assert np.isclose(momentos.desviacion(), serie.std())
+    assert np.isclose(momentos.asimetria(), serie.skew())
+    assert np.isclose(momentos.curtosis(), serie.kurt())
+
+
+def test_hyperloglog_y_topk():
+    rng = np.random.default_rng(0)
+    valores = rng.zipf(1.5, 100_000)
+    hashes = pd.util.hash_array(valores)
+    izq, der = HyperLogLog(), HyperLogLog()
+    izq.agregar(hashes[:50_000])
+    der.agregar(hashes[50_000:])
+    distintos = len(np.unique(valores))
+    assert abs(izq.combinar(der).estimar() / distintos - 1) < 0.03
+
+    top = TopK(100).actualizar(valores[:50_000]).combinar(TopK(100).actualizar(valores[50_000:]))
+    exactos = pd.Series(valores).value_counts().head(5)
+    frecuentes = top.mas_frecuentes(5)
+    assert list(frecuentes["valor"]) == list(exactos.index)
+    assert (frecuentes["frecuencia"].to_numpy() >= exactos.to_numpy()).all()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from formulas.cache import activar_cache, desactivar_cache, huella
+from formulas.estadisticas import nulos, resumen_columnas
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"a": rng.normal(size=5000), "b": rng.choice(["x", "y"], 5000)})
+
+
+@pytest.fixture(autouse=True)
+def _sin_cache():
+    yield
+    desactivar_cache()
+
+
+def test_huella_detecta_cambios(df):
+    assert huella(df) == huella(df.copy())
+    assert huella(df) != huella(df.astype({"a": "float32"}))
+    assert huella(df) != huella(df.rename(columns={"a": "c"}))
+    modificado = df.copy()
+    modificado.loc[1, "a"] = 0.5
+    assert huella(modificado, completa=True) != huella(df, completa=True)
+
+
+def test_cache_detecta_modificaciones_en_el_sitio():
+    activar_cache()
+    df = pd.DataFrame({"a": np.arange(100_000, dtype=float), "b": np.arange(100_000)})
+    assert nulos(df, imprimir=False).loc["a", "Nulos"] == 0
+    assert resumen_columnas(df).set_index("Nombre").loc["b", "min"] == 0
+
+    # Filas que no caen en la muestra de la huella rápida
+    df.loc[1:3, "a"] = np.nan
+    df.loc[7, "b"] = -1
+    assert nulos(df, imprimir=False).loc["a", "Nulos"] == 3
+    assert resumen_columnas(df).set_index("Nombre").loc["b", "min"] == -1
+
+
+def test_cache_lru_y_disco(df, tmp_path):
+    cache = activar_cache(max_entradas=1, directorio=tmp_path)
+    primero = resumen_columnas(df)
+    segundo = resumen_columnas(df)
+    pd.testing.assert_frame_equal(primero, segundo)
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+    segundo.loc[0, "mean"] = 99
+    assert resumen_columnas(df).loc[0, "mean"] != 99
+
+    otro = df.assign(a=df["a"] * 2)
+    nulos(otro, imprimir=False)
+    assert len(cache) == 1
+
+    # La primera entrada ya no está en memoria pero sí en disco
+    nueva = activar_cache(directorio=tmp_path)
+    pd.testing.assert_frame_equal(resumen_columnas(df), primero)
+    assert nueva.aciertos == 1
+    nueva.limpiar()
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_cache_modelos(tmp_path):
+    from sklearn.datasets import make_classification
+
+    from formulas.cache import activar_cache_modelos, desactivar_cache_modelos
+    from formulas.modelos import entrenar_random_forest
+
+    X, y = make_classification(n_samples=200, random_state=0)
+    X = pd.DataFrame(X)
+    cache = activar_cache_modelos(tmp_path, max_entradas_disco=2)
+    try:
+        primero = entrenar_random_forest(X, y, random_state=0)
+        # Misma llamada por nombre y con el valor por defecto explícito
+        entrenar_random_forest(X_train=X, y_train=y, n_estimators=100, random_state=0)
+        assert (cache.aciertos, cache.fallos) == (1, 1)
+
+        cache._memoria.clear()
+        desde_disco = entrenar_random_forest(X, y, random_state=0)
+        assert cache.aciertos == 2
+        assert desde_disco is not primero
+        assert (desde_disco.predict(X) == primero.predict(X)).all()
+
+        entrenar_random_forest(X, 1 - y, random_state=0)
+        entrenar_random_forest(X, y, random_state=1)
+        assert cache.fallos == 3
+        assert len(list(tmp_path.glob("*.joblib"))) == 2
+    finally:
+        desactivar_cache_modelos()
+
+
+def test_clave_distingue_arrays_grandes():
+    from formulas.cache import _clave
+
+    def _funcion(*args):
+        return None
+
+    base = np.zeros((10, 100, 100))
+    cambiado = base.copy()
+    cambiado[5, 50, 50] = 1.0
+    assert repr(base) == repr(cambiado)
+    assert _clave(_funcion, (base,), {}, True) != _clave(_funcion, (cambiado,), {}, True)
+
+    categorias = pd.Categorical(["a"] * 5000 + ["b"] * 5000)
+    otras = pd.Categorical(["a"] * 4999 + ["b"] * 5001)
+    assert _clave(_funcion, (categorias,), {}, True) != _clave(_funcion, (otras,), {}, True)
+    assert _clave(_funcion, ([base],), {}, True) != _clave(_funcion, ([cambiado],), {}, True)
+    assert _clave(_funcion, (base,), {}, True) == _clave(_funcion, (base.copy(),), {}, True)
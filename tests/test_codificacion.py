@@ -0,0 +1,47 @@
+import pandas as pd
+
+from formulas.codificacion import CodificadorOneHot
+from formulas.pandas_transform import codificar_onehot
+
+
+def _df():
+    return pd.DataFrame(
+        {
+            "pais": ["es", "fr", "es", "it", None, "es", "fr"],
+            "n": range(7),
+        }
+    )
+
+
+def test_codificador_equivale_a_get_dummies():
+    df = _df()
+    resultado = CodificadorOneHot("pais").ajustar_transformar(df)
+    esperado = pd.get_dummies(df, columns=["pais"])
+
+    assert all(isinstance(t, pd.SparseDtype) for t in resultado.dtypes.iloc[1:])
+    densas = resultado.astype({c: bool for c in esperado.columns[1:]})
+    pd.testing.assert_frame_equal(densas, esperado)
+
+
+def test_codificador_vocabulario_estable_con_otros(tmp_path):
+    df = _df()
+    bloques = [df.iloc[:3], df.iloc[3:]]
+    codificador = CodificadorOneHot("pais", max_categorias=2, disperso=False)
+    codificador.ajustar(iter(bloques))
+    ruta = tmp_path / "codificador.pkl"
+    codificador.guardar(ruta)
+    cargado = CodificadorOneHot.cargar(ruta)
+
+    lote = pd.DataFrame({"pais": ["de", "es", None], "n": [0, 1, 2]})
+    resultado = cargado.transformar(lote)
+    assert list(resultado.columns) == ["n", "pais_es", "pais_fr", "pais_otros"]
+    assert resultado["pais_otros"].tolist() == [True, False, False]
+    assert resultado.iloc[2, 1:].sum() == 0
+    for parte in cargado.transformar(iter(bloques)):
+        assert list(parte.columns) == list(resultado.columns)
+
+
+def test_codificar_onehot_disperso():
+    resultado = codificar_onehot(_df(), ["pais"], disperso=True, max_categorias=1)
+    assert list(resultado.columns) == ["n", "pais_es", "pais_otros"]
+    assert resultado["pais_otros"].sparse.density < 1
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scipy.stats import shapiro
+
+from formulas.estadisticas import (
+    PerfilIncremental,
+    comprueba_normalidad,
+    describir_columnas,
+    matriz_correlacion,
+    nulos,
+    perfilar,
+    resumen_columnas,
+    resumen_dataset,
+    resumen_por_grupos,
+)
+
+
+def _df():
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "importe": np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+            "unidades": rng.integers(0, 5, n),
+            "canal": rng.choice(["web", "tienda", None], n),
+            "fecha": pd.date_range("2020-01-01", periods=n),
+        }
+    )
+    return pd.concat([df, df.iloc[:7]], ignore_index=True)
+
+
+def test_perfilar_coincide_con_pandas():
+    df = _df()
+    perfil = perfilar(df)
+
+    assert perfil.attrs["filas"] == len(df)
+    assert perfil.attrs["duplicados"] == df.duplicated().sum()
+    assert perfil["Nulos"].tolist() == df.isnull().sum().tolist()
+    assert perfil["Valores únicos"].tolist() == df.nunique().tolist()
+    descripcion = df["importe"].describe()
+    for estadistico in ["mean", "std", "min", "25%", "50%", "75%", "max"]:
+        assert perfil.loc["importe", estadistico] == pytest.approx(descripcion[estadistico])
+    assert perfil.loc["importe", "Asimetría"] == pytest.approx(df["importe"].skew())
+    assert perfil.loc["unidades", "Curtosis"] == pytest.approx(df["unidades"].kurt())
+
+
+def test_vistas_reutilizan_el_perfil():
+    df = _df()
+    perfil = perfilar(df)
+
+    resumen = nulos(df, imprimir=False, perfil=perfil)
+    assert resumen.loc["Duplicados", "Nulos"] == 7
+    assert resumen.loc["canal", "Nulos"] == df["canal"].isnull().sum()
+    pd.testing.assert_frame_equal(
+        resumen_dataset(df, imprimir=False, perfil=perfil),
+        resumen_dataset(df, imprimir=False),
+    )
+    columnas = resumen_columnas(df, perfil=perfil)
+    assert columnas["Nombre"].tolist() == list(df.columns)
+    assert columnas.loc[0, "mean"] == round(df["importe"].mean(), 2)
+    assert (columnas["Valores duplicados"] == 7).all()
+
+
+def test_duplicados_con_ceros_con_signo():
+    df = pd.DataFrame({"a": [0.0, -0.0, np.nan, np.nan], "b": ["x", "x", "y", "y"]})
+    assert perfilar(df, estadisticas=False).attrs["duplicados"] == 2
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_perfilar_por_bloques(n_workers):
+    df = _df()
+    exacto = perfilar(df)
+    bloques = (df.iloc[i : i + 50] for i in range(0, len(df), 50))
+    perfil = perfilar(bloques, n_workers=n_workers)
+
+    assert perfil.attrs["aproximado"]
+    assert perfil.attrs["duplicados"] == exacto.attrs["duplicados"]
+    assert perfil["Nulos"].tolist() == exacto["Nulos"].tolist()
+    assert perfil["Valores únicos"].tolist() == pytest.approx(exacto["Valores únicos"].tolist(), rel=0.03)
+    for estadistico in ["count", "mean", "std", "min", "max", "Asimetría", "Curtosis"]:
+        assert perfil.loc["importe", estadistico] == pytest.approx(exacto.loc["importe", estadistico])
+    assert perfil.loc["canal", "top"] == exacto.loc["canal", "top"]
+    assert perfil.loc["fecha", "max"] == df["fecha"].max()
+    columnas = resumen_columnas(None, perfil=perfil)
+    assert columnas["Nombre"].tolist() == list(df.columns)
+
+
+def test_perfil_incremental_reproducible_y_con_cambio_de_tipo():
+    # El segundo bloque trae un nulo y ``read_csv`` lo leería como float64
+    bloques = [
+        pd.DataFrame({"id": [1, 2, 3], "v": np.arange(3)}),
+        pd.DataFrame({"id": [1.0, 2.0, np.nan], "v": np.arange(3.0)}),
+    ]
+
+    def _perfil(semilla):
+        perfil = PerfilIncremental(k=8, semilla=semilla)
+        for _ in range(20):
+            for bloque in bloques:
+                perfil.actualizar(bloque)
+        return perfil.perfil()
+
+    primero = _perfil(1)
+    assert primero.attrs["duplicados"] == 120 - 4
+    assert primero.loc["v", ["25%", "50%", "75%"]].tolist() == _perfil(1).loc["v", ["25%", "50%", "75%"]].tolist()
+
+
+@pytest.mark.parametrize("metodo", ["pearson", "spearman"])
+def test_matriz_correlacion_por_bloques(metodo):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 12))).add_prefix("x")
+    df["y"] = df["x0"] * 3 + rng.normal(size=500) * 0.1
+    df["constante"] = 1.0
+    if metodo == "pearson":
+        df = df.mask(rng.random(df.shape) < 0.1)
+    esperado = df.corr(method=metodo)
+
+    corr = matriz_correlacion(df, metodo=metodo, graficar=False, tam_bloque=5, n_workers=2)
+    pd.testing.assert_frame_equal(corr, esperado, atol=1e-12)
+    corr32 = matriz_correlacion(df, metodo=metodo, graficar=False, dtype="float32")
+    pd.testing.assert_frame_equal(corr32, esperado, atol=1e-4, check_dtype=False)
+
+    pares = matriz_correlacion(df, metodo=metodo, graficar=False, top_k=3, tam_bloque=5)
+    assert len(pares) == 3
+    assert set(pares.loc[0, ["variable_1", "variable_2"]]) == {"x0", "y"}
+    assert pares["correlacion"].abs().is_monotonic_decreasing
+    assert (matriz_correlacion(df, graficar=False, umbral=0.9)["correlacion"].abs() >= 0.9).all()
+
+
+def test_comprueba_normalidad_sin_grafico():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"normal": rng.normal(size=6000), "exponencial": rng.exponential(size=6000)})
+    pequeno = df.head(200)
+
+    resultado = comprueba_normalidad(pequeno, graficar=False)
+    assert list(resultado.columns) == ["Test Statistic", "p-value"]
+    assert resultado.loc["normal", "p-value"] == shapiro(pequeno["normal"]).pvalue
+
+    auto = comprueba_normalidad(df, metodo="auto", graficar=False, n_workers=2)
+    assert (auto["Test"] == "dagostino").all()
+    assert auto.loc["normal", "p-value"] > 0.01 > auto.loc["exponencial", "p-value"]
+    anderson = comprueba_normalidad(df, metodo="anderson", graficar=False)
+    assert anderson.loc["exponencial", "p-value"] <= 0.01
+
+
+def test_describir_columnas_aproximado():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"usuario": rng.zipf(1.5, 20_000), "pais": rng.choice(["es", "fr", None], 20_000)})
+    exacto = describir_columnas(df, ["usuario", "pais"], imprimir=False)
+
+    aproximado = describir_columnas(
+        df, ["usuario", "pais"], aproximado=True, capacidad=50, n_workers=2, imprimir=False
+    )
+    bloques = (df.iloc[i : i + 3000] for i in range(0, len(df), 3000))
+    por_bloques = describir_columnas(bloques, ["usuario"], capacidad=50, imprimir=False)
+    for resumen in (aproximado, por_bloques):
+        tabla, referencia = resumen["usuario"], exacto["usuario"]
+        assert list(tabla.columns) == list(referencia.columns) + ["error"]
+        assert tabla.iloc[:3, 0].tolist() == referencia.iloc[:3, 0].tolist()
+        reales = tabla.iloc[:, 0].map(df["usuario"].value_counts())
+        assert (tabla["count"] >= reales).all()
+        assert (tabla["count"] - tabla["error"] <= reales).all()
+    pd.testing.assert_frame_equal(aproximado["pais"].drop(columns="error"), exacto["pais"])
+
+
+def test_resumen_por_grupos_coincide_con_groupby():
+    df = _df()
+    df["tienda"] = np.arange(len(df)) % 4
+    resumen = resumen_por_grupos(df, ["tienda", "canal"], columnas=["importe", "canal", "unidades"])
+    grupos = df.groupby(["tienda", "canal"])
+
+    assert resumen.columns[:3].tolist() == ["tienda", "canal", "Variable"]
+    assert len(resumen) == grupos.ngroups * 3
+    importe = resumen[resumen["Variable"] == "importe"].set_index(["tienda", "canal"])
+    for metrica, esperado in [
+        ("Nulos", grupos["importe"].apply(lambda s: s.isna().sum())),
+        ("Valores únicos", grupos["importe"].nunique()),
+        ("mean", grupos["importe"].mean()),
+        ("std", grupos["importe"].std()),
+        ("25%", grupos["importe"].quantile(0.25)),
+        ("max", grupos["importe"].max()),
+        ("Asimetría", grupos["importe"].skew()),
+        ("Curtosis", grupos["importe"].apply(lambda s: s.kurt())),
+    ]:
+        np.testing.assert_allclose(importe[metrica].astype(float), esperado.astype(float))
+    canal = resumen[resumen["Variable"] == "canal"]
+    assert (canal["Valores únicos"] == 1).all()
+    assert canal["mean"].isna().all()
+
+
+def test_resumen_por_grupos_tipos_nulables_y_sin_columnas():
+    df = pd.DataFrame(
+        {
+            "g": ["a", "a", "b", "b"],
+            "x": pd.array([1, 2, None, 4], dtype="Int64"),
+            "y": pd.array([0.5, None, 1.5, 2.5], dtype="Float64"),
+        }
+    )
+    resumen = resumen_por_grupos(df, "g").set_index(["g", "Variable"])
+
+    assert resumen.loc[("a", "x"), "mean"] == 1.5
+    assert resumen.loc[("b", "x"), ["Nulos", "count", "min", "max"]].tolist() == [1, 1, 4, 4]
+    assert resumen.loc[("b", "y"), "mean"] == 2.0
+
+    vacio = resumen_por_grupos(df, "g", columnas=[])
+    assert vacio.empty
+    assert vacio.columns[:2].tolist() == ["g", "Variable"]
+
+
+def test_perfil_con_columnas_repetidas_y_sin_columnas():
+    repetidas = pd.DataFrame([[1, "a", 2.0], [1, "a", np.nan]], columns=["x", "x", "y"])
+    resumen = nulos(repetidas, imprimir=False)
+    assert resumen.loc["y", "Nulos"] == 1
+    assert resumen.loc["x", "Nulos"].tolist() == [0, 0]
+    assert resumen_dataset(repetidas, imprimir=False)["Nulos"].tolist() == [0, 0, 1]
+    assert resumen_columnas(repetidas)["Nombre"].tolist() == ["x", "x", "y"]
+
+    for vacio in (pd.DataFrame(), pd.DataFrame(index=range(3))):
+        assert nulos(vacio, imprimir=False).index.tolist() == ["Duplicados"]
+        assert resumen_dataset(vacio, imprimir=False).empty
+        assert resumen_columnas(vacio).empty
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from formulas.estadisticas import nulos, resumen_columnas
+from formulas.file_utils import cargar_muestra
+
+
+def _datos(n=20_000):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        {
+            "grupo": rng.choice(["a", "b", "c"], n, p=[0.9, 0.09, 0.01]),
+            "x": rng.normal(10, 2, n),
+        }
+    )
+    df.loc[rng.random(n) < 0.3, "x"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_cargar_muestra_lee_por_bloques(tmp_path, extension):
+    df = _datos()
+    ruta = tmp_path / f"datos.{extension}"
+    if extension == "csv":
+        df.to_csv(ruta, index=False)
+    else:
+        df.to_json(ruta, orient="records", lines=True)
+
+    muestra = cargar_muestra(ruta, n=1000, tam_bloque=3000)
+
+    assert len(muestra) == 1000
+    assert list(muestra.columns) == ["grupo", "x"]
+    assert muestra.attrs["muestra"]["filas_totales"] == len(df)
+
+
+def test_cargar_muestra_estratificada_desde_iterador():
+    df = _datos()
+    bloques = (df.iloc[i : i + 2500] for i in range(0, len(df), 2500))
+
+    muestra = cargar_muestra(bloques, n=100, estratos="grupo", semilla=3)
+
+    assert muestra["grupo"].value_counts().to_dict() == {"a": 100, "b": 100, "c": 100}
+    poblacion = muestra.attrs["muestra"]["filas_por_estrato"]
+    assert poblacion == df["grupo"].value_counts().to_dict()
+    # Los ``attrs`` deben poder compararse al propagarlos
+    assert len(muestra.merge(muestra, on=["grupo", "x"])) >= len(muestra)
+
+
+def test_intervalos_de_confianza_de_la_muestra():
+    df = _datos()
+    muestra = cargar_muestra([df], n=2000, estratos="grupo")
+
+    resumen = nulos(muestra, imprimir=False)
+    real = df["x"].isna().mean() * 100
+    assert resumen.loc["x", "IC Inferior %"] <= real <= resumen.loc["x", "IC Superior %"]
+
+    columnas = resumen_columnas(muestra).set_index("Nombre")
+    media = df["x"].mean()
+    assert columnas.loc["x", "IC Media Inferior"] <= media <= columnas.loc["x", "IC Media Superior"]
+    assert "IC Media Inferior" not in resumen_columnas(df).columns
+
+
+def test_intervalos_con_estratos_nulos():
+    df = _datos()
+    df.loc[df.index % 7 == 0, "grupo"] = None
+    muestra = cargar_muestra([df], n=500, estratos="grupo")
+
+    resumen = nulos(muestra, imprimir=False)
+    real = df["x"].isna().mean() * 100
+    assert resumen.loc["x", "IC Inferior %"] <= real <= resumen.loc["x", "IC Superior %"]
+    assert resumen.loc["grupo", "Porcentaje Nulos"] == pytest.approx(df["grupo"].isna().mean() * 100, abs=0.01)
+
+
+def test_intervalos_sin_las_columnas_de_los_estratos():
+    muestra = cargar_muestra([_datos()], n=500, estratos="grupo")
+
+    for parcial in (muestra[["x"]], muestra.drop(columns="grupo")):
+        assert "IC Inferior %" not in nulos(parcial, imprimir=False).columns
+        assert "IC Media Inferior" not in resumen_columnas(parcial).columns
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from formulas.imputacion import Imputador
+
+
+def _df():
+    return pd.DataFrame(
+        {
+            "g": ["a", "a", "a", "b", "b", "c"],
+            "x": [1.0, np.nan, 3.0, 10.0, np.nan, np.nan],
+            "y": [np.nan, 2.0, 2.0, 5.0, 7.0, 1.0],
+        }
+    )
+
+
+def test_imputador_por_grupos_con_respaldo_global():
+    df = _df()
+    resultado = Imputador("media", por="g").ajustar_transformar(df)
+
+    assert resultado["x"].tolist() == [1.0, 2.0, 3.0, 10.0, 10.0, pytest.approx(14 / 3)]
+    assert resultado["y"].iloc[0] == 2.0
+    nuevo = pd.DataFrame({"g": ["z"], "x": [np.nan], "y": [np.nan]})
+    assert Imputador("media", por="g").ajustar(df).transformar(nuevo)["y"].iloc[0] == 3.4
+
+
+def test_imputador_ajuste_parcial_igual_al_completo():
+    df = _df()
+    completo = Imputador("moda", por="g").ajustar(df)
+    parcial = Imputador("moda", por="g").ajustar_parcial(df.iloc[:3])
+    parcial.combinar(Imputador("moda", por="g").ajustar_parcial(df.iloc[3:]))
+
+    pd.testing.assert_series_equal(parcial.estadisticos_, completo.estadisticos_)
+    pd.testing.assert_frame_equal(
+        parcial.transformar(df), completo.transformar(df), check_dtype=False
+    )
+
+
+def test_imputador_mediana_por_bloques_reproducible():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"g": rng.choice(["a", "b"], 20_000), "x": rng.normal(size=20_000)})
+
+    def _ajustar():
+        imputador = Imputador("mediana", columnas=["x"], por="g")
+        for inicio in range(0, len(df), 3000):
+            imputador.ajustar_parcial(df.iloc[inicio : inicio + 3000])
+        return imputador
+
+    primero, segundo = _ajustar(), _ajustar()
+    pd.testing.assert_series_equal(primero.estadisticos_, segundo.estadisticos_)
+    pd.testing.assert_frame_equal(primero.estadisticos_grupo_, segundo.estadisticos_grupo_)
+    assert primero.estadisticos_["x"] == pytest.approx(df["x"].median(), abs=0.05)
+
+
+def test_imputador_guardar_y_cargar(tmp_path):
+    df = _df()
+    imputador = Imputador("mediana", columnas=["x", "y"]).ajustar(df)
+    ruta = tmp_path / "imputador.pkl"
+    imputador.guardar(ruta)
+
+    cargado = Imputador.cargar(ruta)
+    pd.testing.assert_frame_equal(cargado.transformar(df), imputador.transformar(df))
+    assert cargado.transformar(df)["x"].iloc[1] == 3.0
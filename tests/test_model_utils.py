@@ -1,3 +1,6 @@
+import tracemalloc
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -39,3 +42,23 @@ def test_estandarizar_datos_default_columns():
     assert scaled["B"].mean() == pytest.approx(0, abs=1e-8)
     assert scaled["B"].std(ddof=0) == pytest.approx(1, abs=1e-8)
     assert list(scaler.mean_) == pytest.approx([2.0, 5.0])
+
+
+def test_memoria_estandarizar_datos_sin_copia():
+    valores = np.arange(100_000, dtype=float)
+    df = pd.DataFrame({f"c{i}": valores.copy() for i in range(8)})
+    df["texto"] = "x"
+    tamanio = df[[f"c{i}" for i in range(8)]].memory_usage(index=False).sum()
+
+    def _pico(funcion):
+        tracemalloc.start()
+        try:
+            funcion()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    con_copia = _pico(lambda: estandarizar_datos(df))
+    sin_copia = _pico(lambda: estandarizar_datos(df, copiar=False))
+    assert con_copia - sin_copia >= 0.9 * tamanio
+    assert df["c0"].mean() == pytest.approx(0, abs=1e-8)
@@ -0,0 +1,115 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+
+from formulas.modelos import (
+    buscar_hiperparametros,
+    entrenar_random_forest,
+    entrenar_regresion_logistica,
+)
+
+
+def _datos():
+    X, y = make_classification(n_samples=400, n_features=6, random_state=0)
+    return pd.DataFrame(X, columns=[f"x{i}" for i in range(6)]), pd.Series(y)
+
+
+def test_buscar_hiperparametros_rejilla():
+    X, y = _datos()
+    modelo, resultados = buscar_hiperparametros(
+        entrenar_regresion_logistica, X, y, {"C": [0.001, 1.0, 100.0]}, cv=3
+    )
+
+    assert isinstance(modelo, LogisticRegression)
+    assert len(resultados) == 3
+    assert resultados["puntuacion"].is_monotonic_decreasing
+    assert modelo.C == resultados.loc[0, "parametros"]["C"]
+
+
+def test_buscar_hiperparametros_halving_en_paralelo():
+    X, y = _datos()
+    parametros = {"n_estimators": [5, 20], "max_depth": [1, 2, 4, None]}
+    modelo, resultados = buscar_hiperparametros(
+        entrenar_random_forest, X, y, parametros, cv=3, factor=2, n_workers=2, reentrenar=False
+    )
+
+    assert modelo is None
+    por_ronda = resultados.groupby("ronda").agg(configuraciones=("filas", "size"), filas=("filas", "first"))
+    assert por_ronda["configuraciones"].tolist() == [8, 4, 2]
+    assert por_ronda["filas"].is_monotonic_increasing
+    assert por_ronda["filas"].iloc[-1] == len(X)
+
+
+def _entrenar_constante(X, y, **parametros):
+    from sklearn.dummy import DummyClassifier
+
+    return DummyClassifier().fit(X, y)
+
+
+def test_buscar_hiperparametros_rondas_con_potencia_exacta():
+    X, y = _datos()
+    parametros = {"a": list(range(5)), "b": list(range(5)), "c": list(range(5))}
+    _, resultados = buscar_hiperparametros(
+        _entrenar_constante, X, y, parametros, cv=2, factor=5, reentrenar=False
+    )
+
+    assert resultados.groupby("ronda").size().tolist() == [125, 25, 5]
+
+
+@pytest.mark.parametrize("semilla", [0, 1, 4])
+def test_buscar_hiperparametros_halving_con_clases_desequilibradas(semilla):
+    X, y = make_classification(n_samples=400, n_features=6, weights=[0.97], random_state=0)
+    _, resultados = buscar_hiperparametros(
+        entrenar_regresion_logistica,
+        pd.DataFrame(X),
+        pd.Series(y),
+        {"C": list(np.logspace(-3, 3, 27))},
+        cv=3,
+        factor=3,
+        semilla=semilla,
+        reentrenar=False,
+    )
+
+    assert resultados.groupby("ronda").size().tolist() == [27, 9, 3]
+    assert resultados["puntuacion"].notna().all()
+
+
+def test_buscar_hiperparametros_solo_guarda_el_modelo_final(tmp_path):
+    from formulas.cache import activar_cache_modelos, desactivar_cache_modelos
+
+    X, y = _datos()
+    cache = activar_cache_modelos(tmp_path)
+    try:
+        buscar_hiperparametros(
+            entrenar_regresion_logistica, X, y, {"C": [0.01, 1.0, 100.0]}, cv=3
+        )
+    finally:
+        desactivar_cache_modelos()
+
+    assert cache.fallos == 1
+    assert len(list(tmp_path.glob("*.joblib"))) == 1
+
+
+def test_buscar_hiperparametros_conserva_los_decoradores_del_usuario(tmp_path):
+    from formulas.cache import activar_cache_modelos, desactivar_cache_modelos
+
+    llamadas = []
+
+    @functools.wraps(entrenar_regresion_logistica)
+    def _contar(*args, **kwargs):
+        llamadas.append(kwargs)
+        return entrenar_regresion_logistica(*args, **kwargs)
+
+    X, y = _datos()
+    cache = activar_cache_modelos(tmp_path)
+    try:
+        buscar_hiperparametros(_contar, X, y, {"C": [0.01, 1.0]}, cv=3)
+    finally:
+        desactivar_cache_modelos()
+
+    assert len(llamadas) == 2 * 3 + 1
+    assert cache.fallos == 1
@@ -1,6 +1,22 @@
+import tracemalloc
+
+import numpy as np
 import pandas as pd
+import pytest
 
-from formulas.pandas_transform import convertir_a_datetime, limpiar_nombres
+from formulas.pandas_transform import (
+    CadenaTransformaciones,
+    IndiceCombinacion,
+    calcular_limites_iqr,
+    combinar,
+    convertir_a_datetime,
+    detectar_outliers_iqr,
+    eliminar_duplicados,
+    eliminar_outliers,
+    imputar_nulos,
+    limpiar_nombres,
+    pivotar,
+)
 
 
 def test_limpiar_nombres_snake_case():
@@ -14,3 +30,206 @@ def test_convertir_a_datetime_single_column():
     result = convertir_a_datetime(df, "fecha")
     assert pd.api.types.is_datetime64_any_dtype(result["fecha"])
     assert result.loc[0, "fecha"] == pd.Timestamp("2021-01-01")
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_convertir_a_datetime_valores_repetidos_equivale_a_pandas(n_workers):
+    df = pd.DataFrame(
+        {
+            "dmy": ["31/01/2021 10:00", "01/02/2021 11:30", None, "x"] * 50,
+            "iso": pd.date_range("2021-01-01", periods=200, freq="h").astype(str),
+        }
+    )
+    result = convertir_a_datetime(df, ["dmy", "iso"], n_workers=n_workers)
+    for col in ["dmy", "iso"]:
+        esperado = pd.to_datetime(df[col], errors="coerce")
+        pd.testing.assert_series_equal(result[col], esperado)
+
+
+def test_cadena_transformaciones_equivale_a_encadenar_funciones():
+    df = pd.DataFrame(
+        {
+            " Fecha Alta ": ["2021-01-01", "2021-01-01", "2021-03-01", None],
+            "Importe": [1.0, 1.0, None, 4.0],
+            "Unidades": [None, None, 2.0, 3.0],
+            "Cliente": ["a", "a", "b", "c"],
+        }
+    )
+    cadena = (
+        CadenaTransformaciones()
+        .limpiar_nombres()
+        .convertir_a_datetime("fecha_alta")
+        .eliminar_duplicados(subset=["cliente"], mensaje=False)
+        .imputar_nulos("media", columnas="importe")
+        .imputar_nulos("constante", columnas="unidades", valor=0)
+    )
+
+    esperado = limpiar_nombres(df)
+    esperado = convertir_a_datetime(esperado, "fecha_alta")
+    esperado = eliminar_duplicados(esperado, subset=["cliente"], mensaje=False)
+    esperado = imputar_nulos(esperado, "media", columnas="importe")
+    esperado = imputar_nulos(esperado, "constante", columnas="unidades", valor=0)
+
+    resultado = cadena.ejecutar(df)
+    pd.testing.assert_frame_equal(resultado, esperado)
+    assert list(df.columns)[0] == " Fecha Alta "
+    plan = cadena.plan(df)
+    assert plan["paso"].tolist() == [
+        "eliminar_duplicados",
+        "convertir_a_datetime",
+        "imputar_nulos",
+    ]
+    assert cadena.memoria_estimada(df) > 0
+
+
+def _pico_memoria(funcion):
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+def _df_numerico(filas=100_000, columnas=8):
+    valores = np.arange(filas, dtype=float)
+    valores[::10] = np.nan
+    return pd.DataFrame({f"c{i}": valores.copy() for i in range(columnas)})
+
+
+def test_memoria_imputar_nulos_sin_copia():
+    df = _df_numerico()
+    columna = df["c0"].nbytes
+    con_copia = _pico_memoria(lambda: imputar_nulos(df))
+    sin_copia = _pico_memoria(lambda: imputar_nulos(df, copiar=False))
+    assert sin_copia < 4 * columna
+    assert con_copia - sin_copia >= 0.9 * df.memory_usage(index=False).sum()
+    assert not df.isna().any().any()
+
+
+def test_memoria_convertir_a_datetime_sin_copia():
+    df = _df_numerico()
+    tamanio = df.memory_usage(index=False).sum()
+    df["fecha"] = pd.Series(["2021-01-01", "2021-02-01"] * 50_000)
+    con_copia = _pico_memoria(lambda: convertir_a_datetime(df, "fecha"))
+    sin_copia = _pico_memoria(lambda: convertir_a_datetime(df, "fecha", copiar=False))
+    assert con_copia - sin_copia >= 0.9 * tamanio
+    assert pd.api.types.is_datetime64_any_dtype(df["fecha"])
+
+
+def test_memoria_limpiar_nombres_y_duplicados_sin_copia():
+    df = _df_numerico()
+    assert _pico_memoria(lambda: limpiar_nombres(df, copiar=False)) < df["c0"].nbytes
+    tamanio = df.memory_usage(index=False).sum()
+
+    def _copia_previa():
+        # Comportamiento anterior: copiar y después eliminar los duplicados
+        return df.copy().drop_duplicates()
+
+    copia_previa = _pico_memoria(_copia_previa)
+    con_copia = _pico_memoria(lambda: eliminar_duplicados(df, mensaje=False))
+    sin_copia = _pico_memoria(
+        lambda: eliminar_duplicados(df, mensaje=False, copiar=False)
+    )
+    assert sin_copia <= 1.01 * con_copia
+    assert copia_previa - con_copia >= 0.9 * tamanio
+    assert copia_previa - sin_copia >= 0.9 * tamanio
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_combinar_con_indice_reutilizable(how):
+    clientes = pd.DataFrame(
+        {"id": np.array([3, 1, 2], dtype="int32"), "pais": ["ES", "FR", "IT"]}
+    )
+    indice = IndiceCombinacion(clientes, on="id")
+    for ventas in (
+        pd.DataFrame({"id": [1, 2, 2, 5], "pais": ["x", "y", "z", "w"]}),
+        pd.DataFrame({"id": [3, 3], "pais": ["a", "b"]}),
+    ):
+        esperado = pd.merge(
+            ventas, clientes.astype({"id": "int64"}), on="id", how=how
+        )
+        pd.testing.assert_frame_equal(
+            combinar(ventas, indice, on="id", how=how), esperado
+        )
+
+
+def test_combinar_alinea_categoria_y_texto():
+    df1 = pd.DataFrame({"k": pd.Categorical(["a", "b"]), "v": [1, 2]})
+    df2 = pd.DataFrame({"k": ["b", "c"], "w": [3, 4]})
+    resultado = combinar(df1, df2, on="k")
+    assert resultado["k"].tolist() == ["b"]
+    assert resultado["w"].tolist() == [3]
+
+
+def test_detectar_outliers_iqr_varias_columnas():
+    df = pd.DataFrame(
+        {"a": [1, 2, 3, 100, 2, 3, 2, 1], "b": [1, 1, 2, 90, 50, 1, 2, 1]}
+    )
+    una = detectar_outliers_iqr(df, "a")
+    q1, q3 = df["a"].quantile(0.25), df["a"].quantile(0.75)
+    limite = q3 + 1.5 * (q3 - q1)
+    assert una.tolist() == (df["a"] > limite).tolist()
+
+    alguna = detectar_outliers_iqr(df, ["a", "b"])
+    todas = detectar_outliers_iqr(df, ["a", "b"], criterio="all")
+    assert alguna[alguna].index.tolist() == [3, 4]
+    assert todas[todas].index.tolist() == [3]
+    assert len(eliminar_outliers(df, ["a", "b"])) == 6
+
+
+def test_calcular_limites_iqr_por_bloques_aproxima_exactos():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(size=20_000), "y": rng.exponential(size=20_000)})
+    bloques = (df.iloc[i : i + 3000] for i in range(0, len(df), 3000))
+
+    exactos = calcular_limites_iqr(df)
+    aproximados = calcular_limites_iqr(bloques)
+
+    pd.testing.assert_frame_equal(aproximados, exactos, atol=0.05, check_exact=False)
+
+    bloques = (df.iloc[i : i + 3000] for i in range(0, len(df), 3000))
+    pd.testing.assert_frame_equal(calcular_limites_iqr(bloques), aproximados)
+
+
+def _ventas():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "cliente": rng.integers(0, 30, n),
+            "producto": rng.choice(list("abcdefgh"), n),
+            "canal": rng.choice(["web", "tienda", None], n),
+            "importe": rng.random(n),
+            "unidades": rng.integers(1, 5, n),
+        }
+    )
+    df.loc[:20, "importe"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("aggfunc", ["sum", "mean", ["sum", "count", "max"]])
+@pytest.mark.parametrize("values", ["importe", ["unidades", "importe"]])
+def test_pivotar_equivale_a_pivot_table(aggfunc, values):
+    df = _ventas()
+    esperado = pd.pivot_table(
+        df, index="cliente", columns=["producto", "canal"], values=values, aggfunc=aggfunc
+    ).reset_index()
+
+    resultado = pivotar(df, "cliente", ["producto", "canal"], values, aggfunc)
+    pd.testing.assert_frame_equal(resultado, esperado)
+
+    bloques = (df.iloc[i : i + 500] for i in range(0, len(df), 500))
+    por_bloques = pivotar(bloques, "cliente", ["producto", "canal"], values, aggfunc)
+    pd.testing.assert_frame_equal(por_bloques, esperado)
+
+
+def test_pivotar_disperso():
+    df = _ventas()
+    resultado = pivotar(df, ["cliente", "canal"], "producto", "importe", disperso=True)
+    esperado = pivotar(df, ["cliente", "canal"], "producto", "importe")
+
+    assert all(isinstance(t, pd.SparseDtype) for t in resultado.dtypes.iloc[2:])
+    densas = resultado.astype({c: float for c in resultado.columns[2:]})
+    pd.testing.assert_frame_equal(densas, esperado)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from formulas.pandas_transform import combinar
+from formulas.particionado import (
+    combinar_por_particiones,
+    eliminar_duplicados_por_bloques,
+)
+
+
+def _ordenar(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+def test_combinar_fuera_de_memoria_equivale_a_merge(how):
+    rng = np.random.default_rng(0)
+    izq = pd.DataFrame({"id": rng.integers(0, 300, 2000), "a": rng.random(2000)})
+    der = pd.DataFrame(
+        {"id": np.arange(100, 400, dtype="int32"), "b": rng.random(300)}
+    )
+
+    resultado = combinar(izq, der, on="id", how=how, memoria_max=20_000)
+    esperado = pd.merge(izq, der.astype({"id": "int64"}), on="id", how=how)
+
+    pd.testing.assert_frame_equal(_ordenar(resultado), _ordenar(esperado))
+
+
+def test_combinar_por_particiones_acepta_bloques_y_workers(tmp_path):
+    izq = pd.DataFrame({"k1": [1, 2, 2, 3] * 50, "k2": list("abca") * 50})
+    der = pd.DataFrame({"k1": [2, 3], "k2": ["b", "a"], "valor": [10, 20]})
+    bloques = (izq.iloc[i : i + 30] for i in range(0, len(izq), 30))
+
+    partes = list(
+        combinar_por_particiones(
+            bloques,
+            der,
+            on=["k1", "k2"],
+            n_particiones=4,
+            n_workers=2,
+            directorio=str(tmp_path),
+        )
+    )
+    resultado = pd.concat(partes, ignore_index=True)
+
+    esperado = pd.merge(izq, der, on=["k1", "k2"])
+    pd.testing.assert_frame_equal(_ordenar(resultado), _ordenar(esperado))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_combinar_por_particiones_con_cambio_de_tipo_entre_bloques():
+    # Un bloque de ``read_csv`` con nulos pasa la clave de int64 a float64
+    bloques = [
+        pd.DataFrame({"id": np.arange(50), "a": 1}),
+        pd.DataFrame({"id": np.append(np.arange(50, 100), np.nan), "a": 2}),
+    ]
+    der = pd.DataFrame({"id": np.arange(100), "b": np.arange(100)})
+
+    resultado = pd.concat(
+        combinar_por_particiones(iter(bloques), der, on="id", n_particiones=8),
+        ignore_index=True,
+    )
+
+    assert len(resultado) == 100
+    assert sorted(resultado["id"].astype(int)) == list(range(100))
+    assert (resultado["id"] == resultado["b"]).all()
+
+
+def test_combinar_iteradores_sin_coincidencias():
+    izq = (pd.DataFrame({"id": [i], "a": [i]}) for i in range(3))
+    der = (pd.DataFrame({"id": [10 + i], "b": [i]}) for i in range(3))
+
+    resultado = combinar(izq, der, on="id", memoria_max=10_000)
+
+    assert resultado.empty
+    assert resultado.columns.tolist() == ["id", "a", "b"]
+
+
+@pytest.mark.parametrize("keep", ["first", "last", False])
+@pytest.mark.parametrize("filtro_bloom", [False, True])
+def test_eliminar_duplicados_por_bloques_con_volcado(keep, filtro_bloom):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"id": rng.integers(0, 500, 3000), "v": rng.random(3000)})
+    bloques = (df.iloc[i : i + 400] for i in range(0, len(df), 400))
+
+    partes = eliminar_duplicados_por_bloques(
+        bloques,
+        subset="id",
+        keep=keep,
+        memoria_max=100 * 72,
+        filtro_bloom=filtro_bloom,
+        capacidad_bloom=1000,
+        mensaje=False,
+    )
+    resultado = pd.concat(list(partes))
+
+    pd.testing.assert_frame_equal(resultado, df.drop_duplicates("id", keep=keep))
+
+
+@pytest.mark.parametrize("keep", ["first", "last"])
+def test_eliminar_duplicados_por_bloques_con_cambio_de_tipo(keep):
+    # El segundo bloque trae un nulo y la columna pasa de int64 a float64
+    bloques = [
+        pd.DataFrame({"id": [1, 2, 2**60 + 1], "v": ["a", "b", "c"]}),
+        pd.DataFrame({"id": [1.0, np.nan, 3.0], "v": ["a", "b", "c"]}),
+        pd.DataFrame({"id": [2**60 + 2, 3], "v": ["c", "c"]}),
+    ]
+
+    resultado = pd.concat(
+        list(eliminar_duplicados_por_bloques(iter(bloques), keep=keep, mensaje=False))
+    )
+
+    assert len(resultado) == 6
+    assert resultado["id"].isna().sum() == 1
+    assert (resultado["id"] == 1).sum() == 1
@@ -0,0 +1,166 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from formulas.sql_utils import (
+    consultar_archivos,
+    crear_conexion,
+    crear_conexion_async,
+    ejecutar_consultas_async,
+    escribir_df,
+    escribir_df_async,
+    extraer_incremental,
+    leer_por_claves,
+    leer_query,
+    sincronizar_df,
+)
+
+
+def test_sincronizar_df_aplica_solo_diferencias(tmp_path):
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    inicial = pd.DataFrame({"id": [1, 2, 3], "valor": [10.0, 20.0, 30.0]})
+    escribir_df(inicial, "ventas", engine)
+
+    nuevo = pd.DataFrame({"id": [1, 2, 4], "valor": [10.0, 25.0, 40.0]})
+    cambios = sincronizar_df(nuevo, "ventas", engine, claves="id", tam_lote=1)
+
+    assert cambios == {"insertadas": 1, "actualizadas": 1, "eliminadas": 1}
+    resultado = leer_query("SELECT * FROM ventas ORDER BY id", engine)
+    pd.testing.assert_frame_equal(resultado, nuevo)
+
+
+def test_sincronizar_df_crea_tabla_si_no_existe(tmp_path):
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    df = pd.DataFrame({"id": [1, 2], "nombre": ["a", None]})
+
+    cambios = sincronizar_df(df, "clientes", engine, claves=["id"])
+    assert cambios["insertadas"] == 2
+    assert sincronizar_df(df, "clientes", engine, claves=["id"]) == {
+        "insertadas": 0,
+        "actualizadas": 0,
+        "eliminadas": 0,
+    }
+
+
+def test_extraer_incremental_solo_trae_filas_nuevas(tmp_path):
+    pytest.importorskip("pyarrow")
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    snapshot = tmp_path / "pedidos.parquet"
+    pedidos = pd.DataFrame(
+        {
+            "id": [1, 2],
+            "importe": [5.0, 7.0],
+            "updated_at": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+        }
+    )
+    escribir_df(pedidos, "pedidos", engine)
+    primera = extraer_incremental("pedidos", engine, snapshot, claves="id")
+    assert len(primera) == 2
+
+    cambios = pd.DataFrame(
+        {
+            "id": [2, 3],
+            "importe": [8.0, 1.0],
+            "updated_at": pd.to_datetime(["2024-01-03", "2024-01-03"]),
+        }
+    )
+    escribir_df(cambios, "pedidos", engine, if_exists="append")
+    segunda = extraer_incremental("pedidos", engine, snapshot, claves="id")
+
+    assert sorted(segunda["id"]) == [1, 2, 3]
+    assert segunda.set_index("id").loc[2, "importe"] == 8.0
+    assert len(pd.read_parquet(snapshot)) == 3
+
+
+def test_extraer_incremental_no_pierde_filas_con_la_misma_marca(tmp_path):
+    pytest.importorskip("pyarrow")
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    snapshot = tmp_path / "pedidos.parquet"
+    marca = pd.to_datetime(["2024-01-01"])
+    escribir_df(pd.DataFrame({"id": [1], "importe": [5.0], "updated_at": marca}), "pedidos", engine)
+    assert len(extraer_incremental("pedidos", engine, snapshot, claves="id")) == 1
+
+    # Fila confirmada después de la primera extracción con la misma marca
+    tardia = pd.DataFrame({"id": [2], "importe": [7.0], "updated_at": marca})
+    escribir_df(tardia, "pedidos", engine, if_exists="append")
+    segunda = extraer_incremental("pedidos", engine, snapshot, claves="id")
+
+    assert sorted(segunda["id"]) == [1, 2]
+    assert len(pd.read_parquet(snapshot)) == 2
+
+    # Sin datos nuevos el snapshot no se reescribe
+    modificado = snapshot.stat().st_mtime_ns
+    tercera = extraer_incremental("pedidos", engine, snapshot, claves="id")
+    assert snapshot.stat().st_mtime_ns == modificado
+    pd.testing.assert_frame_equal(tercera, segunda)
+
+
+def test_consultas_async_con_aiosqlite(tmp_path):
+    pytest.importorskip("aiosqlite")
+    engine = crear_conexion_async(f"sqlite+aiosqlite:///{tmp_path / 'datos.db'}")
+    df = pd.DataFrame({"id": [1, 2, 3], "valor": [1.5, 2.5, 3.5]})
+
+    async def _flujo():
+        await escribir_df_async(df, "ventas", engine)
+        resultados = await ejecutar_consultas_async(
+            ["SELECT * FROM ventas", "SELECT COUNT(*) AS n FROM ventas"],
+            engine,
+            max_concurrencia=1,
+        )
+        await engine.dispose()
+        return resultados
+
+    completo, conteo = asyncio.run(_flujo())
+    pd.testing.assert_frame_equal(completo, df)
+    assert conteo.loc[0, "n"] == 3
+
+
+def test_leer_query_con_parametros(tmp_path):
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    escribir_df(pd.DataFrame({"pais": ["ES", "FR"], "n": [1, 2]}), "t", engine)
+
+    df = leer_query("SELECT n FROM t WHERE pais = :pais", engine, {"pais": "FR"})
+    assert df["n"].tolist() == [2]
+
+
+def test_leer_por_claves_en_lotes(tmp_path):
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    clientes = pd.DataFrame({"id": range(5000), "pais": ["ES", "FR"] * 2500})
+    escribir_df(clientes, "clientes", engine)
+
+    ids = list(range(0, 5000, 2)) + [10, 10, "1 OR 1=1"]
+    df = leer_por_claves("clientes", "id", ids, engine, tam_lote=700)
+
+    assert sorted(df["id"]) == list(range(0, 5000, 2))
+    assert set(df["pais"]) == {"ES"}
+
+
+def test_leer_por_claves_con_escalares_de_numpy(tmp_path):
+    engine = crear_conexion(f"sqlite:///{tmp_path / 'datos.db'}")
+    clientes = pd.DataFrame({"id": range(10), "pais": ["ES", "FR"] * 5})
+    escribir_df(clientes, "clientes", engine)
+
+    df = leer_por_claves("clientes", "id", np.arange(5), engine)
+    assert sorted(df["id"]) == list(range(5))
+    df = leer_por_claves("clientes", "id", clientes["id"].unique(), engine)
+    assert len(df) == 10
+
+
+@pytest.mark.parametrize("motor", ["sqlite", "duckdb"])
+def test_consultar_archivos_csv_y_dataframe(tmp_path, motor):
+    if motor == "duckdb":
+        pytest.importorskip("duckdb")
+    ruta = tmp_path / "ventas.csv"
+    pd.DataFrame({"id": [1, 1, 2], "importe": [10, 5, 7]}).to_csv(ruta, index=False)
+    clientes = pd.DataFrame({"id": [1, 2], "pais": ["ES", "FR"]})
+
+    df = consultar_archivos(
+        "SELECT c.pais, SUM(v.importe) AS total FROM ventas v "
+        "JOIN clientes c ON v.id = c.id GROUP BY c.pais ORDER BY c.pais",
+        {"ventas": ruta, "clientes": clientes},
+        motor=motor,
+    )
+    assert df["pais"].tolist() == ["ES", "FR"]
+    assert df["total"].tolist() == [15, 7]